@@ -1,5 +1,15 @@
 from .ebs import analyze_ebs
+from .ebs_attached import analyze_attached_ebs
+from .ebs_snapshots import analyze_ebs_snapshots
 from .rds import analyze_rds
 from .s3 import analyze_s3
+from .s3_inventory import load_s3_inventory
 
-__all__ = ["analyze_s3", "analyze_ebs", "analyze_rds"]
+__all__ = [
+    "analyze_s3",
+    "analyze_ebs",
+    "analyze_attached_ebs",
+    "analyze_ebs_snapshots",
+    "analyze_rds",
+    "load_s3_inventory",
+]
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+import math
+from typing import Iterable, Iterator
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from aws_storage_optimizer.analyzers.ebs import DESCRIBE_VOLUMES_PAGE_SIZE
+from aws_storage_optimizer.config import AppConfig
+from aws_storage_optimizer.estimation import (
+    GP3_BASELINE_IOPS,
+    GP3_BASELINE_THROUGHPUT_MIBPS,
+    ebs_volume_monthly_cost,
+)
+from aws_storage_optimizer.metrics import (
+    MAX_METRIC_DATA_QUERIES,
+    get_metric_data_batched,
+    metric_expression_query,
+    metric_stat_query,
+)
+from aws_storage_optimizer.models import Finding
+from aws_storage_optimizer.utils import has_protection_tag, iter_paginated
+
+EBS_METRIC_PERIOD_SECONDS = 300
+# Four raw metrics plus two metric math series per volume.
+QUERIES_PER_VOLUME = 6
+VOLUMES_PER_METRIC_REQUEST = MAX_METRIC_DATA_QUERIES // QUERIES_PER_VOLUME
+GP3_MAX_IOPS = 16000
+GP3_MAX_THROUGHPUT_MIBPS = 1000
+GP3_MAX_IOPS_PER_GIB = 500
+MIGRATABLE_VOLUME_TYPES = ("gp2", "io1")
+
+
+@dataclass
+class VolumeIO:
+    # Per-period series over the lookback window, oldest first.
+    iops: list[float] = field(default_factory=list)
+    throughput_mibps: list[float] = field(default_factory=list)
+
+    @property
+    def mean_iops(self) -> float:
+        return sum(self.iops) / len(self.iops) if self.iops else 0.0
+
+    @property
+    def peak_iops(self) -> float:
+        return max(self.iops, default=0.0)
+
+    @property
+    def peak_throughput_mibps(self) -> float:
+        return max(self.throughput_mibps, default=0.0)
+
+
+def _chunks(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _volume_io(
+    cloudwatch_client,
+    volume_ids: list[str],
+    start_time: datetime,
+    end_time: datetime,
+) -> dict[str, VolumeIO]:
+    queries = []
+    for index, volume_id in enumerate(volume_ids):
+        dimensions = {"VolumeId": volume_id}
+        for prefix, metric_name in (
+            ("r", "VolumeReadOps"),
+            ("w", "VolumeWriteOps"),
+            ("rb", "VolumeReadBytes"),
+            ("wb", "VolumeWriteBytes"),
+        ):
+            queries.append(
+                metric_stat_query(
+                    f"{prefix}{index}",
+                    namespace="AWS/EBS",
+                    metric_name=metric_name,
+                    dimensions=dimensions,
+                    period=EBS_METRIC_PERIOD_SECONDS,
+                    stat="Sum",
+                    return_data=False,
+                )
+            )
+        queries.append(metric_expression_query(f"iops{index}", f"(r{index} + w{index}) / PERIOD(r{index})"))
+        queries.append(
+            metric_expression_query(f"mibps{index}", f"(rb{index} + wb{index}) / PERIOD(rb{index}) / 1048576")
+        )
+
+    series = get_metric_data_batched(cloudwatch_client, queries, start_time, end_time)
+    return {
+        volume_id: VolumeIO(series[f"iops{index}"], series.get(f"mibps{index}", []))
+        for index, volume_id in enumerate(volume_ids)
+        if series.get(f"iops{index}")
+    }
+
+
+def _baseline_performance(volume: dict) -> tuple[int, int]:
+    # Sustained IOPS and MiB/s the volume delivers today.
+    size_gib = int(volume.get("Size", 0))
+    if volume.get("VolumeType") == "gp2":
+        return max(100, min(3 * size_gib, GP3_MAX_IOPS)), 128 if size_gib <= 170 else 250
+    iops = int(volume.get("Iops", 0))
+    return iops, min(iops // 4, GP3_MAX_THROUGHPUT_MIBPS)
+
+
+def _gp3_migration_finding(volume: dict, io: VolumeIO | None, config: AppConfig, region: str | None) -> Finding | None:
+    volume_type = str(volume.get("VolumeType"))
+    size_gib = int(volume.get("Size", 0))
+    baseline_iops, baseline_mibps = _baseline_performance(volume)
+    gp3_iops = max(GP3_BASELINE_IOPS, baseline_iops)
+    gp3_mibps = max(GP3_BASELINE_THROUGHPUT_MIBPS, baseline_mibps)
+    peak_covered = None
+    if io is not None:
+        peak_covered = io.peak_iops <= gp3_iops and io.peak_throughput_mibps <= gp3_mibps
+        # Provision for observed peaks that the equivalent baseline would not absorb.
+        gp3_iops = max(gp3_iops, math.ceil(io.peak_iops))
+        gp3_mibps = max(gp3_mibps, math.ceil(io.peak_throughput_mibps))
+    # Every gp3 volume gets the baseline IOPS, however small; only IOPS above
+    # it are limited by size.
+    max_iops = max(GP3_BASELINE_IOPS, min(GP3_MAX_IOPS, GP3_MAX_IOPS_PER_GIB * size_gib))
+    if gp3_iops > max_iops or gp3_mibps > GP3_MAX_THROUGHPUT_MIBPS:
+        return None
+
+    current_cost = ebs_volume_monthly_cost(volume_type, size_gib, int(volume.get("Iops", 0)), baseline_mibps, config)
+    gp3_cost = ebs_volume_monthly_cost("gp3", size_gib, gp3_iops, gp3_mibps, config)
+    if current_cost is None or gp3_cost is None or gp3_cost >= current_cost:
+        return None
+    return Finding(
+        service="ebs",
+        resource_id=str(volume.get("VolumeId")),
+        region=region,
+        recommendation=f"Modify {volume_type} volume to gp3 with {gp3_iops} IOPS and {gp3_mibps} MiB/s",
+        estimated_monthly_savings_usd=round(current_cost - gp3_cost, 2),
+        risk_level="low",
+        details={
+            "finding_type": "gp3-migration",
+            "size_gib": size_gib,
+            "volume_type": volume_type,
+            "current_monthly_cost_usd": round(current_cost, 2),
+            "gp3_monthly_cost_usd": round(gp3_cost, 2),
+            "gp3_iops": gp3_iops,
+            "gp3_throughput_mibps": gp3_mibps,
+            "peak_iops": round(io.peak_iops, 1) if io is not None else None,
+            "peak_throughput_mibps": round(io.peak_throughput_mibps, 1) if io is not None else None,
+            "peak_covered_by_baseline": peak_covered,
+            "attached_instance_ids": [
+                str(attachment.get("InstanceId")) for attachment in volume.get("Attachments", [])
+            ],
+        },
+    )
+
+
+def _idle_volume_finding(
+    volume: dict,
+    io: VolumeIO | None,
+    config: AppConfig,
+    region: str | None,
+    created_before: datetime,
+) -> Finding | None:
+    # A volume without any data points is unknown, not idle, and a volume
+    # younger than the lookback window has not been observed long enough.
+    if io is None or io.mean_iops > config.thresholds.ebs_idle_iops:
+        return None
+    create_time = volume.get("CreateTime")
+    if isinstance(create_time, datetime) and create_time > created_before:
+        return None
+
+    volume_type = str(volume.get("VolumeType"))
+    size_gib = int(volume.get("Size", 0))
+    _, baseline_mibps = _baseline_performance(volume)
+    monthly_cost = ebs_volume_monthly_cost(
+        volume_type, size_gib, int(volume.get("Iops", 0)), int(volume.get("Throughput", baseline_mibps)), config
+    )
+    if monthly_cost is None:
+        monthly_cost = size_gib * config.rates.ebs_gp3_per_gib_month_usd
+    return Finding(
+        service="ebs",
+        resource_id=str(volume.get("VolumeId")),
+        region=region,
+        recommendation="Snapshot and detach attached EBS volume with no meaningful I/O",
+        estimated_monthly_savings_usd=round(monthly_cost, 2),
+        risk_level="medium",
+        details={
+            "finding_type": "idle-attached-volume",
+            "size_gib": size_gib,
+            "volume_type": volume_type,
+            "mean_iops": round(io.mean_iops, 3),
+            "peak_iops": round(io.peak_iops, 1),
+            "peak_throughput_mibps": round(io.peak_throughput_mibps, 3),
+            "lookback_days": config.thresholds.ebs_lookback_days,
+            "attached_instance_ids": [
+                str(attachment.get("InstanceId")) for attachment in volume.get("Attachments", [])
+            ],
+        },
+    )
+
+
+def _volume_finding(
+    volume: dict,
+    io: VolumeIO | None,
+    config: AppConfig,
+    region: str | None,
+    created_before: datetime,
+) -> Finding | None:
+    idle = _idle_volume_finding(volume, io, config, region, created_before)
+    if idle is not None or volume.get("VolumeType") not in MIGRATABLE_VOLUME_TYPES:
+        return idle
+    return _gp3_migration_finding(volume, io, config, region)
+
+
+def analyze_attached_ebs(ec2_client, cloudwatch_client, config: AppConfig, region: str | None) -> list[Finding]:
+    findings: list[Finding] = []
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(days=config.thresholds.ebs_lookback_days)
+    volumes = iter_paginated(
+        ec2_client.describe_volumes,
+        "Volumes",
+        Filters=[{"Name": "status", "Values": ["in-use"]}],
+        MaxResults=DESCRIBE_VOLUMES_PAGE_SIZE,
+    )
+    # Volumes are handled in chunks sized so that one chunk's metrics fit a
+    # single GetMetricData request; memory stays flat as volume counts grow.
+    try:
+        for chunk in _chunks(volumes, VOLUMES_PER_METRIC_REQUEST):
+            chunk = [
+                volume
+                for volume in chunk
+                if not has_protection_tag(
+                    volume.get("Tags", []), config.protection.tag_key, config.protection.tag_value
+                )
+            ]
+            volume_io = _volume_io(
+                cloudwatch_client, [str(volume.get("VolumeId")) for volume in chunk], start_time, end_time
+            )
+            for volume in chunk:
+                io = volume_io.get(str(volume.get("VolumeId")))
+                finding = _volume_finding(volume, io, config, region, start_time)
+                if finding is not None:
+                    findings.append(finding)
+    except (BotoCoreError, ClientError):
+        # Findings from pages read before the failure are still valid.
+        pass
+
+    return findings
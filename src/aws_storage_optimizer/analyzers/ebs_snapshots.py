@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from aws_storage_optimizer.analyzers.ebs import DESCRIBE_VOLUMES_PAGE_SIZE
+from aws_storage_optimizer.config import AppConfig
+from aws_storage_optimizer.estimation import EBS_SNAPSHOT_PER_GIB_MONTH_USD
+from aws_storage_optimizer.models import Finding
+from aws_storage_optimizer.utils import has_protection_tag, iter_paginated
+
+DESCRIBE_SNAPSHOTS_PAGE_SIZE = 1000
+DESCRIBE_IMAGES_PAGE_SIZE = 1000
+
+
+def _volume_ids(ec2_client) -> set[str]:
+    volumes = iter_paginated(ec2_client.describe_volumes, "Volumes", MaxResults=DESCRIBE_VOLUMES_PAGE_SIZE)
+    return {str(volume["VolumeId"]) for volume in volumes if volume.get("VolumeId")}
+
+
+def _snapshot_images(ec2_client) -> dict[str, list[str]]:
+    # snapshot id -> ids of the registered AMIs whose block devices use it
+    images = iter_paginated(ec2_client.describe_images, "Images", Owners=["self"], MaxResults=DESCRIBE_IMAGES_PAGE_SIZE)
+    index: dict[str, list[str]] = {}
+    for image in images:
+        for mapping in image.get("BlockDeviceMappings", []):
+            snapshot_id = (mapping.get("Ebs") or {}).get("SnapshotId")
+            if snapshot_id:
+                index.setdefault(str(snapshot_id), []).append(str(image.get("ImageId")))
+    return index
+
+
+def analyze_ebs_snapshots(ec2_client, config: AppConfig, region: str | None) -> list[Finding]:
+    findings: list[Finding] = []
+    # Volumes and AMIs are indexed up front; snapshots then stream past and are
+    # joined against both indexes with set and dict lookups.
+    try:
+        volume_ids = _volume_ids(ec2_client)
+        snapshot_images = _snapshot_images(ec2_client)
+    except (BotoCoreError, ClientError):
+        # With an incomplete index every snapshot would look orphaned.
+        return findings
+
+    now = datetime.now(timezone.utc)
+    snapshots = iter_paginated(
+        ec2_client.describe_snapshots,
+        "Snapshots",
+        OwnerIds=["self"],
+        MaxResults=DESCRIBE_SNAPSHOTS_PAGE_SIZE,
+    )
+    try:
+        for snapshot in snapshots:
+            snapshot_id = str(snapshot.get("SnapshotId"))
+            volume_id = str(snapshot.get("VolumeId", ""))
+            if volume_id in volume_ids or snapshot_id in snapshot_images:
+                continue
+            if snapshot.get("State", "completed") != "completed":
+                continue
+            tags = snapshot.get("Tags", [])
+            if has_protection_tag(tags, config.protection.tag_key, config.protection.tag_value):
+                continue
+
+            size_gib = int(snapshot.get("VolumeSize", 0))
+            storage_tier = str(snapshot.get("StorageTier", "standard"))
+            rate = EBS_SNAPSHOT_PER_GIB_MONTH_USD.get(storage_tier, EBS_SNAPSHOT_PER_GIB_MONTH_USD["standard"])
+            start_time = snapshot.get("StartTime")
+            details = {
+                "finding_type": "orphaned-snapshot",
+                "size_gib": size_gib,
+                "source_volume_id": volume_id,
+                "storage_tier": storage_tier,
+                "description": str(snapshot.get("Description", "")),
+                # Snapshots are incremental; the source volume size bounds the billed size.
+                "size_note": "Size is the source volume size; billed snapshot storage may be lower",
+            }
+            if isinstance(start_time, datetime):
+                details["start_time"] = start_time.isoformat()
+                details["age_days"] = (now - start_time).days
+            findings.append(
+                Finding(
+                    service="ebs",
+                    resource_id=snapshot_id,
+                    region=region,
+                    recommendation="Delete snapshot whose source volume is gone and no AMI references",
+                    estimated_monthly_savings_usd=round(size_gib * rate, 2),
+                    risk_level="medium",
+                    details=details,
+                )
+            )
+    except (BotoCoreError, ClientError):
+        # Findings from pages read before the failure are still valid.
+        pass
+
+    return findings
@@ -1,89 +1,338 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+import math
 
 from botocore.exceptions import BotoCoreError, ClientError
 
+from aws_storage_optimizer.analyzers.rds_rightsizing import RIGHTSIZING_HEADROOM, RightSizingCatalog, default_catalog
 from aws_storage_optimizer.config import AppConfig
-from aws_storage_optimizer.estimation import estimate_rds_monthly_savings
+from aws_storage_optimizer.estimation import (
+    AURORA_STORAGE_PER_GIB_MONTH_USD,
+    RDS_CLASS_MONTHLY_BASELINE_USD,
+    RDS_STORAGE_PER_GIB_MONTH_USD,
+    estimate_rds_monthly_savings,
+)
+from aws_storage_optimizer.metrics import get_metric_data_batched, metric_stat_query, percentile
 from aws_storage_optimizer.models import Finding
-from aws_storage_optimizer.utils import has_protection_tag
+from aws_storage_optimizer.utils import has_protection_tag, iter_paginated
 
+DESCRIBE_DB_INSTANCES_PAGE_SIZE = 100
+# Five-minute points keep bursts visible that hourly averages flatten.
+RDS_METRIC_PERIOD_SECONDS = 300
+RDS_CPU_STATISTICS = ("mean", "p50", "p95", "p99", "max")
+RDS_MIN_ALLOCATED_STORAGE_GIB = 20
+# Storage is reported when the headroom-adjusted need is at most this share
+# of the allocation, since shrinking means migrating the instance.
+RDS_STORAGE_OVERPROVISIONED_RATIO = 0.5
 
-def _avg_cpu(cloudwatch_client, db_instance_identifier: str, lookback_days: int) -> float | None:
+
+@dataclass
+class RDSUtilization:
+    # CPU statistic name (see RDS_CPU_STATISTICS) -> percent
+    cpu_pct: dict[str, float]
+    min_freeable_memory_bytes: float | None = None
+    max_connections: float | None = None
+    min_free_storage_bytes: float | None = None
+
+
+def _metric_queries(dimension: str, identifiers: list[str], metrics: tuple[tuple[str, str, str], ...]) -> list[dict]:
+    return [
+        metric_stat_query(
+            f"{prefix}{index}",
+            namespace="AWS/RDS",
+            metric_name=metric_name,
+            dimensions={dimension: identifier},
+            period=RDS_METRIC_PERIOD_SECONDS,
+            stat=stat,
+        )
+        for index, identifier in enumerate(identifiers)
+        for prefix, metric_name, stat in metrics
+    ]
+
+
+def _fetch_utilization(
+    cloudwatch_client,
+    db_identifiers: list[str],
+    cluster_identifiers: list[str],
+    lookback_days: int,
+) -> tuple[dict[str, RDSUtilization], dict[str, float]]:
+    # Instance and Aurora cluster queries share the same batched GetMetricData
+    # requests. Returns per-instance utilization (instances without CPU data
+    # points are absent) and the latest VolumeBytesUsed per cluster.
     end_time = datetime.now(timezone.utc)
     start_time = end_time - timedelta(days=lookback_days)
-    try:
-        metrics = cloudwatch_client.get_metric_statistics(
-            Namespace="AWS/RDS",
-            MetricName="CPUUtilization",
-            Dimensions=[{"Name": "DBInstanceIdentifier", "Value": db_instance_identifier}],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=3600,
-            Statistics=["Average"],
+    queries = _metric_queries(
+        "DBInstanceIdentifier",
+        db_identifiers,
+        (
+            ("cpu", "CPUUtilization", "Average"),
+            ("mem", "FreeableMemory", "Minimum"),
+            ("conn", "DatabaseConnections", "Maximum"),
+            ("free", "FreeStorageSpace", "Minimum"),
+        ),
+    ) + _metric_queries("DBClusterIdentifier", cluster_identifiers, (("vol", "VolumeBytesUsed", "Maximum"),))
+    series = get_metric_data_batched(cloudwatch_client, queries, start_time, end_time)
+
+    utilization: dict[str, RDSUtilization] = {}
+    for index, db_identifier in enumerate(db_identifiers):
+        cpu = sorted(series.get(f"cpu{index}", []))
+        if not cpu:
+            continue
+        memory = series.get(f"mem{index}")
+        connections = series.get(f"conn{index}")
+        free_storage = series.get(f"free{index}")
+        utilization[db_identifier] = RDSUtilization(
+            cpu_pct={
+                "mean": sum(cpu) / len(cpu),
+                "p50": percentile(cpu, 0.50),
+                "p95": percentile(cpu, 0.95),
+                "p99": percentile(cpu, 0.99),
+                "max": cpu[-1],
+            },
+            min_freeable_memory_bytes=min(memory) if memory else None,
+            max_connections=max(connections) if connections else None,
+            min_free_storage_bytes=min(free_storage) if free_storage else None,
         )
-    except (BotoCoreError, ClientError):
+    volume_bytes = {
+        cluster_identifier: values[-1]
+        for index, cluster_identifier in enumerate(cluster_identifiers)
+        if (values := series.get(f"vol{index}"))
+    }
+    return utilization, volume_bytes
+
+
+def _is_protected(rds_client, resource: dict, config: AppConfig) -> bool:
+    # DescribeDBInstances and DescribeDBClusters return tags inline;
+    # ListTagsForResource is only a fallback for responses without a TagList.
+    tags = resource.get("TagList")
+    db_arn = str(resource.get("DBInstanceArn") or resource.get("DBClusterArn") or "")
+    if tags is None and db_arn:
+        try:
+            tags = rds_client.list_tags_for_resource(ResourceName=db_arn).get("TagList", [])
+        except (BotoCoreError, ClientError):
+            tags = []
+    return has_protection_tag(tags or [], config.protection.tag_key, config.protection.tag_value)
+
+
+def _rightsizing_finding(
+    instance: dict,
+    utilization: RDSUtilization,
+    catalog: RightSizingCatalog,
+    config: AppConfig,
+    region: str | None,
+) -> Finding | None:
+    db_instance_class = instance.get("DBInstanceClass")
+    details: dict = {
+        "db_instance_class": db_instance_class,
+        "avg_cpu_pct": round(utilization.cpu_pct["mean"], 2),
+        "p50_cpu_pct": round(utilization.cpu_pct["p50"], 2),
+        "p95_cpu_pct": round(utilization.cpu_pct["p95"], 2),
+        "p99_cpu_pct": round(utilization.cpu_pct["p99"], 2),
+        "max_cpu_pct": round(utilization.cpu_pct["max"], 2),
+        "cpu_statistic": config.thresholds.rds_cpu_statistic,
+        "min_freeable_memory_mib": (
+            round(utilization.min_freeable_memory_bytes / (1024**2), 1)
+            if utilization.min_freeable_memory_bytes is not None
+            else None
+        ),
+        "max_connections": utilization.max_connections,
+        "lookback_days": config.thresholds.rds_lookback_days,
+    }
+    sizing = catalog.right_size(
+        db_instance_class,
+        str(instance.get("Engine", "")),
+        # p99 rather than max, so one outlier point does not block a resize.
+        peak_cpu_pct=utilization.cpu_pct["p99"],
+        min_freeable_memory_bytes=utilization.min_freeable_memory_bytes,
+    )
+    if sizing is None and db_instance_class in catalog.by_name:
+        # Nothing cheaper fits the observed peaks.
         return None
+    if sizing is None:
+        details["estimated_downsize_ratio"] = config.rates.rds_estimated_downsize_ratio
+        recommendation = "Consider downsizing DB instance class after workload validation"
+        savings = estimate_rds_monthly_savings(db_instance_class=db_instance_class, config=config)
+    else:
+        # Multi-AZ deployments pay for the standby as well.
+        deployments = 2 if instance.get("MultiAZ") else 1
+        details.update(
+            {
+                "target_class": sizing.target.name,
+                "required_vcpus": round(sizing.required_vcpus, 2),
+                "required_memory_gib": round(sizing.required_memory_gib, 2),
+                "current_monthly_cost_usd": round(sizing.current.monthly_usd * deployments, 2),
+                "target_monthly_cost_usd": round(sizing.target.monthly_usd * deployments, 2),
+            }
+        )
+        recommendation = f"Resize to {sizing.target.name} after workload validation"
+        savings = round((sizing.current.monthly_usd - sizing.target.monthly_usd) * deployments, 2)
+    return Finding(
+        service="rds",
+        resource_id=str(instance.get("DBInstanceIdentifier")),
+        region=region,
+        recommendation=recommendation,
+        estimated_monthly_savings_usd=savings,
+        risk_level="medium",
+        details=details,
+    )
+
 
-    datapoints = metrics.get("Datapoints", [])
-    if not datapoints:
+def _storage_finding(instance: dict, utilization: RDSUtilization, region: str | None) -> Finding | None:
+    # Aurora instances report AllocatedStorage 1 and local scratch space as
+    # FreeStorageSpace; their cluster volume grows and shrinks on its own.
+    engine = str(instance.get("Engine", ""))
+    allocated_gib = int(instance.get("AllocatedStorage", 0))
+    if engine.startswith("aurora") or not allocated_gib or utilization.min_free_storage_bytes is None:
         return None
-    values = [float(point.get("Average", 0.0)) for point in datapoints]
-    return sum(values) / len(values)
+    used_gib = max(allocated_gib - utilization.min_free_storage_bytes / (1024**3), 0.0)
+    target_gib = max(math.ceil(used_gib / (1 - RIGHTSIZING_HEADROOM)), RDS_MIN_ALLOCATED_STORAGE_GIB)
+    if target_gib > allocated_gib * RDS_STORAGE_OVERPROVISIONED_RATIO:
+        return None
+    storage_type = str(instance.get("StorageType", "gp2"))
+    rate = RDS_STORAGE_PER_GIB_MONTH_USD.get(storage_type, RDS_STORAGE_PER_GIB_MONTH_USD["gp2"])
+    deployments = 2 if instance.get("MultiAZ") else 1
+    return Finding(
+        service="rds",
+        resource_id=str(instance.get("DBInstanceIdentifier")),
+        region=region,
+        recommendation=(
+            f"Move to {target_gib} GiB of allocated storage; RDS cannot shrink storage in place, "
+            "so restore a dump or use a blue/green deployment"
+        ),
+        estimated_monthly_savings_usd=round((allocated_gib - target_gib) * rate * deployments, 2),
+        risk_level="high",
+        details={
+            "finding_type": "storage-overprovisioned",
+            "storage_type": storage_type,
+            "allocated_gib": allocated_gib,
+            "peak_used_gib": round(used_gib, 1),
+            "target_allocated_gib": target_gib,
+        },
+    )
 
 
-def analyze_rds(rds_client, cloudwatch_client, config: AppConfig, region: str | None) -> list[Finding]:
-    findings: list[Finding] = []
+def _idle_cluster_finding(
+    cluster: dict,
+    members: list[tuple[dict, RDSUtilization | None]],
+    volume_bytes: float | None,
+    config: AppConfig,
+    region: str | None,
+) -> Finding | None:
+    # A cluster is idle when every member reported connection data and none
+    # had a single connection over the lookback window.
+    if not members or any(
+        utilization is None or utilization.max_connections is None or utilization.max_connections > 0
+        for _, utilization in members
+    ):
+        return None
+    instance_cost = sum(
+        RDS_CLASS_MONTHLY_BASELINE_USD.get(
+            str(instance.get("DBInstanceClass")), config.rates.rds_default_monthly_cost_usd
+        )
+        for instance, _ in members
+    )
+    volume_gib = volume_bytes / (1024**3) if volume_bytes is not None else 0.0
+    return Finding(
+        service="rds",
+        resource_id=str(cluster.get("DBClusterIdentifier")),
+        region=region,
+        recommendation="Aurora cluster had no connections; snapshot it and stop or delete it",
+        estimated_monthly_savings_usd=round(instance_cost + volume_gib * AURORA_STORAGE_PER_GIB_MONTH_USD, 2),
+        risk_level="high",
+        details={
+            "finding_type": "idle-aurora-cluster",
+            "engine": str(cluster.get("Engine", "")),
+            "member_instances": [str(instance.get("DBInstanceIdentifier")) for instance, _ in members],
+            "member_classes": sorted({str(instance.get("DBInstanceClass")) for instance, _ in members}),
+            "volume_used_gib": round(volume_gib, 2) if volume_bytes is not None else None,
+            "lookback_days": config.thresholds.rds_lookback_days,
+        },
+    )
+
+
+def _unprotected(rds_client, resources, config: AppConfig) -> list[dict]:
+    kept: list[dict] = []
     try:
-        response = rds_client.describe_db_instances()
+        for resource in resources:
+            if not _is_protected(rds_client, resource, config):
+                kept.append(resource)
     except (BotoCoreError, ClientError):
-        return findings
+        # Resources from pages read before the failure are still analyzed.
+        pass
+    return kept
 
-    for instance in response.get("DBInstances", []):
-        db_identifier = str(instance.get("DBInstanceIdentifier"))
-        db_arn = str(instance.get("DBInstanceArn", ""))
-        if db_arn:
-            try:
-                tag_response = rds_client.list_tags_for_resource(ResourceName=db_arn)
-                if has_protection_tag(
-                    tag_response.get("TagList", []),
-                    config.protection.tag_key,
-                    config.protection.tag_value,
-                ):
-                    continue
-            except (BotoCoreError, ClientError):
-                pass
-
-        avg_cpu = _avg_cpu(
-            cloudwatch_client=cloudwatch_client,
-            db_instance_identifier=db_identifier,
-            lookback_days=config.thresholds.rds_lookback_days,
-        )
-        if avg_cpu is None:
-            continue
 
-        if avg_cpu < config.thresholds.rds_cpu_underutilized_pct:
-            db_instance_class = instance.get("DBInstanceClass")
-            estimated_savings = estimate_rds_monthly_savings(
-                db_instance_class=db_instance_class,
-                config=config,
-            )
-            findings.append(
-                Finding(
-                    service="rds",
-                    resource_id=db_identifier,
-                    region=region,
-                    recommendation="Consider downsizing DB instance class after workload validation",
-                    estimated_monthly_savings_usd=estimated_savings,
-                    risk_level="medium",
-                    details={
-                        "db_instance_class": db_instance_class,
-                        "avg_cpu_pct": round(avg_cpu, 2),
-                        "lookback_days": config.thresholds.rds_lookback_days,
-                        "estimated_downsize_ratio": config.rates.rds_estimated_downsize_ratio,
-                    },
-                )
+def analyze_rds(rds_client, cloudwatch_client, config: AppConfig, region: str | None) -> list[Finding]:
+    if config.thresholds.rds_cpu_statistic not in RDS_CPU_STATISTICS:
+        raise ValueError(f"Unsupported RDS CPU statistic {config.thresholds.rds_cpu_statistic!r}")
+    findings: list[Finding] = []
+    candidates = _unprotected(
+        rds_client,
+        iter_paginated(
+            rds_client.describe_db_instances,
+            "DBInstances",
+            token_key="Marker",
+            MaxRecords=DESCRIBE_DB_INSTANCES_PAGE_SIZE,
+        ),
+        config,
+    )
+    # DescribeDBClusters also returns Multi-AZ DB clusters, which have no
+    # shared cluster volume; their members are analyzed as plain instances.
+    clusters = _unprotected(
+        rds_client,
+        (
+            cluster
+            for cluster in iter_paginated(
+                rds_client.describe_db_clusters,
+                "DBClusters",
+                token_key="Marker",
+                MaxRecords=DESCRIBE_DB_INSTANCES_PAGE_SIZE,
             )
+            if str(cluster.get("Engine", "")).startswith("aurora")
+        ),
+        config,
+    )
+    utilization_by_instance, volume_bytes = _fetch_utilization(
+        cloudwatch_client,
+        [str(instance.get("DBInstanceIdentifier")) for instance in candidates],
+        [str(cluster.get("DBClusterIdentifier")) for cluster in clusters],
+        lookback_days=config.thresholds.rds_lookback_days,
+    )
+
+    # Cluster members are joined to the listed instances through an
+    # identifier index; members of idle clusters get no instance findings.
+    instances_by_identifier = {str(instance.get("DBInstanceIdentifier")): instance for instance in candidates}
+    idle_members: set[str] = set()
+    for cluster in clusters:
+        member_ids = [str(member.get("DBInstanceIdentifier")) for member in cluster.get("DBClusterMembers", [])]
+        # A protected or unlisted member protects the whole cluster.
+        if any(member_id not in instances_by_identifier for member_id in member_ids):
+            continue
+        members = [
+            (instances_by_identifier[member_id], utilization_by_instance.get(member_id)) for member_id in member_ids
+        ]
+        finding = _idle_cluster_finding(
+            cluster, members, volume_bytes.get(str(cluster.get("DBClusterIdentifier"))), config, region
+        )
+        if finding is not None:
+            findings.append(finding)
+            idle_members.update(member_ids)
+
+    catalog = default_catalog()
+    for instance in candidates:
+        db_identifier = str(instance.get("DBInstanceIdentifier"))
+        utilization = utilization_by_instance.get(db_identifier)
+        if utilization is None or db_identifier in idle_members:
+            continue
+        storage = _storage_finding(instance, utilization, region)
+        if storage is not None:
+            findings.append(storage)
+        if utilization.cpu_pct[config.thresholds.rds_cpu_statistic] >= config.thresholds.rds_cpu_underutilized_pct:
+            continue
+        finding = _rightsizing_finding(instance, utilization, catalog, config, region)
+        if finding is not None:
+            findings.append(finding)
 
     return findings
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+
+from aws_storage_optimizer.estimation import rds_instance_catalog
+
+# Share of the target class's CPU and memory left free above the observed peak.
+RIGHTSIZING_HEADROOM = 0.3
+# Graviton classes are not offered for these engines.
+X86_ONLY_ENGINE_PREFIXES = ("sqlserver", "oracle", "db2")
+# Aurora offers memory optimized and burstable classes only, no db.m.
+AURORA_SERIES = ("r", "x", "t")
+
+
+@dataclass(frozen=True)
+class RDSInstanceClass:
+    name: str
+    vcpus: int
+    memory_gib: float
+    monthly_usd: float
+
+    @property
+    def family(self) -> str:
+        return self.name.rsplit(".", 1)[0]
+
+    @property
+    def series(self) -> str:
+        # "t" (burstable), "m" (general purpose), "r" (memory optimized), ...
+        return self.family.removeprefix("db.")[:1]
+
+    @property
+    def burstable(self) -> bool:
+        return self.series == "t"
+
+    @property
+    def graviton(self) -> bool:
+        return self.family.endswith("g")
+
+
+@dataclass(frozen=True)
+class RightSizing:
+    current: RDSInstanceClass
+    target: RDSInstanceClass
+    required_vcpus: float
+    required_memory_gib: float
+
+
+class RightSizingCatalog:
+    # Classes are grouped by (series, graviton). A target keeps the current
+    # class's CPU credit model and a series the engine offers; x86 instances
+    # may move to Graviton. Within a
+    # group, every distinct vCPU count gets the classes with at least that
+    # many vCPUs sorted by memory, with the cheapest class at or above each
+    # memory size precomputed. A lookup is then two binary searches.
+    def __init__(self, classes: list[RDSInstanceClass]):
+        self.by_name = {instance_class.name: instance_class for instance_class in classes}
+        self._vcpu_steps: dict[tuple[str, bool], list[int]] = {}
+        self._frontiers: dict[tuple[str, bool], list[tuple[list[float], list[RDSInstanceClass]]]] = {}
+        groups: dict[tuple[str, bool], list[RDSInstanceClass]] = {}
+        for instance_class in classes:
+            groups.setdefault((instance_class.series, instance_class.graviton), []).append(instance_class)
+        for group, members in groups.items():
+            steps = sorted({member.vcpus for member in members})
+            frontiers = []
+            for step in steps:
+                eligible = sorted(
+                    (member for member in members if member.vcpus >= step),
+                    key=lambda member: (member.memory_gib, member.monthly_usd),
+                )
+                cheapest: list[RDSInstanceClass] = []
+                for member in reversed(eligible):
+                    if not cheapest or member.monthly_usd < cheapest[-1].monthly_usd:
+                        cheapest.append(member)
+                    else:
+                        cheapest.append(cheapest[-1])
+                cheapest.reverse()
+                frontiers.append(([member.memory_gib for member in eligible], cheapest))
+            self._vcpu_steps[group] = steps
+            self._frontiers[group] = frontiers
+
+    def cheapest(self, vcpus: float, memory_gib: float, series: str, graviton: bool) -> RDSInstanceClass | None:
+        steps = self._vcpu_steps.get((series, graviton), [])
+        step_index = bisect.bisect_left(steps, vcpus)
+        if step_index == len(steps):
+            return None
+        memories, cheapest = self._frontiers[(series, graviton)][step_index]
+        memory_index = bisect.bisect_left(memories, memory_gib)
+        if memory_index == len(memories):
+            return None
+        return cheapest[memory_index]
+
+    def right_size(
+        self,
+        db_instance_class: str | None,
+        engine: str,
+        peak_cpu_pct: float,
+        min_freeable_memory_bytes: float | None,
+    ) -> RightSizing | None:
+        current = self.by_name.get(db_instance_class or "")
+        if current is None:
+            return None
+        required_vcpus = current.vcpus * peak_cpu_pct / 100 / (1 - RIGHTSIZING_HEADROOM)
+        # Without memory data the current memory size is kept.
+        required_memory_gib = current.memory_gib
+        if min_freeable_memory_bytes is not None:
+            used_gib = max(current.memory_gib - min_freeable_memory_bytes / (1024**3), 0.0)
+            required_memory_gib = used_gib / (1 - RIGHTSIZING_HEADROOM)
+        series_options = {
+            series
+            for series, _ in self._vcpu_steps
+            if (series == "t") == current.burstable and (not engine.startswith("aurora") or series in AURORA_SERIES)
+        }
+        graviton_options = [current.graviton]
+        if not current.graviton and not engine.startswith(X86_ONLY_ENGINE_PREFIXES):
+            graviton_options.append(True)
+        candidates = [
+            self.cheapest(required_vcpus, required_memory_gib, series, graviton)
+            for series in series_options
+            for graviton in graviton_options
+        ]
+        targets = [candidate for candidate in candidates if candidate is not None]
+        if not targets:
+            return None
+        target = min(targets, key=lambda candidate: (candidate.monthly_usd, candidate.name))
+        if target.monthly_usd >= current.monthly_usd:
+            return None
+        return RightSizing(current, target, required_vcpus, required_memory_gib)
+
+
+def default_catalog() -> RightSizingCatalog:
+    return RightSizingCatalog(
+        [
+            RDSInstanceClass(name, vcpus, memory_gib, monthly_usd)
+            for name, (vcpus, memory_gib, monthly_usd) in rds_instance_catalog().items()
+        ]
+    )
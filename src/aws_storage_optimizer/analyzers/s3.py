@@ -1,9 +1,39 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import math
+import threading
+from typing import Any, Callable, Iterator
+
 from botocore.exceptions import BotoCoreError, ClientError
 
+from aws_storage_optimizer.analyzers.s3_checkpoint import ScanCheckpoint, ShardProgress
+from aws_storage_optimizer.analyzers.s3_duplicates import (
+    DuplicateIndex,
+    DuplicateReport,
+    DuplicateWriter,
+    duplicate_findings,
+    find_duplicates,
+)
+from aws_storage_optimizer.analyzers.s3_prefix_trie import PrefixTrie
+from aws_storage_optimizer.analyzers.s3_reclaimable import (
+    ReclaimableStorage,
+    reclaimable_findings,
+    scan_reclaimable_storage,
+)
+from aws_storage_optimizer.analyzers.s3_sampling import SampleEstimate, estimate_bucket_size
+from aws_storage_optimizer.analyzers.s3_stats import AgeCutoffs, BucketStats, LargestObjects
 from aws_storage_optimizer.config import AppConfig
-from aws_storage_optimizer.estimation import estimate_s3_monthly_savings
+from aws_storage_optimizer.estimation import (
+    S3_TRANSITION_TARGET_CLASSES,
+    S3StaleObjects,
+    estimate_s3_monthly_savings,
+    estimate_s3_transition,
+    s3_storage_class_rate,
+)
+from aws_storage_optimizer.metrics import get_metric_data_batched, metric_stat_query
 from aws_storage_optimizer.models import Finding
 from aws_storage_optimizer.utils import has_protection_tag
 
@@ -39,68 +69,757 @@ def _resolve_bucket_region(s3_client, bucket_name: str) -> str | None:
     return str(location)
 
 
-def analyze_s3(s3_client, config: AppConfig, top_n: int) -> list[Finding]:
-    findings: list[Finding] = []
-    try:
-        buckets = s3_client.list_buckets().get("Buckets", [])
-    except (BotoCoreError, ClientError):
-        return findings
+S3_METRIC_STORAGE_TYPES = (
+    "StandardStorage",
+    "IntelligentTieringFAStorage",
+    "IntelligentTieringIAStorage",
+    "IntelligentTieringAAStorage",
+    "IntelligentTieringAIAStorage",
+    "IntelligentTieringDAAStorage",
+    "StandardIAStorage",
+    "OneZoneIAStorage",
+    "ReducedRedundancyStorage",
+    "GlacierInstantRetrievalStorage",
+    "GlacierStorage",
+    "DeepArchiveStorage",
+)
+# S3 storage metrics are published once a day; look back far enough to always
+# catch the latest datapoint.
+S3_METRIC_LOOKBACK_DAYS = 3
+LIST_PAGE_SIZE = 1000
+LIST_BUCKETS_PAGE_SIZE = 1000
+DEFAULT_LIST_PAGES = 5
+# Buckets whose cheap estimate is within this fraction of the N-th largest
+# estimate are still deep-scanned, since metric sizes lag by up to a day.
+PLANNER_SIZE_MARGIN = 0.9
+# Upper share of a list budget held back for buckets without a size estimate.
+PLANNER_PROBE_SHARE = 0.25
+# Checkpoint key of a listing without Delimiter. Common prefixes end with "/",
+# so no prefix shard can have this key.
+FLAT_SHARD = "*"
+
+
+@dataclass
+class ListingProgress:
+    pages: int = 0
+    complete: bool = False
+    estimate: SampleEstimate | None = None
+    largest: LargestObjects | None = None
+    # Shard states of an unfinished budgeted listing, kept so spare pages can continue it.
+    shards: dict[str, ShardProgress] = field(default_factory=dict)
+
+
+@dataclass
+class BucketScan:
+    name: str
+    region: str | None
+    size_bytes: int
+    size_source: str
+    object_count: int | None = None
+    stats: BucketStats | None = None
+    listing: ListingProgress | None = None
+
+
+@dataclass
+class S3ScanUsage:
+    list_requests: int = 0
+    list_request_budget: int | None = None
+    unscanned_buckets: int = 0
+    duplicates: DuplicateReport | None = None
+
 
-    bucket_sizes: list[tuple[str, str | None, int]] = []
-    for bucket in buckets:
-        bucket_name = bucket.get("Name")
-        if not bucket_name:
+def _metric_bucket_sizes(cloudwatch_client, bucket_names: list[str]) -> dict[str, tuple[int, int | None]]:
+    queries: list[dict] = []
+    query_targets: dict[str, tuple[str, str]] = {}
+    for bucket_name in bucket_names:
+        for storage_type in (*S3_METRIC_STORAGE_TYPES, "AllStorageTypes"):
+            query_id = f"q{len(queries)}"
+            metric_name = "NumberOfObjects" if storage_type == "AllStorageTypes" else "BucketSizeBytes"
+            queries.append(
+                metric_stat_query(
+                    query_id,
+                    namespace="AWS/S3",
+                    metric_name=metric_name,
+                    dimensions={"BucketName": bucket_name, "StorageType": storage_type},
+                    period=86400,
+                    stat="Average",
+                )
+            )
+            query_targets[query_id] = (bucket_name, metric_name)
+
+    end_time = datetime.now(timezone.utc)
+    series = get_metric_data_batched(
+        cloudwatch_client,
+        queries,
+        start_time=end_time - timedelta(days=S3_METRIC_LOOKBACK_DAYS),
+        end_time=end_time,
+    )
+
+    sizes: dict[str, tuple[int, int | None]] = {}
+    for query_id, values in series.items():
+        if not values or query_id not in query_targets:
             continue
-        if _is_protected_bucket(
+        bucket_name, metric_name = query_targets[query_id]
+        size_bytes, object_count = sizes.get(bucket_name, (0, None))
+        if metric_name == "NumberOfObjects":
+            object_count = int(values[-1])
+        else:
+            size_bytes += int(values[-1])
+        sizes[bucket_name] = (size_bytes, object_count)
+    return sizes
+
+
+class _PageBudget:
+    # `used` counts pages charged against the quota; `requests` counts every
+    # request sent. Without a request budget, pages that return only common
+    # prefixes are sent but not charged, so discovery leaves the object pages.
+    def __init__(self, pages: int, free_prefix_pages: bool = False):
+        self.pages = pages
+        self.free_prefix_pages = free_prefix_pages
+        self.used = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return self.pages - self.used
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.used >= self.pages:
+                return False
+            self.used += 1
+            self.requests += 1
+            return True
+
+    def charge(self, page: dict) -> int:
+        # Returns the pages charged for a page already taken.
+        if self.free_prefix_pages and not page.get("Contents") and page.get("CommonPrefixes"):
+            with self._lock:
+                self.used -= 1
+            return 0
+        return 1
+
+
+def _add_page_objects(
+    stats: BucketStats,
+    largest: LargestObjects,
+    bucket_name: str,
+    page: dict,
+    cutoffs: AgeCutoffs,
+    duplicates: DuplicateWriter | None = None,
+) -> None:
+    for obj in page.get("Contents", []):
+        size = int(obj.get("Size", 0))
+        storage_class = str(obj.get("StorageClass") or "STANDARD")
+        last_modified = obj.get("LastModified")
+        if not isinstance(last_modified, datetime):
+            last_modified = None
+        is_stale, age_index = cutoffs.classify(last_modified)
+        key = str(obj.get("Key", ""))
+        stats.add(size, storage_class, is_stale, age_index, key)
+        threshold = largest.threshold()
+        if threshold is not None and size >= threshold:
+            modified = last_modified.isoformat() if last_modified is not None else ""
+            largest.offer(size, bucket_name, key, storage_class, modified)
+        if duplicates is not None:
+            duplicates.add(str(obj.get("ETag", "")), size, bucket_name, key, storage_class)
+
+
+def _list_request(bucket_name: str, prefix: str, continuation_token: str | None) -> dict:
+    kwargs: dict[str, Any] = {"Bucket": bucket_name, "MaxKeys": LIST_PAGE_SIZE}
+    if not prefix:
+        kwargs["Delimiter"] = "/"
+    elif prefix != FLAT_SHARD:
+        kwargs["Prefix"] = prefix
+    if continuation_token:
+        kwargs["ContinuationToken"] = continuation_token
+    return kwargs
+
+
+def _skip_root_keys(page: dict, through: str) -> dict:
+    # Keys without "/" up to `through` were already counted by the "" shard.
+    contents = []
+    for obj in page.get("Contents", []):
+        key = str(obj.get("Key", ""))
+        if "/" in key or key > through:
+            contents.append(obj)
+    return {**page, "Contents": contents}
+
+
+def _list_shard(
+    s3_client,
+    bucket_name: str,
+    prefix: str,
+    cutoffs: AgeCutoffs,
+    budget: _PageBudget,
+    checkpoint: ScanCheckpoint | None,
+    config: AppConfig,
+    duplicates: DuplicateIndex | None = None,
+    progress: ShardProgress | None = None,
+    root_keys_through: str | None = None,
+) -> ShardProgress:
+    # The "" shard is the top-level listing with Delimiter="/", which returns
+    # the root objects plus the common prefixes; it stops once the prefixes
+    # found could not each get a page. FLAT_SHARD lists the whole bucket
+    # without a delimiter, skipping root keys through `root_keys_through`;
+    # other shards list one prefix. Passing an earlier result continues that
+    # listing.
+    if progress is None:
+        progress = checkpoint.shard(bucket_name, prefix) if checkpoint is not None else ShardProgress()
+    largest = LargestObjects.from_list(config.s3_scan.largest_objects, progress.largest_objects)
+    if progress.stats.prefixes is None and config.lifecycle.prefix_depth > 0:
+        progress.stats.prefixes = PrefixTrie(config.lifecycle.prefix_depth, config.lifecycle.max_prefix_nodes)
+    writer = duplicates.writer() if duplicates is not None else None
+    while not progress.complete:
+        if (not prefix and len(progress.common_prefixes) > budget.remaining) or not budget.take():
+            break
+        try:
+            page = s3_client.list_objects_v2(**_list_request(bucket_name, prefix, progress.continuation_token))
+        except (BotoCoreError, ClientError):
+            break
+        progress.pages += budget.charge(page)
+        if root_keys_through is not None:
+            page = _skip_root_keys(page, root_keys_through)
+        _add_page_objects(progress.stats, largest, bucket_name, page, cutoffs, writer)
+        prefixes = [str(item["Prefix"]) for item in page.get("CommonPrefixes", []) if item.get("Prefix")]
+        progress.common_prefixes.extend(prefixes)
+        if not prefix:
+            keys = [str(obj.get("Key", "")) for obj in page.get("Contents", [])[-1:]]
+            progress.last_key = max([progress.last_key, *keys, *prefixes[-1:]])
+        progress.continuation_token = page.get("NextContinuationToken")
+        progress.complete = not progress.continuation_token
+        progress.largest_objects = largest.to_list()
+        if checkpoint is not None:
+            checkpoint.record(bucket_name, prefix, progress)
+    if writer is not None:
+        writer.flush()
+    return progress
+
+
+def _list_bucket_stats(
+    s3_client,
+    bucket_name: str,
+    cutoffs: AgeCutoffs,
+    max_pages: int,
+    config: AppConfig,
+    checkpoint: ScanCheckpoint | None = None,
+    duplicates: DuplicateIndex | None = None,
+    earlier: dict[str, ShardProgress] | None = None,
+) -> tuple[BucketStats, ListingProgress]:
+    # Continuation tokens make one listing strictly serial. The top-level "/"
+    # prefixes are discovered first and listed on their own workers; objects
+    # directly under the root come back with the discovery pages. Each prefix
+    # gets a fixed page quota, dealt round-robin in prefix order, and pages a
+    # finished prefix leaves unused go to the unfinished ones afterwards, again
+    # in prefix order. Which pages are listed therefore never depends on
+    # worker timing. When the prefixes cannot each get a page, the bucket is
+    # listed flat instead, so a quota of a few pages still covers a few pages
+    # of objects. Pages a resumed or continued listing recorded before count
+    # against the same quotas, so resuming lists what one uninterrupted run
+    # would have. Once a flat listing has started the bucket stays flat.
+    def saved(shard: str) -> ShardProgress:
+        if earlier is not None:
+            return earlier.get(shard, ShardProgress())
+        return checkpoint.shard(bucket_name, shard) if checkpoint is not None else ShardProgress()
+
+    root = saved("")
+    flat_started = saved(FLAT_SHARD).pages > 0
+    root_budget = _PageBudget(
+        0 if flat_started else max_pages - root.pages, free_prefix_pages=config.s3_scan.max_list_requests is None
+    )
+    largest_limit = config.s3_scan.largest_objects
+    root = _list_shard(s3_client, bucket_name, "", cutoffs, root_budget, checkpoint, config, duplicates, root)
+    budgets = [root_budget]
+    shards: list[ShardProgress] = []
+    prefixes = root.common_prefixes
+    remaining = max_pages - root.pages
+    flat = flat_started or len(prefixes) > remaining
+    if flat:
+        shards = [saved(FLAT_SHARD)]
+        budgets.append(_PageBudget(remaining - shards[0].pages))
+        shards[0] = _list_shard(
             s3_client,
-            bucket_name=bucket_name,
-            key=config.protection.tag_key,
-            value=config.protection.tag_value,
-        ):
-            continue
+            bucket_name,
+            FLAT_SHARD,
+            cutoffs,
+            budgets[-1],
+            checkpoint,
+            config,
+            duplicates,
+            shards[0],
+            root_keys_through=root.last_key,
+        )
+    elif root.complete and prefixes:
+        shards = [saved(prefix) for prefix in prefixes]
+        share, extra = divmod(remaining, len(prefixes))
+        budgets += [
+            _PageBudget(share + (1 if index < extra else 0) - shard.pages) for index, shard in enumerate(shards)
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(config.s3_scan.prefix_concurrency, len(prefixes)))) as executor:
+            shards = list(
+                executor.map(
+                    lambda prefix, budget, shard: _list_shard(
+                        s3_client, bucket_name, prefix, cutoffs, budget, checkpoint, config, duplicates, shard
+                    ),
+                    prefixes,
+                    budgets[1:],
+                    shards,
+                )
+            )
+        budgets.append(_PageBudget(remaining - sum(shard.pages for shard in shards)))
+        for index, shard in enumerate(shards):
+            if not shard.complete and budgets[-1].remaining > 0:
+                shards[index] = _list_shard(
+                    s3_client, bucket_name, prefixes[index], cutoffs, budgets[-1], checkpoint, config, duplicates, shard
+                )
+
+    stats = BucketStats()
+    stats.merge(root.stats)
+    largest = LargestObjects.from_list(largest_limit, root.largest_objects)
+    # A flat listing also covers the root keys the discovery pages did not reach.
+    complete = flat or root.complete
+    for shard in shards:
+        stats.merge(shard.stats)
+        largest.merge(LargestObjects.from_list(largest_limit, shard.largest_objects))
+        complete = complete and shard.complete
+
+    pages = sum(budget.requests for budget in budgets)
+    listing = ListingProgress(pages=pages, complete=complete, largest=largest)
+    if not complete and config.s3_scan.max_list_requests is not None:
+        listing.shards = {"": root, **dict(zip([FLAT_SHARD] if flat else prefixes, shards))}
+    return stats, listing
+
+
+def _plan_list_quotas(
+    bucket_names: list[str],
+    metric_sizes: dict[str, tuple[int, int | None]],
+    top_n: int,
+    budget: int | None,
+) -> dict[str, int]:
+    if budget is None:
+        return {name: 0 if name in metric_sizes else DEFAULT_LIST_PAGES for name in bucket_names}
+
+    # Phase 1: rank by cheap estimates. Only buckets that can still land in the
+    # top N are deep-scanned; buckets with no estimate are probed afterwards.
+    ranked = sorted((name for name in bucket_names if name in metric_sizes), key=lambda n: (-metric_sizes[n][0], n))
+    cutoff = metric_sizes[ranked[top_n - 1]][0] * PLANNER_SIZE_MARGIN if 0 < top_n <= len(ranked) else 0
+    candidates = [name for name in ranked if metric_sizes[name][0] >= cutoff]
+    unknown = [name for name in bucket_names if name not in metric_sizes]
+
+    # Phase 2: fix page quotas before any worker starts so the outcome does not
+    # depend on completion order. Part of the budget is held back to probe
+    # buckets without an estimate. The rest is shared max-min fairly: buckets
+    # are served smallest need first, each capped at an equal share of what
+    # is left, so one bucket that can never finish cannot starve the others
+    # and takes only the pages nobody else needs.
+    quotas = {name: 0 for name in bucket_names}
+    reserve = min(len(unknown) * DEFAULT_LIST_PAGES, max(len(unknown), int(budget * PLANNER_PROBE_SHARE)), budget)
+    remaining = budget - reserve
+    # One page more than the objects fill, for the root delimiter listing;
+    # per-prefix rounding cannot be known before listing and is left to the
+    # spare page pass.
+    needs = {
+        name: math.ceil(metric_sizes[name][1] / LIST_PAGE_SIZE) + 1
+        if metric_sizes[name][1] is not None
+        else DEFAULT_LIST_PAGES
+        for name in candidates
+    }
+    # sorted() is stable, so ties keep rank order.
+    by_need = sorted(candidates, key=needs.__getitem__)
+    for position, name in enumerate(by_need):
+        quotas[name] = min(needs[name], remaining // (len(by_need) - position))
+        remaining -= quotas[name]
+    remaining += reserve
+    for name in unknown:
+        quotas[name] = min(DEFAULT_LIST_PAGES, remaining)
+        remaining -= quotas[name]
+    return quotas
+
+
+def _bucket_client(s3_client, bucket_region: str | None, regional_s3_client: Callable[[str], Any] | None):
+    # Calls sent to a client in another region are redirected, costing an extra round trip each.
+    if regional_s3_client is not None and bucket_region:
+        return regional_s3_client(bucket_region)
+    return s3_client
 
-        total_size = 0
+
+def _open_bucket(
+    s3_client,
+    bucket_name: str,
+    bucket_region: str | None,
+    config: AppConfig,
+    regional_s3_client: Callable[[str], Any] | None = None,
+) -> tuple[Any, str | None] | None:
+    # Returns the client to use for an unprotected bucket and its region.
+    if bucket_region is None:
         bucket_region = _resolve_bucket_region(s3_client, bucket_name)
-        continuation_token = None
-        page_count = 0
-        while True:
-            kwargs = {"Bucket": bucket_name, "MaxKeys": 1000}
-            if continuation_token:
-                kwargs["ContinuationToken"] = continuation_token
-            try:
-                page = s3_client.list_objects_v2(**kwargs)
-            except (BotoCoreError, ClientError):
-                break
-
-            for obj in page.get("Contents", []):
-                total_size += int(obj.get("Size", 0))
-
-            continuation_token = page.get("NextContinuationToken")
-            page_count += 1
-            if not continuation_token or page_count >= 5:
-                break
-
-        bucket_sizes.append((bucket_name, bucket_region, total_size))
-
-    bucket_sizes.sort(key=lambda item: item[2], reverse=True)
-    for bucket_name, bucket_region, size_bytes in bucket_sizes[:top_n]:
-        size_gib = round(size_bytes / (1024**3), 2)
-        estimated_savings = estimate_s3_monthly_savings(size_gib=size_gib, config=config)
+    bucket_client = _bucket_client(s3_client, bucket_region, regional_s3_client)
+
+    if _is_protected_bucket(
+        bucket_client,
+        bucket_name=bucket_name,
+        key=config.protection.tag_key,
+        value=config.protection.tag_value,
+    ):
+        return None
+    return bucket_client, bucket_region
+
+
+def _scan_bucket(
+    bucket_client,
+    bucket_name: str,
+    bucket_region: str | None,
+    config: AppConfig,
+    metric_sizes: dict[str, tuple[int, int | None]],
+    inventory_stats: dict[str, BucketStats],
+    page_quota: int,
+    checkpoint: ScanCheckpoint | None = None,
+    duplicates: DuplicateIndex | None = None,
+    earlier: dict[str, ShardProgress] | None = None,
+) -> BucketScan | None:
+    if bucket_name in inventory_stats:
+        stats = inventory_stats[bucket_name]
+        return BucketScan(bucket_name, bucket_region, stats.size_bytes, "inventory", stats.object_count, stats)
+    metric_size = metric_sizes.get(bucket_name)
+    if page_quota <= 0:
+        if metric_size is None:
+            return None
+        return BucketScan(bucket_name, bucket_region, metric_size[0], "cloudwatch", metric_size[1])
+
+    if config.s3_scan.size_source == "sample":
+        max_requests = config.s3_scan.sample_requests
+        if config.s3_scan.max_list_requests is not None:
+            max_requests = min(page_quota, max_requests)
+        estimate = estimate_bucket_size(bucket_client, bucket_name, max_requests)
+        listing = ListingProgress(estimate.requests, estimate.exact, estimate)
+        return BucketScan(
+            bucket_name, bucket_region, estimate.size_bytes, "sample", estimate.object_count, None, listing
+        )
+
+    cutoffs = AgeCutoffs.since(datetime.now(timezone.utc), config.thresholds.s3_stale_days)
+    stats, listing = _list_bucket_stats(
+        bucket_client,
+        bucket_name,
+        cutoffs,
+        max_pages=page_quota,
+        config=config,
+        checkpoint=checkpoint,
+        duplicates=duplicates,
+        earlier=earlier,
+    )
+    if metric_size is not None and not listing.complete:
+        # A truncated listing undercounts; keep the metric size and attach the partial breakdown.
+        return BucketScan(bucket_name, bucket_region, metric_size[0], "cloudwatch", metric_size[1], stats, listing)
+    return BucketScan(bucket_name, bucket_region, stats.size_bytes, "list", stats.object_count, stats, listing)
+
+
+def _spend_spare_pages(
+    s3_client,
+    bucket_scans: list[BucketScan],
+    spare: int,
+    config: AppConfig,
+    metric_sizes: dict[str, tuple[int, int | None]],
+    regional_s3_client: Callable[[str], Any] | None = None,
+    checkpoint: ScanCheckpoint | None = None,
+    duplicates: DuplicateIndex | None = None,
+) -> None:
+    # Pages the plan left unused continue unfinished listings, one bucket at a
+    # time in rank order, so which pages are listed stays deterministic.
+    unfinished = sorted(
+        (index for index, scan in enumerate(bucket_scans) if scan.listing is not None and scan.listing.shards),
+        key=lambda index: (-metric_sizes.get(bucket_scans[index].name, (-1, None))[0], bucket_scans[index].name),
+    )
+    for index in unfinished:
+        scan = bucket_scans[index]
+        if spare <= 0:
+            break
+        listed = sum(shard.pages for shard in scan.listing.shards.values())
+        continued = _scan_bucket(
+            _bucket_client(s3_client, scan.region, regional_s3_client),
+            scan.name,
+            scan.region,
+            config,
+            metric_sizes,
+            {},
+            listed + spare,
+            checkpoint,
+            duplicates,
+            scan.listing.shards,
+        )
+        if continued is not None and continued.listing is not None:
+            spare -= continued.listing.pages
+            continued.listing.pages += scan.listing.pages
+            bucket_scans[index] = continued
+
+
+def _stale_objects(scan: BucketScan) -> dict[str, S3StaleObjects] | None:
+    if scan.stats is None or scan.stats.size_bytes <= 0:
+        return None
+    # A truncated listing kept alongside a metric size is a sample of the bucket;
+    # scale its stale bytes and objects up to the full size.
+    scale = scan.size_bytes / scan.stats.size_bytes
+    return {
+        storage_class: S3StaleObjects(
+            gib=size * scale / (1024**3),
+            objects=count * scale,
+            small_gib=small_size * scale / (1024**3),
+            small_objects=small_count * scale,
+        )
+        for storage_class, (size, count, small_size, small_count) in scan.stats.stale_size_buckets().items()
+    }
+
+
+def _transition_details(stale_objects: dict[str, S3StaleObjects], config: AppConfig) -> dict:
+    estimates = [
+        estimate_s3_transition(stale_objects, target_class, config) for target_class in S3_TRANSITION_TARGET_CLASSES
+    ]
+    estimates = [estimate for estimate in estimates if estimate.objects]
+    if not estimates:
+        return {}
+    return {
+        "transition_net_savings": {estimate.target_class: estimate.to_dict() for estimate in estimates},
+        # Moving these would save on the per-GiB rate but lose money overall.
+        "transition_loses_money": [
+            estimate.target_class
+            for estimate in estimates
+            if estimate.net_monthly_savings_usd < 0 < estimate.gross_monthly_savings_usd
+        ],
+    }
+
+
+def _lifecycle_candidates(prefixes: PrefixTrie, config: AppConfig) -> list[dict]:
+    rate_delta = config.rates.s3_standard_per_gib_month_usd - config.rates.s3_standard_ia_per_gib_month_usd
+    return [
+        {
+            "prefix": candidate["prefix"],
+            "size_gib": round(candidate["size_bytes"] / (1024**3), 2),
+            "object_count": candidate["object_count"],
+            "stale_gib": round(candidate["stale_bytes"] / (1024**3), 2),
+            "stale_fraction": round(candidate["stale_bytes"] / candidate["size_bytes"], 2),
+            "transition_after_days": config.thresholds.s3_stale_days,
+            "estimated_monthly_savings_usd": round(max(candidate["stale_bytes"] / (1024**3) * rate_delta, 0.0), 2),
+        }
+        for candidate in prefixes.lifecycle_candidates(
+            config.lifecycle.min_stale_fraction,
+            config.lifecycle.max_recommendations,
+        )
+    ]
+
+
+def _bucket_details(scan: BucketScan, size_gib: float, config: AppConfig) -> dict:
+    details: dict = {"approx_size_gib": size_gib, "size_source": scan.size_source}
+    if scan.object_count is not None:
+        details["object_count"] = scan.object_count
+    if scan.listing is not None and scan.listing.estimate is not None:
+        estimate = scan.listing.estimate
+        details["size_estimate"] = {
+            "confidence_level": 0.95,
+            "object_count_low": estimate.object_count_interval[0],
+            "object_count_high": estimate.object_count_interval[1],
+            "size_gib_low": round(estimate.size_bytes_interval[0] / (1024**3), 2),
+            "size_gib_high": round(estimate.size_bytes_interval[1] / (1024**3), 2),
+            "list_requests": estimate.requests,
+            "exact": estimate.exact,
+        }
+    elif scan.listing is not None and not scan.listing.complete:
+        subject = "Size estimated" if scan.size_source == "list" else "Object breakdown"
+        details["sample_limit_note"] = (
+            f"{subject} from a partial listing of {scan.listing.pages} pages, read from the start of each "
+            "top-level prefix or, for buckets with too many prefixes, of the whole bucket"
+        )
+    if scan.stats is not None:
+        details["stale_size_gib"] = round(scan.stats.stale_bytes / (1024**3), 2)
+        details["stale_object_count"] = scan.stats.stale_count
+        details["storage_class_gib"] = {
+            storage_class: round(size / (1024**3), 2)
+            for storage_class, size in sorted(scan.stats.storage_class_bytes.items())
+        }
+        details["storage_class_age_gib"] = {
+            storage_class: {age: round(size / (1024**3), 2) for age, size in ages.items()}
+            for storage_class, ages in scan.stats.age_bytes().items()
+        }
+        details["object_size_counts"] = scan.stats.size_bucket_counts()
+        if scan.stats.prefixes is not None:
+            details["lifecycle_candidates"] = _lifecycle_candidates(scan.stats.prefixes, config)
+    if scan.listing is not None and scan.listing.largest is not None and scan.listing.largest.limit > 0:
+        details["largest_objects"] = scan.listing.largest.to_list()
+    details["stale_days_threshold"] = config.thresholds.s3_stale_days
+    stale_objects = _stale_objects(scan)
+    if stale_objects is None:
+        details["estimated_optimization_ratio"] = config.rates.s3_estimated_optimization_ratio
+    else:
+        details.update(_transition_details(stale_objects, config))
+    return details
+
+
+def _bucket_finding(scan: BucketScan, config: AppConfig) -> Finding:
+    size_gib = round(scan.size_bytes / (1024**3), 2)
+    estimated_savings = estimate_s3_monthly_savings(
+        size_gib=size_gib,
+        config=config,
+        stale_objects=_stale_objects(scan),
+    )
+    details = _bucket_details(scan, size_gib, config)
+    recommendation = "Review lifecycle policy, archive infrequently accessed objects"
+    if "STANDARD_IA" in details.get("transition_loses_money", []):
+        recommendation = (
+            "Stale objects are too small to transition profitably; aggregate them"
+            " or filter lifecycle rules with ObjectSizeGreaterThan"
+        )
+    return Finding(
+        service="s3",
+        resource_id=scan.name,
+        region=scan.region,
+        recommendation=recommendation,
+        estimated_monthly_savings_usd=estimated_savings,
+        risk_level="medium",
+        details=details,
+    )
+
+
+def _iter_buckets(s3_client) -> Iterator[tuple[str, str | None]]:
+    # Passing any ListBuckets parameter makes S3 include BucketRegion per bucket,
+    # which saves a GetBucketLocation round trip for every bucket.
+    continuation_token = None
+    while True:
+        kwargs: dict = {"MaxBuckets": LIST_BUCKETS_PAGE_SIZE}
+        if continuation_token:
+            kwargs["ContinuationToken"] = continuation_token
+        try:
+            page = s3_client.list_buckets(**kwargs)
+        except (BotoCoreError, ClientError):
+            return
+
+        for bucket in page.get("Buckets", []):
+            if bucket.get("Name"):
+                region = bucket.get("BucketRegion")
+                yield str(bucket["Name"]), str(region) if region else None
+
+        continuation_token = page.get("ContinuationToken")
+        if not continuation_token:
+            return
+
+
+def analyze_s3(
+    s3_client,
+    config: AppConfig,
+    top_n: int,
+    cloudwatch_client=None,
+    inventory_stats: dict[str, BucketStats] | None = None,
+    usage: S3ScanUsage | None = None,
+    regional_s3_client: Callable[[str], Any] | None = None,
+    checkpoint: ScanCheckpoint | None = None,
+    duplicates: DuplicateIndex | None = None,
+) -> list[Finding]:
+    findings: list[Finding] = []
+    inventory_stats = inventory_stats or {}
+    usage = usage if usage is not None else S3ScanUsage()
+    budget = config.s3_scan.max_list_requests
+    usage.list_request_budget = budget
+    # Ranking needs the full bucket set, so the stream is collected here; a
+    # name -> region map stays small even for accounts with 10k buckets.
+    bucket_regions = dict(_iter_buckets(s3_client))
+    # Inventory reports can describe buckets this identity cannot list.
+    for bucket_name in sorted(set(inventory_stats) - set(bucket_regions)):
+        bucket_regions[bucket_name] = None
+    bucket_names = list(bucket_regions)
+    metric_sizes: dict[str, tuple[int, int | None]] = {}
+    if cloudwatch_client is not None and (config.s3_scan.size_source == "metrics" or budget is not None):
+        # Buckets without datapoints (new buckets, other-region buckets) fall back to listing.
+        metric_sizes = _metric_bucket_sizes(
+            cloudwatch_client,
+            [name for name in bucket_names if name not in inventory_stats],
+        )
+    quotas = _plan_list_quotas(
+        [name for name in bucket_names if name not in inventory_stats],
+        metric_sizes,
+        top_n=top_n,
+        budget=budget,
+    )
+    usage.unscanned_buckets = sum(1 for name, quota in quotas.items() if quota <= 0 and name not in metric_sizes)
+
+    def scan(name: str) -> tuple[BucketScan | None, tuple[str | None, ReclaimableStorage] | None]:
+        opened = _open_bucket(s3_client, name, bucket_regions[name], config, regional_s3_client)
+        if opened is None:
+            return None, None
+        bucket_client, region = opened
+        bucket_scan = _scan_bucket(
+            bucket_client,
+            name,
+            region,
+            config,
+            metric_sizes,
+            inventory_stats,
+            quotas.get(name, 0),
+            checkpoint,
+            duplicates,
+        )
+        reclaimable = None
+        if config.s3_scan.reclaimable_requests > 0:
+            reclaimable = scan_reclaimable_storage(bucket_client, name, config)
+        return bucket_scan, (region, reclaimable) if reclaimable is not None else None
+
+    # Workers finish in arbitrary order; executor.map yields results in submission
+    # order and the sort below breaks size ties by name, so output is deterministic.
+    bucket_scans: list[BucketScan] = []
+    reclaimable_scans: dict[str, tuple[str | None, ReclaimableStorage]] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, config.s3_scan.concurrency)) as executor:
+            for name, (bucket_scan, reclaimable) in zip(bucket_names, executor.map(scan, bucket_names)):
+                if bucket_scan is not None:
+                    bucket_scans.append(bucket_scan)
+                if reclaimable is not None:
+                    reclaimable_scans[name] = reclaimable
+        if budget is not None:
+            spare = budget - sum(scan.listing.pages for scan in bucket_scans if scan.listing is not None)
+            _spend_spare_pages(
+                s3_client, bucket_scans, spare, config, metric_sizes, regional_s3_client, checkpoint, duplicates
+            )
+    finally:
+        # Also runs on Ctrl-C or an unexpected error, so the next --resume starts from the last page listed.
+        if checkpoint is not None:
+            checkpoint.save()
+    usage.list_requests = sum(scan.listing.pages for scan in bucket_scans if scan.listing is not None)
+
+    bucket_scans.sort(key=lambda scan: (-scan.size_bytes, scan.name))
+    for scan in bucket_scans[:top_n]:
+        findings.append(_bucket_finding(scan, config))
+
+    # Every global top-K object is in its own bucket's top K, so merging the
+    # per-bucket heaps is exact while holding only K entries.
+    largest = LargestObjects(config.s3_scan.largest_objects)
+    bucket_by_name = {scan.name: scan for scan in bucket_scans}
+    for scan in bucket_scans:
+        if scan.listing is not None and scan.listing.largest is not None:
+            largest.merge(scan.listing.largest)
+    for size, bucket_name, key, storage_class, last_modified in largest.entries():
+        size_gib = round(size / (1024**3), 2)
+        rate = s3_storage_class_rate(storage_class, config) or 0.0
         findings.append(
             Finding(
                 service="s3",
-                resource_id=bucket_name,
-                region=bucket_region,
-                recommendation="Review lifecycle policy, archive infrequently accessed objects",
-                estimated_monthly_savings_usd=estimated_savings,
-                risk_level="medium",
+                resource_id=f"{bucket_name}/{key}",
+                region=bucket_by_name[bucket_name].region,
+                recommendation="Large object: download a copy if needed, then delete",
+                estimated_monthly_savings_usd=round(size_gib * rate, 2),
+                risk_level="high",
                 details={
-                    "approx_size_gib": size_gib,
-                    "sample_limit_note": "Size estimated from up to 5 pages of objects",
-                    "stale_days_threshold": config.thresholds.s3_stale_days,
-                    "estimated_optimization_ratio": config.rates.s3_estimated_optimization_ratio,
+                    "bucket": bucket_name,
+                    "key": key,
+                    "size_gib": size_gib,
+                    "size_bytes": size,
+                    "storage_class": storage_class,
+                    "last_modified": last_modified,
+                    "action_type": "delete-s3-object",
                 },
             )
         )
 
+    findings.extend(reclaimable_findings(reclaimable_scans, config, top_n))
+    if duplicates is not None:
+        # Inventory rows were indexed when the reports were loaded; listed objects were added above.
+        usage.duplicates = find_duplicates(duplicates, top_n)
+        findings.extend(duplicate_findings(usage.duplicates, bucket_regions, config))
     return findings
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from aws_storage_optimizer.analyzers.s3_stats import BucketStats
+
+CHECKPOINT_VERSION = 2
+CHECKPOINT_INTERVAL_SECONDS = 15.0
+DEFAULT_CHECKPOINT_PATH = "artifacts/s3-scan-checkpoint.json"
+
+
+@dataclass
+class ShardProgress:
+    continuation_token: str | None = None
+    complete: bool = False
+    pages: int = 0
+    stats: BucketStats = field(default_factory=BucketStats)
+    common_prefixes: list[str] = field(default_factory=list)
+    largest_objects: list[dict[str, Any]] = field(default_factory=list)
+    # Last key or common prefix a delimiter listing returned.
+    last_key: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "continuation_token": self.continuation_token,
+            "complete": self.complete,
+            "pages": self.pages,
+            "stats": self.stats.to_dict(),
+            "common_prefixes": list(self.common_prefixes),
+            "largest_objects": list(self.largest_objects),
+            "last_key": self.last_key,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "ShardProgress":
+        return cls(
+            continuation_token=payload.get("continuation_token"),
+            complete=bool(payload.get("complete", False)),
+            pages=int(payload.get("pages", 0)),
+            stats=BucketStats.from_dict(payload.get("stats", {})),
+            common_prefixes=[str(prefix) for prefix in payload.get("common_prefixes", [])],
+            largest_objects=list(payload.get("largest_objects", [])),
+            last_key=str(payload.get("last_key", "")),
+        )
+
+
+class ScanCheckpoint:
+    # Listing progress per bucket and per shard (prefix; "" is the top-level
+    # delimiter listing). Workers record progress after every page, but a
+    # shard's state (histograms, prefix trie) is only serialized when it
+    # finishes or once per interval, and the state file is rewritten at most
+    # once per interval outside the lock. The final save(), after workers have
+    # stopped, serializes every shard's latest progress.
+    def __init__(
+        self,
+        path: str | Path,
+        stale_days: int,
+        shards: dict[str, dict[str, dict[str, Any]]] | None = None,
+        interval_seconds: float = CHECKPOINT_INTERVAL_SECONDS,
+    ):
+        self.path = Path(path)
+        self.stale_days = stale_days
+        self.interval_seconds = interval_seconds
+        self._shards = shards or {}
+        # (bucket, prefix) -> (live progress, time its snapshot was last taken)
+        self._live: dict[tuple[str, str], tuple[ShardProgress, float]] = {}
+        self._lock = threading.Lock()
+        self._last_saved = time.monotonic()
+
+    @classmethod
+    def load(cls, path: str | Path, stale_days: int, interval_seconds: float = CHECKPOINT_INTERVAL_SECONDS):
+        checkpoint_path = Path(path)
+        if not checkpoint_path.is_file():
+            return cls(checkpoint_path, stale_days, interval_seconds=interval_seconds)
+        payload = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        if payload.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported S3 scan checkpoint version in {checkpoint_path}")
+        if payload.get("stale_days") != stale_days:
+            # Partial stale totals were counted against a different cutoff.
+            raise ValueError(
+                f"S3 scan checkpoint {checkpoint_path} was written with s3_stale_days="
+                f"{payload.get('stale_days')}, not {stale_days}"
+            )
+        return cls(checkpoint_path, stale_days, payload.get("buckets", {}), interval_seconds)
+
+    def shard(self, bucket_name: str, prefix: str) -> ShardProgress:
+        with self._lock:
+            saved = self._shards.get(bucket_name, {}).get(prefix)
+        return ShardProgress.from_dict(saved) if saved is not None else ShardProgress()
+
+    def record(self, bucket_name: str, prefix: str, progress: ShardProgress) -> None:
+        now = time.monotonic()
+        key = (bucket_name, prefix)
+        with self._lock:
+            _, snapshot_time = self._live.get(key, (progress, float("-inf")))
+            self._live[key] = (progress, snapshot_time)
+        if not progress.complete and now - snapshot_time < self.interval_seconds:
+            return
+        # Only the calling worker mutates this shard, so it is serialized outside the lock.
+        snapshot = progress.to_dict()
+        with self._lock:
+            self._shards.setdefault(bucket_name, {})[prefix] = snapshot
+            self._live[key] = (progress, now)
+            if now - self._last_saved < self.interval_seconds:
+                return
+            self._last_saved = now
+            payload = self._payload()
+        self._write(payload)
+
+    def save(self) -> None:
+        with self._lock:
+            for (bucket_name, prefix), (progress, _) in self._live.items():
+                self._shards.setdefault(bucket_name, {})[prefix] = progress.to_dict()
+            self._last_saved = time.monotonic()
+            payload = self._payload()
+        self._write(payload)
+
+    def _payload(self) -> dict[str, Any]:
+        # Snapshots are replaced, never mutated, so shallow copies are enough to write outside the lock.
+        buckets = {bucket_name: dict(shards) for bucket_name, shards in self._shards.items()}
+        return {"version": CHECKPOINT_VERSION, "stale_days": self.stale_days, "buckets": buckets}
+
+    def _write(self, payload: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so an interrupted write never leaves a truncated state file.
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        temporary.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temporary, self.path)
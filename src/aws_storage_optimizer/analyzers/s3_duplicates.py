@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import bisect
+import csv
+from collections import Counter
+from dataclasses import dataclass, field
+import heapq
+import os
+from pathlib import Path
+import threading
+import zlib
+
+from aws_storage_optimizer.config import AppConfig
+from aws_storage_optimizer.estimation import s3_storage_class_rate
+from aws_storage_optimizer.models import Finding
+
+DEFAULT_DUPLICATE_PARTITIONS = 256
+# Rows buffered in memory by one writer before they are appended to the
+# partition files.
+SPILL_BUFFER_ROWS = 50_000
+# Copy locations kept per duplicate group for the report; counts stay exact.
+MAX_GROUP_LOCATIONS = 20
+# Serializes appends from the writers of one process to its partition files.
+_SPILL_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DuplicateIndex:
+    # An on-disk index of (ETag, Size) -> object location rows, hash partitioned
+    # on (ETag, Size) so every copy of an object lands in the same partition.
+    # Each process appends to one file per partition, so listing threads share
+    # files under a lock and inventory worker processes never contend; the file
+    # count stays at partitions x processes however many shards are listed.
+    # Memory stays bounded by the writer buffers while indexing and by one
+    # partition while grouping. Multipart ETags depend on the part size, so
+    # copies uploaded with different part sizes are missed, never mismatched.
+    directory: Path
+    partitions: int = DEFAULT_DUPLICATE_PARTITIONS
+
+    def writer(self) -> "DuplicateWriter":
+        return DuplicateWriter(self)
+
+    def partition_files(self) -> dict[int, list[Path]]:
+        # One directory listing for all partitions.
+        files: dict[int, list[Path]] = {}
+        for path in sorted(self.directory.glob("*-*.csv")):
+            files.setdefault(int(path.name.split("-", 1)[0]), []).append(path)
+        return files
+
+
+class DuplicateWriter:
+    def __init__(self, index: DuplicateIndex):
+        self.index = index
+        self._buffers: dict[int, list[tuple[str, int, str, str, str]]] = {}
+        self._buffered = 0
+
+    def add(self, etag: str, size: int, bucket_name: str, key: str, storage_class: str) -> None:
+        etag = etag.strip('"')
+        # Empty objects all share one ETag; grouping them reclaims nothing.
+        if size <= 0 or not etag:
+            return
+        partition = zlib.crc32(f"{etag}:{size}".encode("utf-8")) % self.index.partitions
+        self._buffers.setdefault(partition, []).append((etag, size, bucket_name, key, storage_class))
+        self._buffered += 1
+        if self._buffered >= SPILL_BUFFER_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffers:
+            return
+        self.index.directory.mkdir(parents=True, exist_ok=True)
+        with _SPILL_LOCK:
+            for partition, rows in self._buffers.items():
+                path = self.index.directory / f"{partition:05d}-{os.getpid()}.csv"
+                with path.open("a", encoding="utf-8", newline="") as spill_file:
+                    csv.writer(spill_file).writerows(rows)
+        self._buffers = {}
+        self._buffered = 0
+
+    def __enter__(self) -> "DuplicateWriter":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.flush()
+
+
+@dataclass
+class DuplicateGroup:
+    etag: str
+    size_bytes: int
+    copy_count: int = 0
+    # Up to MAX_GROUP_LOCATIONS (bucket, key, storage class) entries in bucket/key order.
+    locations: list[tuple[str, str, str]] = field(default_factory=list)
+    class_counts: dict[str, int] = field(default_factory=dict)
+    buckets: set[str] = field(default_factory=set)
+
+    @property
+    def reclaimable_bytes(self) -> int:
+        return self.size_bytes * (self.copy_count - 1)
+
+    def add(self, bucket_name: str, key: str, storage_class: str) -> None:
+        self.copy_count += 1
+        self.class_counts[storage_class] = self.class_counts.get(storage_class, 0) + 1
+        self.buckets.add(bucket_name)
+        bisect.insort(self.locations, (bucket_name, key, storage_class))
+        del self.locations[MAX_GROUP_LOCATIONS:]
+
+
+@dataclass
+class DuplicateReport:
+    groups: list[DuplicateGroup]
+    group_count: int = 0
+    duplicate_objects: int = 0
+    reclaimable_bytes: int = 0
+
+
+def _read_rows(paths: list[Path]):
+    for path in paths:
+        with path.open(encoding="utf-8", newline="") as spill_file:
+            for etag, size, bucket_name, key, storage_class in csv.reader(spill_file):
+                yield etag, int(size), bucket_name, key, storage_class
+
+
+def find_duplicates(index: DuplicateIndex, limit: int) -> DuplicateReport:
+    # Two passes per partition: count (ETag, Size) pairs, then collect locations
+    # only for pairs seen more than once. The largest groups by reclaimable
+    # bytes are kept in a bounded heap across partitions.
+    report = DuplicateReport(groups=[])
+    heap: list[tuple[int, str, int, DuplicateGroup]] = []
+    for _, paths in sorted(index.partition_files().items()):
+        counts = Counter((etag, size) for etag, size, _, _, _ in _read_rows(paths))
+        groups: dict[tuple[str, int], DuplicateGroup] = {}
+        for etag, size, bucket_name, key, storage_class in _read_rows(paths):
+            if counts[(etag, size)] > 1:
+                groups.setdefault((etag, size), DuplicateGroup(etag, size)).add(bucket_name, key, storage_class)
+        for group in groups.values():
+            report.group_count += 1
+            report.duplicate_objects += group.copy_count - 1
+            report.reclaimable_bytes += group.reclaimable_bytes
+            entry = (group.reclaimable_bytes, group.etag, group.size_bytes, group)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif heap and entry[:3] > heap[0][:3]:
+                heapq.heapreplace(heap, entry)
+    report.groups = [entry[3] for entry in sorted(heap, key=lambda entry: (-entry[0], entry[1], entry[2]))]
+    return report
+
+
+def _copies_monthly_cost(size_bytes: int, storage_class: str, copies: int, config: AppConfig) -> float:
+    rate = s3_storage_class_rate(storage_class, config)
+    if rate is None:
+        rate = config.rates.s3_standard_per_gib_month_usd
+    return size_bytes / (1024**3) * rate * copies
+
+
+def duplicate_findings(
+    report: DuplicateReport,
+    bucket_regions: dict[str, str | None],
+    config: AppConfig,
+) -> list[Finding]:
+    findings: list[Finding] = []
+    for group in report.groups:
+        # The first copy in bucket/key order is kept; every other copy is reclaimable.
+        kept_bucket, kept_key, kept_class = group.locations[0]
+        savings = sum(
+            _copies_monthly_cost(group.size_bytes, storage_class, copies, config)
+            for storage_class, copies in group.class_counts.items()
+        ) - _copies_monthly_cost(group.size_bytes, kept_class, 1, config)
+        findings.append(
+            Finding(
+                service="s3",
+                # Not "bucket/key": execute would read that as the object to delete,
+                # which here is the copy to keep.
+                resource_id=f"{group.etag}:{group.size_bytes}",
+                region=bucket_regions.get(kept_bucket),
+                recommendation="Identical copies of this object exist; keep one copy and delete the others",
+                estimated_monthly_savings_usd=round(savings, 2),
+                risk_level="high",
+                details={
+                    "finding_type": "duplicate-objects",
+                    "etag": group.etag,
+                    "size_bytes": group.size_bytes,
+                    "copy_count": group.copy_count,
+                    "reclaimable_gib": round(group.reclaimable_bytes / (1024**3), 2),
+                    "kept_copy": f"{kept_bucket}/{kept_key}",
+                    "duplicate_copies": [f"{bucket}/{key}" for bucket, key, _ in group.locations[1:]],
+                    "buckets": sorted(group.buckets),
+                },
+            )
+        )
+    return findings
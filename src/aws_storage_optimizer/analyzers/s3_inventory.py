@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import unquote
+
+from aws_storage_optimizer.analyzers.s3_duplicates import DuplicateIndex
+from aws_storage_optimizer.analyzers.s3_prefix_trie import PrefixTrie
+from aws_storage_optimizer.analyzers.s3_stats import AgeCutoffs, BucketStats
+from aws_storage_optimizer.config import AppConfig, LifecycleSettings
+
+REQUIRED_INVENTORY_FIELDS = ("Key", "Size")
+# Inventory timestamps look like 2026-01-31T12:00:00.000Z; comparing the first
+# 19 characters as strings orders them without parsing every row.
+INVENTORY_TIMESTAMP_PREFIX = 19
+
+
+@dataclass
+class InventoryManifest:
+    source_bucket: str
+    columns: list[str]
+    data_files: list[Path]
+
+
+def _resolve_data_file(root: Path, key: str) -> Path:
+    name = Path(key).name
+    for candidate in (root / key, root / "data" / name, root / name):
+        if candidate.is_file():
+            return candidate
+    raise ValueError(f"Inventory data file {key!r} not found under {root}")
+
+
+def read_inventory_manifest(path: str | Path) -> InventoryManifest:
+    manifest_path = Path(path)
+    if manifest_path.is_dir():
+        manifest_path = manifest_path / "manifest.json"
+    payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    file_format = str(payload.get("fileFormat", "CSV"))
+    if file_format.upper() != "CSV":
+        raise ValueError(f"Unsupported S3 Inventory format {file_format!r} in {manifest_path}; only CSV is supported")
+
+    columns = [column.strip() for column in str(payload.get("fileSchema", "")).split(",")]
+    missing = [name for name in REQUIRED_INVENTORY_FIELDS if name not in columns]
+    if missing:
+        raise ValueError(f"S3 Inventory schema in {manifest_path} is missing fields: {', '.join(missing)}")
+
+    data_files = [
+        _resolve_data_file(manifest_path.parent, str(entry.get("key", ""))) for entry in payload.get("files", [])
+    ]
+    return InventoryManifest(
+        source_bucket=str(payload.get("sourceBucket", "")),
+        columns=columns,
+        data_files=data_files,
+    )
+
+
+def read_inventory_rows(path: Path, columns: list[str]) -> Iterator[list[str]]:
+    # Rows for object versions with a size; delete markers hold no data.
+    size_index = columns.index("Size")
+    delete_marker_index = columns.index("IsDeleteMarker") if "IsDeleteMarker" in columns else None
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as data_file:
+        for row in csv.reader(data_file):
+            if len(row) <= size_index or not row[size_index]:
+                continue
+            if delete_marker_index is not None and row[delete_marker_index] == "true":
+                continue
+            yield row
+
+
+def aggregate_inventory_file(
+    path: Path,
+    columns: list[str],
+    cutoffs: AgeCutoffs,
+    lifecycle: LifecycleSettings | None = None,
+    duplicates: DuplicateIndex | None = None,
+    bucket_name: str = "",
+) -> BucketStats:
+    key_index = columns.index("Key")
+    size_index = columns.index("Size")
+    modified_index = columns.index("LastModifiedDate") if "LastModifiedDate" in columns else None
+    class_index = columns.index("StorageClass") if "StorageClass" in columns else None
+    etag_index = columns.index("ETag") if "ETag" in columns else None
+
+    stats = BucketStats()
+    if lifecycle is not None and lifecycle.prefix_depth > 0:
+        stats.prefixes = PrefixTrie(lifecycle.prefix_depth, lifecycle.max_prefix_nodes)
+    # Reports without an ETag column cannot be matched for duplicates.
+    writer = duplicates.writer() if duplicates is not None and etag_index is not None else None
+    for row in read_inventory_rows(path, columns):
+        modified = row[modified_index][:INVENTORY_TIMESTAMP_PREFIX] if modified_index is not None else ""
+        is_stale, age_index = cutoffs.classify(modified)
+        storage_class = row[class_index] if class_index is not None and row[class_index] else "STANDARD"
+        # Inventory keys are URL-encoded; only the prefix trie and duplicate index need them decoded.
+        key = unquote(row[key_index]) if stats.prefixes is not None or writer is not None else None
+        size = int(row[size_index])
+        stats.add(size, storage_class, is_stale, age_index, key)
+        if writer is not None:
+            writer.add(row[etag_index], size, bucket_name, key, storage_class)
+    if writer is not None:
+        writer.flush()
+    return stats
+
+
+def load_s3_inventory(
+    paths: list[str] | tuple[str, ...],
+    config: AppConfig,
+    max_workers: int | None = None,
+    duplicates: DuplicateIndex | None = None,
+) -> dict[str, BucketStats]:
+    cutoffs = AgeCutoffs.since(datetime.now(timezone.utc), config.thresholds.s3_stale_days, "%Y-%m-%dT%H:%M:%S")
+    jobs: list[tuple[str, Path, list[str]]] = []
+    for path in paths:
+        manifest = read_inventory_manifest(path)
+        jobs.extend((manifest.source_bucket, data_file, manifest.columns) for data_file in manifest.data_files)
+
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    files = [data_file for _, data_file, _ in jobs]
+    schemas = [columns for _, _, columns in jobs]
+    job_cutoffs = [cutoffs] * len(jobs)
+    job_lifecycle = [config.lifecycle] * len(jobs)
+    job_duplicates = [duplicates] * len(jobs)
+    job_buckets = [bucket_name for bucket_name, _, _ in jobs]
+    job_args = (files, schemas, job_cutoffs, job_lifecycle, job_duplicates, job_buckets)
+    if workers <= 1:
+        results = list(map(aggregate_inventory_file, *job_args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(aggregate_inventory_file, *job_args))
+
+    inventory: dict[str, BucketStats] = {}
+    for (bucket_name, _, _), file_stats in zip(jobs, results):
+        inventory.setdefault(bucket_name, BucketStats()).merge(file_stats)
+    return inventory
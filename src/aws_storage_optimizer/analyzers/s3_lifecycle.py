@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+import os
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote
+
+from aws_storage_optimizer.analyzers.s3_inventory import read_inventory_manifest, read_inventory_rows
+from aws_storage_optimizer.config import AppConfig
+from aws_storage_optimizer.estimation import S3_TRANSITION_PER_1000_REQUESTS_USD, s3_storage_class_rate
+
+LIST_PAGE_SIZE = 1000
+# Lifecycle rules only move objects down this waterfall; classes missing from
+# it (Express One Zone, Outposts, ...) are never transitioned.
+STORAGE_CLASS_WATERFALL = {
+    "STANDARD": 0,
+    "REDUCED_REDUNDANCY": 0,
+    "STANDARD_IA": 1,
+    "INTELLIGENT_TIERING": 2,
+    "ONEZONE_IA": 3,
+    "GLACIER_IR": 4,
+    "GLACIER": 5,
+    "DEEP_ARCHIVE": 6,
+}
+# S3 does not transition objects smaller than this unless a rule sets
+# ObjectSizeGreaterThan explicitly.
+MIN_TRANSITION_BYTES = 128 * 1024
+
+
+@dataclass(frozen=True)
+class LifecycleRule:
+    rule_id: str
+    prefix: str = ""
+    size_greater_than: int | None = None
+    size_less_than: int | None = None
+    # (days, storage class) pairs, earliest first.
+    transitions: tuple[tuple[int, str], ...] = ()
+    expiration_days: int | None = None
+
+    def matches(self, key: str, size: int) -> bool:
+        if not key.startswith(self.prefix):
+            return False
+        if self.size_greater_than is not None and size <= self.size_greater_than:
+            return False
+        return self.size_less_than is None or size < self.size_less_than
+
+
+def _rule_filter(rule: dict[str, Any]) -> dict[str, Any]:
+    if "Filter" not in rule:
+        return {"Prefix": rule.get("Prefix", "")}
+    rule_filter = rule["Filter"] or {}
+    if "And" in rule_filter:
+        return dict(rule_filter["And"])
+    if "Tag" in rule_filter:
+        return {"Tags": [rule_filter["Tag"]]}
+    return dict(rule_filter)
+
+
+def parse_lifecycle_rules(payload: dict[str, Any]) -> tuple[list[LifecycleRule], list[str]]:
+    # Accepts the GetBucketLifecycleConfiguration shape ({"Rules": [...]}).
+    # Only current object versions are simulated; parts of a rule that cannot
+    # be evaluated from an object listing are skipped with a warning.
+    if not isinstance(payload.get("Rules"), list):
+        raise ValueError("Lifecycle configuration must contain a 'Rules' list")
+    rules: list[LifecycleRule] = []
+    warnings: list[str] = []
+    for index, rule in enumerate(payload["Rules"]):
+        rule_id = str(rule.get("ID") or f"rule-{index + 1}")
+        if rule.get("Status", "Enabled") != "Enabled":
+            continue
+        rule_filter = _rule_filter(rule)
+        if rule_filter.get("Tags"):
+            warnings.append(f"{rule_id}: tag filters cannot be evaluated from object listings; rule skipped")
+            continue
+        transitions = []
+        for transition in rule.get("Transitions", []):
+            if "Days" not in transition:
+                warnings.append(f"{rule_id}: date-based transitions are not simulated")
+                continue
+            storage_class = str(transition["StorageClass"])
+            if storage_class not in STORAGE_CLASS_WATERFALL:
+                raise ValueError(f"{rule_id}: unsupported transition storage class {storage_class!r}")
+            transitions.append((int(transition["Days"]), storage_class))
+        expiration = rule.get("Expiration") or {}
+        if "Date" in expiration:
+            warnings.append(f"{rule_id}: date-based expiration is not simulated")
+        size_greater_than = rule_filter.get("ObjectSizeGreaterThan")
+        size_less_than = rule_filter.get("ObjectSizeLessThan")
+        rules.append(
+            LifecycleRule(
+                rule_id=rule_id,
+                prefix=str(rule_filter.get("Prefix", "")),
+                size_greater_than=int(size_greater_than) if size_greater_than is not None else None,
+                size_less_than=int(size_less_than) if size_less_than is not None else None,
+                transitions=tuple(sorted(transitions)),
+                expiration_days=int(expiration["Days"]) if "Days" in expiration else None,
+            )
+        )
+    return rules, warnings
+
+
+@dataclass
+class ClassTotals:
+    object_count: int = 0
+    size_bytes: int = 0
+    monthly_cost_usd: float = 0.0
+
+    def add(self, count: int, size_bytes: int, storage_class: str, config: AppConfig) -> None:
+        rate = s3_storage_class_rate(storage_class, config)
+        if rate is None:
+            rate = config.rates.s3_standard_per_gib_month_usd
+        self.object_count += count
+        self.size_bytes += size_bytes
+        self.monthly_cost_usd += size_bytes / (1024**3) * rate
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "object_count": self.object_count,
+            "size_gib": round(self.size_bytes / (1024**3), 2),
+            "monthly_cost_usd": round(self.monthly_cost_usd, 2),
+        }
+
+
+@dataclass
+class LifecycleSimulation:
+    current: dict[str, ClassTotals] = field(default_factory=dict)
+    projected: dict[str, ClassTotals] = field(default_factory=dict)
+    expired: ClassTotals = field(default_factory=ClassTotals)
+    transition_requests: dict[str, int] = field(default_factory=dict)
+    transition_cost_usd: float = 0.0
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def monthly_savings_usd(self) -> float:
+        return sum(totals.monthly_cost_usd for totals in self.current.values()) - sum(
+            totals.monthly_cost_usd for totals in self.projected.values()
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        savings = self.monthly_savings_usd
+        return {
+            "current": {name: totals.to_dict() for name, totals in sorted(self.current.items())},
+            "projected": {name: totals.to_dict() for name, totals in sorted(self.projected.items())},
+            "expired": self.expired.to_dict(),
+            "transition_requests": dict(sorted(self.transition_requests.items())),
+            "transition_cost_usd": round(self.transition_cost_usd, 2),
+            "monthly_savings_usd": round(savings, 2),
+            "payback_months": round(self.transition_cost_usd / savings, 1) if savings > 0 else None,
+            "warnings": self.warnings,
+        }
+
+
+class LifecycleSimulator:
+    # Objects are not evaluated one by one. Each object is reduced to a cell
+    # (matching rules as a bitmask, storage class, last-modified date, below
+    # the minimum transition size) and only byte and object counts are kept
+    # per cell. Rules are then evaluated once per distinct cell, so the work
+    # per object is a prefix check per rule and one dict update.
+    def __init__(self, rules: list[LifecycleRule]):
+        self.rules = rules
+        self.cells: dict[tuple[int, str, str, bool], list[int]] = {}
+
+    def add(self, key: str, size: int, storage_class: str, modified_date: str) -> None:
+        mask = 0
+        for bit, rule in enumerate(self.rules):
+            if rule.matches(key, size):
+                mask |= 1 << bit
+        cell_key = (mask, storage_class, modified_date, size < MIN_TRANSITION_BYTES)
+        cell = self.cells.get(cell_key)
+        if cell is None:
+            self.cells[cell_key] = [1, size]
+        else:
+            cell[0] += 1
+            cell[1] += size
+
+    def merge(self, other: "LifecycleSimulator") -> None:
+        for cell_key, (count, size) in other.cells.items():
+            cell = self.cells.setdefault(cell_key, [0, 0])
+            cell[0] += count
+            cell[1] += size
+
+    def _target(self, mask: int, storage_class: str, age_days: int, small: bool) -> str | None:
+        # Returns "" when the object expires, the class it ends up in when a
+        # transition applies, or None when it stays where it is. Expiration
+        # wins over transitions, and the deepest eligible class wins among
+        # transitions, as in S3.
+        rules = [rule for bit, rule in enumerate(self.rules) if mask >> bit & 1]
+        if any(rule.expiration_days is not None and age_days >= rule.expiration_days for rule in rules):
+            return ""
+        current_rank = STORAGE_CLASS_WATERFALL.get(storage_class)
+        if current_rank is None:
+            return None
+        target = None
+        for rule in rules:
+            if small and rule.size_greater_than is None:
+                continue
+            for days, target_class in rule.transitions:
+                if days <= age_days and STORAGE_CLASS_WATERFALL[target_class] > current_rank:
+                    if target is None or STORAGE_CLASS_WATERFALL[target_class] > STORAGE_CLASS_WATERFALL[target]:
+                        target = target_class
+        return target
+
+    def evaluate(self, today: date, config: AppConfig, warnings: list[str] | None = None) -> LifecycleSimulation:
+        # Rules are applied as if newly added today: each object moves straight
+        # to the class it would have reached by its current age, costing one
+        # transition request.
+        simulation = LifecycleSimulation(warnings=list(warnings or []))
+        ages: dict[str, int] = {}
+        for (mask, storage_class, modified_date, small), (count, size) in self.cells.items():
+            if modified_date not in ages:
+                # Unknown dates count as new objects.
+                ages[modified_date] = (today - date.fromisoformat(modified_date)).days if modified_date else 0
+            simulation.current.setdefault(storage_class, ClassTotals()).add(count, size, storage_class, config)
+            target = self._target(mask, storage_class, ages[modified_date], small)
+            if target == "":
+                simulation.expired.add(count, size, storage_class, config)
+                continue
+            if target is None:
+                simulation.projected.setdefault(storage_class, ClassTotals()).add(count, size, storage_class, config)
+                continue
+            simulation.projected.setdefault(target, ClassTotals()).add(count, size, target, config)
+            simulation.transition_requests[target] = simulation.transition_requests.get(target, 0) + count
+            simulation.transition_cost_usd += count / 1000 * S3_TRANSITION_PER_1000_REQUESTS_USD.get(target, 0.0)
+        return simulation
+
+
+def simulate_inventory_file(path: Path, columns: list[str], rules: list[LifecycleRule]) -> LifecycleSimulator:
+    key_index = columns.index("Key")
+    size_index = columns.index("Size")
+    modified_index = columns.index("LastModifiedDate") if "LastModifiedDate" in columns else None
+    class_index = columns.index("StorageClass") if "StorageClass" in columns else None
+    latest_index = columns.index("IsLatest") if "IsLatest" in columns else None
+
+    simulator = LifecycleSimulator(rules)
+    for row in read_inventory_rows(path, columns):
+        if latest_index is not None and row[latest_index] == "false":
+            continue
+        storage_class = row[class_index] if class_index is not None and row[class_index] else "STANDARD"
+        modified_date = row[modified_index][:10] if modified_index is not None else ""
+        simulator.add(unquote(row[key_index]), int(row[size_index]), storage_class, modified_date)
+    return simulator
+
+
+def simulate_inventory(
+    paths: list[str] | tuple[str, ...],
+    simulator: LifecycleSimulator,
+    max_workers: int | None = None,
+) -> None:
+    jobs = [
+        (data_file, manifest.columns)
+        for manifest in (read_inventory_manifest(path) for path in paths)
+        for data_file in manifest.data_files
+    ]
+    files = [data_file for data_file, _ in jobs]
+    schemas = [columns for _, columns in jobs]
+    job_rules = [simulator.rules] * len(jobs)
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        results = list(map(simulate_inventory_file, files, schemas, job_rules))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_inventory_file, files, schemas, job_rules))
+    for result in results:
+        simulator.merge(result)
+
+
+def simulate_bucket_listing(s3_client, bucket_name: str, simulator: LifecycleSimulator) -> None:
+    continuation_token = None
+    while True:
+        kwargs = {"Bucket": bucket_name, "MaxKeys": LIST_PAGE_SIZE}
+        if continuation_token:
+            kwargs["ContinuationToken"] = continuation_token
+        page = s3_client.list_objects_v2(**kwargs)
+        for obj in page.get("Contents", []):
+            last_modified = obj.get("LastModified")
+            modified_date = last_modified.date().isoformat() if isinstance(last_modified, datetime) else ""
+            simulator.add(
+                str(obj.get("Key", "")),
+                int(obj.get("Size", 0)),
+                str(obj.get("StorageClass") or "STANDARD"),
+                modified_date,
+            )
+        continuation_token = page.get("NextContinuationToken")
+        if not continuation_token:
+            return
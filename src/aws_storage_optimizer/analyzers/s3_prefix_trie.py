@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any
+
+# Stale objects in these classes are what a lifecycle transition to
+# Standard-IA would move; colder classes are already past that point.
+TRANSITION_SOURCE_CLASSES = frozenset({"STANDARD", "REDUCED_REDUNDANCY"})
+
+
+class _Node:
+    __slots__ = ("parent", "segment", "children", "size_bytes", "object_count", "stale_bytes")
+
+    def __init__(self, parent: "_Node | None" = None, segment: str = ""):
+        self.parent = parent
+        self.segment = segment
+        self.children: dict[str, _Node] = {}
+        self.size_bytes = 0
+        self.object_count = 0
+        self.stale_bytes = 0
+
+    def prefix(self) -> str:
+        segments = []
+        node: _Node | None = self
+        while node is not None and node.parent is not None:
+            segments.append(node.segment)
+            node = node.parent
+        return "".join(f"{segment}/" for segment in reversed(segments))
+
+
+class PrefixTrie:
+    # Totals per "/"-delimited prefix, down to max_depth levels. Every node holds
+    # its whole subtree's totals, so dropping a node loses detail but never
+    # bytes. Past max_nodes, the smallest leaves are pruned until a quarter of
+    # the room is free again, which bounds memory on any number of objects.
+    def __init__(self, max_depth: int, max_nodes: int):
+        self.max_depth = max_depth
+        self.max_nodes = max(max_nodes, 1)
+        self.root = _Node()
+        self.node_count = 0
+
+    def add(self, key: str, size: int, stale_bytes: int) -> None:
+        node = self.root
+        self._count(node, size, stale_bytes)
+        segments = key.split("/", self.max_depth)
+        # The last element is the object name (or the remainder past max_depth).
+        for segment in segments[:-1]:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _Node(node, segment)
+                self.node_count += 1
+            node = child
+            self._count(node, size, stale_bytes)
+        if self.node_count > self.max_nodes:
+            self._prune()
+
+    @staticmethod
+    def _count(node: _Node, size: int, stale_bytes: int) -> None:
+        node.size_bytes += size
+        node.object_count += 1
+        node.stale_bytes += stale_bytes
+
+    def merge(self, other: "PrefixTrie") -> None:
+        pending = [(self.root, other.root)]
+        while pending:
+            target, source = pending.pop()
+            target.size_bytes += source.size_bytes
+            target.object_count += source.object_count
+            target.stale_bytes += source.stale_bytes
+            for segment, source_child in source.children.items():
+                target_child = target.children.get(segment)
+                if target_child is None:
+                    target_child = target.children[segment] = _Node(target, segment)
+                    self.node_count += 1
+                pending.append((target_child, source_child))
+        if self.node_count > self.max_nodes:
+            self._prune()
+
+    def _nodes(self) -> list[tuple[_Node, int]]:
+        nodes = []
+        pending = [(self.root, 0)]
+        while pending:
+            node, depth = pending.pop()
+            nodes.append((node, depth))
+            pending.extend((child, depth + 1) for child in node.children.values())
+        return nodes
+
+    def _prune(self) -> None:
+        target = self.max_nodes * 3 // 4
+        # Equal sizes break on the prefix, so the same objects always keep the
+        # same prefixes whatever order they were added or merged in.
+        leaves = [
+            (node.size_bytes, node.prefix(), node) for node, _ in self._nodes() if not node.children and node.parent
+        ]
+        heapq.heapify(leaves)
+        while self.node_count > target and leaves:
+            _, _, node = heapq.heappop(leaves)
+            parent = node.parent
+            del parent.children[node.segment]
+            self.node_count -= 1
+            if not parent.children and parent.parent is not None:
+                heapq.heappush(leaves, (parent.size_bytes, parent.prefix(), parent))
+
+    def lifecycle_candidates(self, min_stale_fraction: float, limit: int) -> list[dict[str, Any]]:
+        # Greedy pick of the prefixes with the most transitionable stale bytes,
+        # skipping any prefix nested in (or containing) one already picked.
+        candidates = [
+            node
+            for node, depth in self._nodes()
+            if depth > 0 and node.stale_bytes > 0 and node.stale_bytes >= node.size_bytes * min_stale_fraction
+        ]
+        candidates.sort(key=lambda node: (-node.stale_bytes, node.prefix()))
+        picked: list[str] = []
+        for node in candidates:
+            if len(picked) >= limit:
+                break
+            prefix = node.prefix()
+            if any(prefix.startswith(other) or other.startswith(prefix) for other in picked):
+                continue
+            picked.append(prefix)
+        by_prefix = {node.prefix(): node for node in candidates}
+        return [
+            {
+                "prefix": prefix,
+                "size_bytes": by_prefix[prefix].size_bytes,
+                "object_count": by_prefix[prefix].object_count,
+                "stale_bytes": by_prefix[prefix].stale_bytes,
+            }
+            for prefix in picked
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        def encode(node: _Node) -> dict[str, Any]:
+            return {
+                "s": node.size_bytes,
+                "c": node.object_count,
+                "t": node.stale_bytes,
+                "k": {segment: encode(child) for segment, child in node.children.items()},
+            }
+
+        return {"max_depth": self.max_depth, "max_nodes": self.max_nodes, "root": encode(self.root)}
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "PrefixTrie":
+        trie = cls(int(payload["max_depth"]), int(payload["max_nodes"]))
+        pending = [(trie.root, payload["root"])]
+        while pending:
+            node, encoded = pending.pop()
+            node.size_bytes = int(encoded.get("s", 0))
+            node.object_count = int(encoded.get("c", 0))
+            node.stale_bytes = int(encoded.get("t", 0))
+            for segment, child_payload in encoded.get("k", {}).items():
+                child = node.children[segment] = _Node(node, segment)
+                trie.node_count += 1
+                pending.append((child, child_payload))
+        return trie
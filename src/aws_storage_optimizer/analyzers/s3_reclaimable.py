@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from aws_storage_optimizer.config import AppConfig
+from aws_storage_optimizer.estimation import s3_storage_class_rate
+from aws_storage_optimizer.models import Finding
+
+RECLAIMABLE_PAGE_SIZE = 1000
+
+
+@dataclass
+class ReclaimableBytes:
+    count: int = 0
+    size_bytes: int = 0
+    monthly_cost_usd: float = 0.0
+
+    def add(self, size: int, storage_class: str, config: AppConfig) -> None:
+        self.count += 1
+        self.size_bytes += size
+        rate = s3_storage_class_rate(storage_class, config)
+        if rate is None:
+            rate = config.rates.s3_standard_per_gib_month_usd
+        self.monthly_cost_usd += size / (1024**3) * rate
+
+
+@dataclass
+class ReclaimableStorage:
+    uploads: ReclaimableBytes = field(default_factory=ReclaimableBytes)
+    noncurrent_versions: ReclaimableBytes = field(default_factory=ReclaimableBytes)
+    delete_markers: int = 0
+    complete: bool = True
+
+
+class _RequestBudget:
+    def __init__(self, requests: int):
+        self.remaining = requests
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+def _upload_part_bytes(s3_client, bucket_name: str, upload: dict, budget: _RequestBudget) -> int | None:
+    size = 0
+    part_marker = None
+    while budget.take():
+        kwargs = {
+            "Bucket": bucket_name,
+            "Key": upload["Key"],
+            "UploadId": upload["UploadId"],
+            "MaxParts": RECLAIMABLE_PAGE_SIZE,
+        }
+        if part_marker is not None:
+            kwargs["PartNumberMarker"] = part_marker
+        page = s3_client.list_parts(**kwargs)
+        size += sum(int(part.get("Size", 0)) for part in page.get("Parts", []))
+        if not page.get("IsTruncated"):
+            return size
+        part_marker = page.get("NextPartNumberMarker")
+    return None
+
+
+def _scan_multipart_uploads(
+    s3_client,
+    bucket_name: str,
+    started_before: datetime,
+    budget: _RequestBudget,
+    config: AppConfig,
+    result: ReclaimableStorage,
+) -> None:
+    # Upload listings carry no sizes, so each abandoned upload costs a ListParts
+    # stream of its own; only the running totals are kept.
+    markers: dict[str, str] = {}
+    while budget.take():
+        page = s3_client.list_multipart_uploads(Bucket=bucket_name, MaxUploads=RECLAIMABLE_PAGE_SIZE, **markers)
+        for upload in page.get("Uploads", []):
+            initiated = upload.get("Initiated")
+            if not isinstance(initiated, datetime) or initiated >= started_before:
+                continue
+            size = _upload_part_bytes(s3_client, bucket_name, upload, budget)
+            if size is None:
+                result.complete = False
+                return
+            result.uploads.add(size, str(upload.get("StorageClass") or "STANDARD"), config)
+        if not page.get("IsTruncated"):
+            return
+        markers = {"KeyMarker": page.get("NextKeyMarker", ""), "UploadIdMarker": page.get("NextUploadIdMarker", "")}
+    result.complete = False
+
+
+def _scan_noncurrent_versions(
+    s3_client,
+    bucket_name: str,
+    budget: _RequestBudget,
+    config: AppConfig,
+    result: ReclaimableStorage,
+) -> None:
+    markers: dict[str, str] = {}
+    while budget.take():
+        page = s3_client.list_object_versions(Bucket=bucket_name, MaxKeys=RECLAIMABLE_PAGE_SIZE, **markers)
+        for version in page.get("Versions", []):
+            if not version.get("IsLatest"):
+                result.noncurrent_versions.add(
+                    int(version.get("Size", 0)),
+                    str(version.get("StorageClass") or "STANDARD"),
+                    config,
+                )
+        result.delete_markers += len(page.get("DeleteMarkers", []))
+        if not page.get("IsTruncated"):
+            return
+        markers = {"KeyMarker": page.get("NextKeyMarker", ""), "VersionIdMarker": page.get("NextVersionIdMarker", "")}
+    result.complete = False
+
+
+def scan_reclaimable_storage(s3_client, bucket_name: str, config: AppConfig) -> ReclaimableStorage | None:
+    budget = _RequestBudget(config.s3_scan.reclaimable_requests)
+    started_before = datetime.now(timezone.utc) - timedelta(days=config.thresholds.s3_multipart_stale_days)
+    result = ReclaimableStorage()
+    try:
+        _scan_multipart_uploads(s3_client, bucket_name, started_before, budget, config, result)
+    except (BotoCoreError, ClientError):
+        return None
+    try:
+        # Without versioning every object is a current version; skip the listing.
+        if s3_client.get_bucket_versioning(Bucket=bucket_name).get("Status") in {"Enabled", "Suspended"}:
+            _scan_noncurrent_versions(s3_client, bucket_name, budget, config, result)
+    except (BotoCoreError, ClientError):
+        # Version access is granted separately; the multipart totals still stand.
+        result.noncurrent_versions = ReclaimableBytes()
+        result.delete_markers = 0
+    return result
+
+
+def reclaimable_findings(
+    scans: dict[str, tuple[str | None, ReclaimableStorage]],
+    config: AppConfig,
+    top_n: int,
+) -> list[Finding]:
+    findings: list[Finding] = []
+    for bucket_name, (region, storage) in scans.items():
+        partial_note = {} if storage.complete else {"sample_limit_note": "Request limit reached; totals are partial"}
+        if storage.uploads.count:
+            findings.append(
+                Finding(
+                    service="s3",
+                    resource_id=bucket_name,
+                    region=region,
+                    recommendation="Abort incomplete multipart uploads and add an AbortIncompleteMultipartUpload rule",
+                    estimated_monthly_savings_usd=round(storage.uploads.monthly_cost_usd, 2),
+                    risk_level="low",
+                    details={
+                        "finding_type": "incomplete-multipart-uploads",
+                        "upload_count": storage.uploads.count,
+                        "reclaimable_gib": round(storage.uploads.size_bytes / (1024**3), 2),
+                        "min_upload_age_days": config.thresholds.s3_multipart_stale_days,
+                        **partial_note,
+                    },
+                )
+            )
+        if storage.noncurrent_versions.count:
+            findings.append(
+                Finding(
+                    service="s3",
+                    resource_id=bucket_name,
+                    region=region,
+                    recommendation="Expire noncurrent object versions with a NoncurrentVersionExpiration rule",
+                    estimated_monthly_savings_usd=round(storage.noncurrent_versions.monthly_cost_usd, 2),
+                    risk_level="medium",
+                    details={
+                        "finding_type": "noncurrent-versions",
+                        "noncurrent_version_count": storage.noncurrent_versions.count,
+                        "reclaimable_gib": round(storage.noncurrent_versions.size_bytes / (1024**3), 2),
+                        "delete_marker_count": storage.delete_markers,
+                        **partial_note,
+                    },
+                )
+            )
+    findings.sort(key=lambda finding: (-finding.estimated_monthly_savings_usd, finding.resource_id))
+    return findings[:top_n]
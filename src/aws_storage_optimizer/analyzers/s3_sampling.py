@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import bisect
+from contextlib import contextmanager
+from dataclasses import dataclass
+import math
+import os
+import random
+from typing import Iterator
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+SAMPLE_PAGE_SIZE = 1000
+# Levels with more entries than this many delimiter pages are sampled by key
+# range instead of being enumerated.
+DELIMITER_PAGES = 3
+# Key characters after the prefix shared by the whole key range that take part
+# in the key -> position mapping used to place random StartAfter values.
+KEY_POSITION_DIGITS = 48
+Z_95 = 1.96
+
+
+@dataclass
+class SampleEstimate:
+    object_count: int
+    size_bytes: int
+    object_count_interval: tuple[int, int]
+    size_bytes_interval: tuple[int, int]
+    requests: int
+    exact: bool
+
+
+@dataclass
+class _Estimate:
+    count: float
+    size: float
+    count_var: float = 0.0
+    size_var: float = 0.0
+    exact: bool = True
+
+
+@dataclass
+class _Level:
+    prefixes: list[str]
+    count: int
+    size: int
+    complete: bool
+
+
+class _SampledBucket:
+    def __init__(self, s3_client, bucket_name: str, max_requests: int):
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.max_requests = max_requests
+        self.requests = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.max_requests - self.requests
+
+    @contextmanager
+    def budget(self, requests: int) -> Iterator[None]:
+        saved = self.max_requests
+        self.max_requests = min(saved, self.requests + requests)
+        try:
+            yield
+        finally:
+            self.max_requests = saved
+
+    def list(self, **kwargs) -> dict | None:
+        if self.requests >= self.max_requests:
+            return None
+        self.requests += 1
+        try:
+            return self.s3_client.list_objects_v2(Bucket=self.bucket_name, **kwargs)
+        except (BotoCoreError, ClientError):
+            return None
+
+
+def _page_totals(page: dict) -> tuple[int, int]:
+    contents = page.get("Contents", [])
+    return len(contents), sum(int(obj.get("Size", 0)) for obj in contents)
+
+
+class _KeySpace:
+    # Keys are read as base-(A + 1) numbers over an alphabet of the A printable
+    # ASCII characters seen in a first page, with 0 meaning "end of key". The
+    # mapping preserves key order, and random positions turn back into valid
+    # keys made only of characters the bucket actually uses, so few samples are
+    # wasted on empty regions of raw byte space.
+    def __init__(self, low_key: str, high_key: str, seen_keys: list[str]):
+        self.shared = os.path.commonprefix([low_key, high_key]).encode("utf-8")
+        alphabet = {
+            byte
+            for key in (low_key, high_key, *seen_keys)
+            for byte in key.encode("utf-8")[len(self.shared) :]
+            if 0x20 <= byte < 0x80
+        }
+        self.alphabet = sorted(alphabet) or [ord("0")]
+        self.base = len(self.alphabet) + 1
+        self.low = self.position(low_key)
+        self.high = max(self.position(high_key), self.low + 1)
+
+    def position(self, key: str) -> int:
+        tail = key.encode("utf-8")[len(self.shared) : len(self.shared) + KEY_POSITION_DIGITS]
+        value = 0
+        for byte in tail:
+            value = value * self.base + bisect.bisect_right(self.alphabet, byte)
+        return value * self.base ** (KEY_POSITION_DIGITS - len(tail))
+
+    def key_at(self, position: int) -> str:
+        digits = []
+        for _ in range(KEY_POSITION_DIGITS):
+            position, digit = divmod(position, self.base)
+            digits.append(digit)
+        tail = bytearray()
+        for digit in reversed(digits):
+            if digit == 0:
+                break
+            tail.append(self.alphabet[digit - 1])
+        return (self.shared + bytes(tail)).decode("utf-8")
+
+
+def _mean_estimate(values: list[int], scale: float) -> tuple[float, float]:
+    sample_count = len(values)
+    mean = sum(values) / sample_count
+    variance = sum((value - mean) ** 2 for value in values) / (sample_count - 1) if sample_count > 1 else mean**2
+    return mean * scale, variance / sample_count * scale**2
+
+
+def _sample_window(
+    sampled: _SampledBucket,
+    key_space: _KeySpace,
+    prefix: str,
+    start: int,
+    end: int,
+) -> tuple[int, int, bool] | None:
+    # Count objects with key positions in (start, end], following continuation
+    # tokens while pages keep landing inside the window. The flag reports that
+    # nothing at all follows start, i.e. the key range ends before it.
+    kwargs: dict = {"Prefix": prefix, "MaxKeys": SAMPLE_PAGE_SIZE}
+    if start >= key_space.low:
+        kwargs["StartAfter"] = key_space.key_at(start)
+    count = 0
+    size = 0
+    first_page = True
+    while True:
+        page = sampled.list(**kwargs)
+        if page is None:
+            return None
+        contents = page.get("Contents", [])
+        if first_page and not contents:
+            return 0, 0, True
+        first_page = False
+        for obj in contents:
+            position = key_space.position(str(obj.get("Key", "")))
+            if position > end:
+                return count, size, False
+            if position > start:
+                count += 1
+                size += int(obj.get("Size", 0))
+        if not page.get("NextContinuationToken"):
+            return count, size, False
+        kwargs = {"Prefix": prefix, "MaxKeys": SAMPLE_PAGE_SIZE, "ContinuationToken": page["NextContinuationToken"]}
+
+
+def _estimate_key_range(sampled: _SampledBucket, prefix: str, rng: random.Random) -> _Estimate | None:
+    first_page = sampled.list(Prefix=prefix, MaxKeys=SAMPLE_PAGE_SIZE)
+    if first_page is None:
+        return None
+    seen_count, seen_bytes = _page_totals(first_page)
+    if not first_page.get("NextContinuationToken"):
+        return _Estimate(seen_count, seen_bytes)
+
+    seen_keys = [str(obj.get("Key", "")) for obj in first_page["Contents"]]
+    key_space = _KeySpace(seen_keys[0], prefix + "\x7f" * KEY_POSITION_DIGITS, seen_keys)
+    # Fixed-width windows placed uniformly at random give an unbiased count:
+    # every key lands in a window with probability width / (high - origin).
+    # Starting the origin one width below the first key removes the edge effect.
+    # A window that finds nothing after its start proves the range ends there,
+    # so the sampled range shrinks and samples beyond it are dropped.
+    width = max(key_space.position(seen_keys[-1]) - key_space.low, 1)
+    origin = key_space.low - width
+    high = key_space.high
+    samples: list[tuple[int, int, int]] = []
+    while True:
+        start = rng.randrange(origin, high)
+        window = _sample_window(sampled, key_space, prefix, start, start + width)
+        if window is None:
+            break
+        if window[2]:
+            high = max(start, key_space.low + 1)
+            samples = [sample for sample in samples if sample[0] < high]
+            continue
+        samples.append((start, window[0], window[1]))
+
+    if not samples:
+        return _Estimate(seen_count, seen_bytes, exact=False)
+    scale = (high - origin) / width
+    count, count_var = _mean_estimate([sample[1] for sample in samples], scale)
+    size, size_var = _mean_estimate([sample[2] for sample in samples], scale)
+    return _Estimate(max(count, seen_count), max(size, seen_bytes), count_var, size_var, exact=False)
+
+
+def _list_level(sampled: _SampledBucket, prefix: str) -> _Level | None:
+    level = _Level(prefixes=[], count=0, size=0, complete=False)
+    continuation_token = None
+    for _ in range(DELIMITER_PAGES):
+        kwargs = {"Prefix": prefix, "Delimiter": "/", "MaxKeys": SAMPLE_PAGE_SIZE}
+        if continuation_token:
+            kwargs["ContinuationToken"] = continuation_token
+        page = sampled.list(**kwargs)
+        if page is None:
+            return None
+        level.prefixes.extend(str(item.get("Prefix", "")) for item in page.get("CommonPrefixes", []))
+        count, size = _page_totals(page)
+        level.count += count
+        level.size += size
+        continuation_token = page.get("NextContinuationToken")
+        if not continuation_token:
+            level.complete = True
+            break
+    return level
+
+
+def _stage_totals(values: list[float], variances: list[float], population: int) -> tuple[float, float]:
+    sample_size = len(values)
+    factor = population / sample_size
+    total = factor * sum(values)
+    within = factor * sum(variances)
+    if sample_size == population:
+        return total, within
+    if sample_size == 1:
+        # A single sampled child says nothing about spread; assume it is as large as the estimate.
+        return total, total**2 + within
+    mean = sum(values) / sample_size
+    spread = sum((value - mean) ** 2 for value in values) / (sample_size - 1)
+    return total, population**2 * (1 - sample_size / population) * spread / sample_size + within
+
+
+def _estimate_prefix(sampled: _SampledBucket, prefix: str, rng: random.Random) -> _Estimate | None:
+    level = _list_level(sampled, prefix)
+    if level is None:
+        return None
+    if not level.complete:
+        return _estimate_key_range(sampled, prefix, rng)
+    if not level.prefixes:
+        return _Estimate(level.count, level.size)
+
+    # Multi-stage sampling: a simple random sample of child prefixes, each
+    # estimated recursively, scaled up by (children / sampled children).
+    # Fewer, better funded children are sampled when the budget is tight so
+    # each one can still reach its leaves.
+    children = rng.sample(level.prefixes, len(level.prefixes))
+    target = min(len(children), max(2, math.isqrt(sampled.remaining)))
+    estimates: list[_Estimate] = []
+    for child in children:
+        if sampled.remaining <= 0:
+            break
+        share = max(1, sampled.remaining // max(target - len(estimates), 1))
+        with sampled.budget(share):
+            estimate = _estimate_prefix(sampled, child, rng)
+        if estimate is None:
+            break
+        estimates.append(estimate)
+    if not estimates:
+        return None
+
+    count, count_var = _stage_totals(
+        [item.count for item in estimates], [item.count_var for item in estimates], len(children)
+    )
+    size, size_var = _stage_totals(
+        [item.size for item in estimates], [item.size_var for item in estimates], len(children)
+    )
+    return _Estimate(
+        count=level.count + count,
+        size=level.size + size,
+        count_var=count_var,
+        size_var=size_var,
+        exact=len(estimates) == len(children) and all(item.exact for item in estimates),
+    )
+
+
+def _interval(estimate: float, variance: float) -> tuple[int, int, int]:
+    margin = Z_95 * variance**0.5
+    value = max(round(estimate), 0)
+    return value, max(round(estimate - margin), 0), max(round(estimate + margin), value)
+
+
+def estimate_bucket_size(s3_client, bucket_name: str, max_requests: int, seed: str | None = None) -> SampleEstimate:
+    sampled = _SampledBucket(s3_client, bucket_name, max_requests)
+    rng = random.Random(seed if seed is not None else bucket_name)
+    estimate = _estimate_prefix(sampled, "", rng)
+    if estimate is None:
+        return SampleEstimate(0, 0, (0, 0), (0, 0), sampled.requests, False)
+
+    object_count, count_low, count_high = _interval(estimate.count, estimate.count_var)
+    size_bytes, size_low, size_high = _interval(estimate.size, estimate.size_var)
+    return SampleEstimate(
+        object_count=object_count,
+        size_bytes=size_bytes,
+        object_count_interval=(count_low, count_high),
+        size_bytes_interval=(size_low, size_high),
+        requests=sampled.requests,
+        exact=estimate.exact,
+    )
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from array import array
+import bisect
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from aws_storage_optimizer.analyzers.s3_prefix_trie import TRANSITION_SOURCE_CLASSES, PrefixTrie
+
+STORAGE_CLASSES = (
+    "STANDARD",
+    "INTELLIGENT_TIERING",
+    "STANDARD_IA",
+    "ONEZONE_IA",
+    "GLACIER_IR",
+    "GLACIER",
+    "DEEP_ARCHIVE",
+    "REDUCED_REDUNDANCY",
+    "EXPRESS_ONEZONE",
+    "OUTPOSTS",
+    "SNOW",
+    "OTHER",
+)
+STORAGE_CLASS_INDEX = {name: index for index, name in enumerate(STORAGE_CLASSES)}
+# Age buckets run from oldest to newest so that bisecting ascending cutoff
+# timestamps (now - 365d, now - 180d, ...) yields the bucket index directly.
+AGE_BUCKET_DAYS = (365, 180, 90, 30)
+AGE_BUCKET_LABELS = ("365d+", "180-365d", "90-180d", "30-90d", "0-30d", "unknown")
+UNKNOWN_AGE = len(AGE_BUCKET_LABELS) - 1
+SIZE_BUCKET_BOUNDS = (128 * 1024, 1024**2, 16 * 1024**2, 128 * 1024**2, 1024**3)
+SIZE_BUCKET_LABELS = ("<128KiB", "128KiB-1MiB", "1-16MiB", "16-128MiB", "128MiB-1GiB", "1GiB+")
+HISTOGRAM_CELLS = len(STORAGE_CLASSES) * len(AGE_BUCKET_LABELS) * len(SIZE_BUCKET_LABELS)
+STALE_CELLS = len(STORAGE_CLASSES) * len(SIZE_BUCKET_LABELS)
+
+
+def _zeros(length: int) -> array:
+    return array("q", bytes(8 * length))
+
+
+def _cell(class_index: int, age_index: int, size_index: int) -> int:
+    return (class_index * len(AGE_BUCKET_LABELS) + age_index) * len(SIZE_BUCKET_LABELS) + size_index
+
+
+@dataclass(frozen=True)
+class AgeCutoffs:
+    # Timestamps are datetimes for API listings and fixed-length ISO strings for
+    # inventory rows; both compare correctly against cutoffs of the same kind.
+    stale_before: Any
+    bucket_starts: tuple[Any, ...]
+
+    @classmethod
+    def since(cls, now: datetime, stale_days: int, time_format: str | None = None) -> "AgeCutoffs":
+        def cutoff(days: int) -> Any:
+            moment = now - timedelta(days=days)
+            return moment.strftime(time_format) if time_format else moment
+
+        return cls(cutoff(stale_days), tuple(cutoff(days) for days in AGE_BUCKET_DAYS))
+
+    def classify(self, timestamp: Any) -> tuple[bool, int]:
+        if not timestamp:
+            return False, UNKNOWN_AGE
+        return timestamp < self.stale_before, bisect.bisect_right(self.bucket_starts, timestamp)
+
+
+@dataclass
+class BucketStats:
+    size_bytes: int = 0
+    object_count: int = 0
+    # Flattened storage class x age bucket x size bucket counters; see _cell().
+    histogram_bytes: array = field(default_factory=lambda: _zeros(HISTOGRAM_CELLS))
+    histogram_counts: array = field(default_factory=lambda: _zeros(HISTOGRAM_CELLS))
+    # Stale objects by storage class x size bucket, since the stale threshold
+    # does not line up with the age buckets.
+    stale_histogram_bytes: array = field(default_factory=lambda: _zeros(STALE_CELLS))
+    stale_histogram_counts: array = field(default_factory=lambda: _zeros(STALE_CELLS))
+    prefixes: PrefixTrie | None = None
+
+    def add(
+        self,
+        size: int,
+        storage_class: str,
+        is_stale: bool,
+        age_index: int = UNKNOWN_AGE,
+        key: str | None = None,
+    ) -> None:
+        class_index = STORAGE_CLASS_INDEX.get(storage_class, STORAGE_CLASS_INDEX["OTHER"])
+        size_index = bisect.bisect_right(SIZE_BUCKET_BOUNDS, size)
+        cell = _cell(class_index, age_index, size_index)
+        self.size_bytes += size
+        self.object_count += 1
+        self.histogram_bytes[cell] += size
+        self.histogram_counts[cell] += 1
+        if is_stale:
+            stale_cell = class_index * len(SIZE_BUCKET_LABELS) + size_index
+            self.stale_histogram_bytes[stale_cell] += size
+            self.stale_histogram_counts[stale_cell] += 1
+        if self.prefixes is not None and key is not None:
+            transitionable = is_stale and storage_class in TRANSITION_SOURCE_CLASSES
+            self.prefixes.add(key, size, size if transitionable else 0)
+
+    @property
+    def stale_bytes(self) -> int:
+        return sum(self.stale_histogram_bytes)
+
+    @property
+    def stale_count(self) -> int:
+        return sum(self.stale_histogram_counts)
+
+    def merge(self, other: "BucketStats") -> None:
+        self.size_bytes += other.size_bytes
+        self.object_count += other.object_count
+        if other.prefixes is not None:
+            if self.prefixes is None:
+                self.prefixes = PrefixTrie(other.prefixes.max_depth, other.prefixes.max_nodes)
+            self.prefixes.merge(other.prefixes)
+        for cell in range(HISTOGRAM_CELLS):
+            self.histogram_bytes[cell] += other.histogram_bytes[cell]
+            self.histogram_counts[cell] += other.histogram_counts[cell]
+        for cell in range(STALE_CELLS):
+            self.stale_histogram_bytes[cell] += other.stale_histogram_bytes[cell]
+            self.stale_histogram_counts[cell] += other.stale_histogram_counts[cell]
+
+    @property
+    def storage_class_bytes(self) -> dict[str, int]:
+        cells_per_class = len(AGE_BUCKET_LABELS) * len(SIZE_BUCKET_LABELS)
+        totals = {}
+        for class_index, storage_class in enumerate(STORAGE_CLASSES):
+            start = class_index * cells_per_class
+            total = sum(self.histogram_bytes[start : start + cells_per_class])
+            if total:
+                totals[storage_class] = total
+        return totals
+
+    @property
+    def stale_storage_class_bytes(self) -> dict[str, int]:
+        return {
+            storage_class: sizes[0]
+            for storage_class, sizes in self.stale_size_buckets().items()
+            if sizes[0]
+        }
+
+    def stale_size_buckets(self) -> dict[str, tuple[int, int, int, int]]:
+        # storage class -> (bytes, objects, bytes under 128 KiB, objects under 128 KiB)
+        buckets = {}
+        width = len(SIZE_BUCKET_LABELS)
+        for class_index, storage_class in enumerate(STORAGE_CLASSES):
+            start = class_index * width
+            count = sum(self.stale_histogram_counts[start : start + width])
+            if count:
+                buckets[storage_class] = (
+                    sum(self.stale_histogram_bytes[start : start + width]),
+                    count,
+                    self.stale_histogram_bytes[start],
+                    self.stale_histogram_counts[start],
+                )
+        return buckets
+
+    def age_bytes(self) -> dict[str, dict[str, int]]:
+        # storage class -> age bucket label -> bytes, non-empty entries only
+        breakdown: dict[str, dict[str, int]] = {}
+        for class_index, storage_class in enumerate(STORAGE_CLASSES):
+            for age_index, age_label in enumerate(AGE_BUCKET_LABELS):
+                start = _cell(class_index, age_index, 0)
+                total = sum(self.histogram_bytes[start : start + len(SIZE_BUCKET_LABELS)])
+                if total:
+                    breakdown.setdefault(storage_class, {})[age_label] = total
+        return breakdown
+
+    def size_bucket_counts(self) -> dict[str, int]:
+        counts = [0] * len(SIZE_BUCKET_LABELS)
+        for cell in range(HISTOGRAM_CELLS):
+            counts[cell % len(SIZE_BUCKET_LABELS)] += self.histogram_counts[cell]
+        return {label: count for label, count in zip(SIZE_BUCKET_LABELS, counts) if count}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "size_bytes": self.size_bytes,
+            "object_count": self.object_count,
+            "histogram_bytes": self.histogram_bytes.tolist(),
+            "histogram_counts": self.histogram_counts.tolist(),
+            "stale_histogram_bytes": self.stale_histogram_bytes.tolist(),
+            "stale_histogram_counts": self.stale_histogram_counts.tolist(),
+            "prefixes": self.prefixes.to_dict() if self.prefixes is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "BucketStats":
+        stats = cls(
+            size_bytes=int(payload.get("size_bytes", 0)),
+            object_count=int(payload.get("object_count", 0)),
+            prefixes=PrefixTrie.from_dict(payload["prefixes"]) if payload.get("prefixes") else None,
+        )
+        for name, length in (
+            ("histogram_bytes", HISTOGRAM_CELLS),
+            ("histogram_counts", HISTOGRAM_CELLS),
+            ("stale_histogram_bytes", STALE_CELLS),
+            ("stale_histogram_counts", STALE_CELLS),
+        ):
+            values = payload.get(name)
+            if values is not None and len(values) == length:
+                setattr(stats, name, array("q", (int(value) for value in values)))
+        return stats
+
+
+class LargestObjects:
+    # Bounded min-heap of the `limit` largest objects seen; the smallest kept
+    # object sits at the root, so each offer costs O(log limit) at most.
+    def __init__(self, limit: int, entries: list[tuple[int, str, str, str, str]] | None = None):
+        self.limit = limit
+        self._heap: list[tuple[int, str, str, str, str]] = []
+        for entry in entries or []:
+            self.offer(*entry)
+
+    def offer(self, size: int, bucket_name: str, key: str, storage_class: str, last_modified: str) -> None:
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, (size, bucket_name, key, storage_class, last_modified))
+        elif self._heap and (size, bucket_name, key) > self._heap[0][:3]:
+            heapq.heapreplace(self._heap, (size, bucket_name, key, storage_class, last_modified))
+
+    def threshold(self) -> int | None:
+        # Objects smaller than this can never enter the heap.
+        if self.limit <= 0:
+            return None
+        return self._heap[0][0] if len(self._heap) >= self.limit else 0
+
+    def merge(self, other: "LargestObjects") -> None:
+        for entry in other.entries():
+            self.offer(*entry)
+
+    def entries(self) -> list[tuple[int, str, str, str, str]]:
+        # Largest first; equal sizes in bucket/key order.
+        return sorted(self._heap, key=lambda entry: (-entry[0], entry[1], entry[2]))
+
+    def to_list(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "bucket": bucket_name,
+                "key": key,
+                "size_bytes": size,
+                "storage_class": storage_class,
+                "last_modified": last_modified,
+            }
+            for size, bucket_name, key, storage_class, last_modified in self.entries()
+        ]
+
+    @classmethod
+    def from_list(cls, limit: int, items: list[dict[str, Any]]) -> "LargestObjects":
+        return cls(
+            limit,
+            [
+                (
+                    int(item["size_bytes"]),
+                    str(item["bucket"]),
+                    str(item["key"]),
+                    str(item.get("storage_class", "STANDARD")),
+                    str(item.get("last_modified", "")),
+                )
+                for item in items
+            ],
+        )
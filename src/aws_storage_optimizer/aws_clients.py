@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import threading
+
 import boto3
 from botocore.config import Config as BotoConfig
 
-from aws_storage_optimizer.config import AppConfig
+from aws_storage_optimizer.config import AppConfig, S3ScanSettings
+
+# botocore's default connection pool size per client.
+DEFAULT_MAX_POOL_CONNECTIONS = 10
 
 
 class AWSClientFactory:
@@ -16,13 +21,30 @@ class AWSClientFactory:
         self.session = boto3.Session(**session_args)
         retry_mode = "standard"
         retry_max_attempts = 5
+        s3_scan = S3ScanSettings()
         if config:
             retry_mode = config.retry.mode
             retry_max_attempts = config.retry.max_attempts
-        self.client_config = BotoConfig(retries={"mode": retry_mode, "max_attempts": retry_max_attempts})
-
-    def s3(self):
-        return self.session.client("s3", config=self.client_config)
+            s3_scan = config.s3_scan
+        # Every bucket worker's prefix workers can share one regional S3 client;
+        # a smaller pool discards connections and opens a new TLS session per request.
+        self.client_config = BotoConfig(
+            retries={"mode": retry_mode, "max_attempts": retry_max_attempts},
+            max_pool_connections=max(DEFAULT_MAX_POOL_CONNECTIONS, s3_scan.concurrency * s3_scan.prefix_concurrency),
+        )
+        self._s3_clients: dict[str | None, object] = {}
+        # boto3 sessions are not thread-safe, and regional clients are requested from scan workers.
+        self._s3_clients_lock = threading.Lock()
+
+    def s3(self, region: str | None = None):
+        with self._s3_clients_lock:
+            if region not in self._s3_clients:
+                if region:
+                    client = self.session.client("s3", region_name=region, config=self.client_config)
+                else:
+                    client = self.session.client("s3", config=self.client_config)
+                self._s3_clients[region] = client
+            return self._s3_clients[region]
 
     def ec2(self):
         return self.session.client("ec2", config=self.client_config)
@@ -2,24 +2,49 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 import json
+import re
 from pathlib import Path
+import tempfile
 
+from botocore.exceptions import BotoCoreError, ClientError
 import click
 
 from aws_storage_optimizer.actions import execute_action
-from aws_storage_optimizer.analyzers import analyze_ebs, analyze_rds, analyze_s3
+from aws_storage_optimizer.analyzers import (
+    analyze_attached_ebs,
+    analyze_ebs,
+    analyze_ebs_snapshots,
+    analyze_rds,
+    analyze_s3,
+    load_s3_inventory,
+)
+from aws_storage_optimizer.analyzers.rds import RDS_CPU_STATISTICS
+from aws_storage_optimizer.analyzers.s3 import S3ScanUsage
+from aws_storage_optimizer.analyzers.s3_checkpoint import DEFAULT_CHECKPOINT_PATH, ScanCheckpoint
+from aws_storage_optimizer.analyzers.s3_duplicates import DEFAULT_DUPLICATE_PARTITIONS, DuplicateIndex
+from aws_storage_optimizer.analyzers.s3_lifecycle import (
+    LifecycleSimulator,
+    parse_lifecycle_rules,
+    simulate_bucket_listing,
+    simulate_inventory,
+)
 from aws_storage_optimizer.aws_clients import AWSClientFactory
-from aws_storage_optimizer.config import load_config
+from aws_storage_optimizer.config import AppConfig, load_config
 from aws_storage_optimizer.models import AnalysisResult
 from aws_storage_optimizer.recommender import prioritize_findings
 from aws_storage_optimizer.reporting import (
     load_analysis,
     print_analysis_json,
     print_analysis_table,
+    print_lifecycle_simulation_json,
+    print_lifecycle_simulation_table,
     save_analysis,
 )
 
 
+S3_BUCKET_NAME_PATTERN = re.compile(r"[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]")
+
+
 def _append_action_log(action_result, log_path: str) -> None:
     payload = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -31,6 +56,69 @@ def _append_action_log(action_result, log_path: str) -> None:
         log_file.write(json.dumps(payload) + "\n")
 
 
+def _s3_checkpoint_path(path: str | None, disabled: bool, resume: bool) -> str | None:
+    if not disabled:
+        return path or DEFAULT_CHECKPOINT_PATH
+    if path is not None or resume:
+        raise click.UsageError("--no-s3-checkpoint cannot be combined with --s3-checkpoint or --resume")
+    return None
+
+
+def _open_s3_checkpoint(path: str | None, resume: bool, config: AppConfig) -> ScanCheckpoint | None:
+    if path is None:
+        return None
+    if not resume:
+        return ScanCheckpoint(path, config.thresholds.s3_stale_days)
+    try:
+        return ScanCheckpoint.load(path, config.thresholds.s3_stale_days)
+    except (OSError, ValueError) as exc:
+        raise click.ClickException(f"Failed to read S3 scan checkpoint: {exc}") from exc
+
+
+def _analyze_s3(
+    client_factory: AWSClientFactory,
+    config: AppConfig,
+    top_n: int,
+    inventory_paths: tuple[str, ...],
+    checkpoint_path: str | None,
+    resume: bool,
+    duplicates: DuplicateIndex | None,
+) -> list:
+    try:
+        inventory_stats = (
+            load_s3_inventory(inventory_paths, config=config, duplicates=duplicates) if inventory_paths else None
+        )
+    except (OSError, ValueError) as exc:
+        raise click.ClickException(f"Failed to read S3 Inventory: {exc}") from exc
+    checkpoint = _open_s3_checkpoint(checkpoint_path, resume, config)
+    s3_usage = S3ScanUsage()
+    findings = analyze_s3(
+        client_factory.s3(),
+        config=config,
+        top_n=top_n,
+        cloudwatch_client=client_factory.cloudwatch(),
+        inventory_stats=inventory_stats,
+        usage=s3_usage,
+        regional_s3_client=client_factory.s3,
+        checkpoint=checkpoint,
+        duplicates=duplicates,
+    )
+    if s3_usage.list_request_budget is not None:
+        click.echo(
+            f"S3 list requests used: {s3_usage.list_requests}/{s3_usage.list_request_budget}"
+            f" ({s3_usage.unscanned_buckets} buckets left unscanned)",
+            err=True,
+        )
+    if s3_usage.duplicates is not None:
+        click.echo(
+            f"S3 duplicate objects: {s3_usage.duplicates.duplicate_objects} extra copies in"
+            f" {s3_usage.duplicates.group_count} groups, {s3_usage.duplicates.reclaimable_bytes / 1024**3:.2f} GiB"
+            " reclaimable",
+            err=True,
+        )
+    return findings
+
+
 @click.group()
 @click.option("--profile", default=None, help="AWS profile to use")
 @click.option("--region", default=None, help="AWS region override")
@@ -54,7 +142,82 @@ def cli(ctx: click.Context, profile: str | None, region: str | None) -> None:
 @click.option("--save", "save_path", default=None, help="Optional path to save findings JSON")
 @click.option("--rds-cpu-threshold", type=float, default=None)
 @click.option("--rds-lookback-days", type=int, default=None)
+@click.option(
+    "--rds-cpu-statistic",
+    type=click.Choice(RDS_CPU_STATISTICS),
+    default=None,
+    help="CPU statistic compared with the RDS CPU threshold",
+)
 @click.option("--s3-stale-days", type=int, default=None)
+@click.option("--s3-concurrency", type=click.IntRange(min=1), default=None, help="Parallel S3 bucket scans")
+@click.option(
+    "--top-k-s3-objects",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Largest S3 objects to report, across buckets and per bucket (0 disables)",
+)
+@click.option(
+    "--s3-prefix-concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parallel prefix listings within one S3 bucket",
+)
+@click.option(
+    "--s3-size-source",
+    type=click.Choice(["list", "metrics", "sample"]),
+    default=None,
+    help="Size buckets by listing objects, from CloudWatch storage metrics, or by sampling the key space",
+)
+@click.option(
+    "--s3-max-list-requests",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Budget of ListObjectsV2 requests; deep-scan only buckets that can reach the top N",
+)
+@click.option(
+    "--s3-reclaimable-requests",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Per-bucket request limit for the multipart upload and noncurrent version scan (default: off)",
+)
+@click.option(
+    "--s3-inventory",
+    "s3_inventory_paths",
+    type=click.Path(exists=True),
+    multiple=True,
+    help="Local S3 Inventory directory (manifest.json plus CSV data files); repeatable",
+)
+@click.option(
+    "--s3-checkpoint",
+    "s3_checkpoint_path",
+    default=None,
+    help=f"Persist S3 listing progress to this state file (default: {DEFAULT_CHECKPOINT_PATH})",
+)
+@click.option(
+    "--no-s3-checkpoint",
+    is_flag=True,
+    default=False,
+    help="Do not persist S3 listing progress",
+)
+@click.option("--resume", is_flag=True, default=False, help="Continue S3 listings from the checkpoint file")
+@click.option(
+    "--find-s3-duplicates",
+    is_flag=True,
+    default=False,
+    help="Group listed and inventoried S3 objects by ETag and size to report identical copies",
+)
+@click.option(
+    "--s3-duplicates-dir",
+    default=None,
+    help="Directory for the on-disk duplicate index (default: a temporary directory removed afterwards)",
+)
+@click.option(
+    "--s3-duplicate-partitions",
+    type=click.IntRange(min=1),
+    default=DEFAULT_DUPLICATE_PARTITIONS,
+    show_default=True,
+    help="Hash partitions of the duplicate index; one partition is held in memory at a time",
+)
 @click.pass_context
 def analyze(
     ctx: click.Context,
@@ -64,27 +227,70 @@ def analyze(
     save_path: str | None,
     rds_cpu_threshold: float | None,
     rds_lookback_days: int | None,
+    rds_cpu_statistic: str | None,
     s3_stale_days: int | None,
+    s3_concurrency: int | None,
+    top_k_s3_objects: int | None,
+    s3_prefix_concurrency: int | None,
+    s3_size_source: str | None,
+    s3_max_list_requests: int | None,
+    s3_reclaimable_requests: int | None,
+    s3_inventory_paths: tuple[str, ...],
+    s3_checkpoint_path: str | None,
+    no_s3_checkpoint: bool,
+    resume: bool,
+    find_s3_duplicates: bool,
+    s3_duplicates_dir: str | None,
+    s3_duplicate_partitions: int,
 ) -> None:
     profile = ctx.obj["profile"]
     config = ctx.obj["config"]
     region = ctx.obj["region"] or config.region
 
-    if rds_cpu_threshold is not None:
-        config.thresholds.rds_cpu_underutilized_pct = rds_cpu_threshold
-    if rds_lookback_days is not None:
-        config.thresholds.rds_lookback_days = rds_lookback_days
-    if s3_stale_days is not None:
-        config.thresholds.s3_stale_days = s3_stale_days
+    for target, attribute, value in (
+        (config.thresholds, "rds_cpu_underutilized_pct", rds_cpu_threshold),
+        (config.thresholds, "rds_lookback_days", rds_lookback_days),
+        (config.thresholds, "rds_cpu_statistic", rds_cpu_statistic),
+        (config.thresholds, "s3_stale_days", s3_stale_days),
+        (config.s3_scan, "concurrency", s3_concurrency),
+        (config.s3_scan, "largest_objects", top_k_s3_objects),
+        (config.s3_scan, "prefix_concurrency", s3_prefix_concurrency),
+        (config.s3_scan, "size_source", s3_size_source),
+        (config.s3_scan, "max_list_requests", s3_max_list_requests),
+        (config.s3_scan, "reclaimable_requests", s3_reclaimable_requests),
+    ):
+        if value is not None:
+            setattr(target, attribute, value)
 
     selected = set(services) if services else {"s3", "ebs", "rds"}
     client_factory = AWSClientFactory(profile=profile, region=region, config=config)
 
     findings = []
     if "s3" in selected:
-        findings.extend(analyze_s3(client_factory.s3(), config=config, top_n=top_n_s3))
+        s3_checkpoint_path = _s3_checkpoint_path(s3_checkpoint_path, no_s3_checkpoint, resume)
+        if find_s3_duplicates and resume:
+            # Pages listed before the checkpoint was loaded would be missing from the index.
+            raise click.UsageError("--find-s3-duplicates needs a full listing and cannot be combined with --resume")
+        if find_s3_duplicates and s3_duplicates_dir and any(Path(s3_duplicates_dir).glob("*.csv")):
+            raise click.UsageError(f"Duplicate index directory {s3_duplicates_dir} is not empty")
+        with tempfile.TemporaryDirectory(prefix="aso-s3-duplicates-") as spill_dir:
+            duplicates = None
+            if find_s3_duplicates:
+                duplicates = DuplicateIndex(Path(s3_duplicates_dir or spill_dir), s3_duplicate_partitions)
+            findings.extend(
+                _analyze_s3(
+                    client_factory, config, top_n_s3, s3_inventory_paths, s3_checkpoint_path, resume, duplicates
+                )
+            )
     if "ebs" in selected:
-        findings.extend(analyze_ebs(client_factory.ec2(), config=config, region=region))
+        ec2_client = client_factory.ec2()
+        findings.extend(analyze_ebs(ec2_client, config=config, region=region))
+        findings.extend(analyze_ebs_snapshots(ec2_client, config=config, region=region))
+        findings.extend(
+            analyze_attached_ebs(
+                ec2_client, cloudwatch_client=client_factory.cloudwatch(), config=config, region=region
+            )
+        )
     if "rds" in selected:
         findings.extend(
             analyze_rds(
@@ -125,6 +331,61 @@ def report(input_path: str, output_format: str) -> None:
         print_analysis_table(result)
 
 
+@cli.command("simulate-lifecycle")
+@click.option(
+    "--lifecycle",
+    "lifecycle_path",
+    type=click.Path(exists=True),
+    required=True,
+    help="Candidate lifecycle configuration JSON ({\"Rules\": [...]}, as returned by GetBucketLifecycleConfiguration)",
+)
+@click.option(
+    "--s3-inventory",
+    "s3_inventory_paths",
+    type=click.Path(exists=True),
+    multiple=True,
+    help="Local S3 Inventory directory to replay; repeatable",
+)
+@click.option("--bucket", "bucket_names", multiple=True, help="Bucket to list and replay; repeatable")
+@click.option("--output-format", type=click.Choice(["table", "json"]), default="table")
+@click.pass_context
+def simulate_lifecycle(
+    ctx: click.Context,
+    lifecycle_path: str,
+    s3_inventory_paths: tuple[str, ...],
+    bucket_names: tuple[str, ...],
+    output_format: str,
+) -> None:
+    config = ctx.obj["config"]
+    if not s3_inventory_paths and not bucket_names:
+        raise click.UsageError("Provide --s3-inventory or --bucket as the object source")
+    try:
+        rules, warnings = parse_lifecycle_rules(json.loads(Path(lifecycle_path).read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError, KeyError) as exc:
+        raise click.ClickException(f"Failed to read lifecycle configuration: {exc}") from exc
+
+    simulator = LifecycleSimulator(rules)
+    try:
+        if s3_inventory_paths:
+            simulate_inventory(s3_inventory_paths, simulator)
+    except (OSError, ValueError) as exc:
+        raise click.ClickException(f"Failed to read S3 Inventory: {exc}") from exc
+    if bucket_names:
+        region = ctx.obj["region"] or config.region
+        s3_client = AWSClientFactory(profile=ctx.obj["profile"], region=region, config=config).s3()
+        for bucket_name in bucket_names:
+            try:
+                simulate_bucket_listing(s3_client, bucket_name, simulator)
+            except (BotoCoreError, ClientError) as exc:
+                raise click.ClickException(f"Failed to list bucket {bucket_name}: {exc}") from exc
+
+    simulation = simulator.evaluate(datetime.now(timezone.utc).date(), config, warnings).to_dict()
+    if output_format == "json":
+        print_lifecycle_simulation_json(simulation)
+    else:
+        print_lifecycle_simulation_table(simulation)
+
+
 @cli.command()
 @click.option(
     "--action-type",
@@ -159,6 +420,12 @@ def execute(
     config = ctx.obj["config"]
     region = ctx.obj["region"] or config.region
 
+    if action_type == "delete-s3-object" and not bucket and not key:
+        # Largest-object findings use "bucket/key" resource ids; bucket names cannot contain "/".
+        bucket_name, _, object_key = resource_id.partition("/")
+        if S3_BUCKET_NAME_PATTERN.fullmatch(bucket_name) and object_key:
+            bucket, key = bucket_name, object_key
+
     if action_type == "delete-s3-object" and (not bucket or not key):
         raise click.ClickException("--bucket and --key are required for delete-s3-object")
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 import re
 
@@ -9,14 +9,21 @@ import re
 class Thresholds:
     rds_cpu_underutilized_pct: float = 15.0
     rds_lookback_days: int = 7
+    # Which CPU statistic is compared with rds_cpu_underutilized_pct: mean, p50, p95, p99 or max.
+    rds_cpu_statistic: str = "mean"
     s3_stale_days: int = 90
+    s3_multipart_stale_days: int = 7
+    ebs_lookback_days: int = 14
+    ebs_idle_iops: float = 1.0
 
 
 @dataclass
 class EstimationRates:
     ebs_gp3_per_gib_month_usd: float = 0.08
     s3_standard_per_gib_month_usd: float = 0.023
+    s3_standard_ia_per_gib_month_usd: float = 0.0125
     s3_estimated_optimization_ratio: float = 0.3
+    s3_transition_amortization_months: int = 12
     rds_default_monthly_cost_usd: float = 120.0
     rds_estimated_downsize_ratio: float = 0.25
 
@@ -33,6 +40,25 @@ class RetrySettings:
     max_attempts: int = 5
 
 
+@dataclass
+class S3ScanSettings:
+    concurrency: int = 8
+    prefix_concurrency: int = 4
+    size_source: str = "list"
+    max_list_requests: int | None = None
+    sample_requests: int = 48
+    largest_objects: int = 0
+    reclaimable_requests: int = 0
+
+
+@dataclass
+class LifecycleSettings:
+    prefix_depth: int = 3
+    max_prefix_nodes: int = 4096
+    max_recommendations: int = 5
+    min_stale_fraction: float = 0.8
+
+
 @dataclass
 class AppConfig:
     thresholds: Thresholds
@@ -40,6 +66,8 @@ class AppConfig:
     protection: ProtectionSettings
     retry: RetrySettings
     region: str | None = None
+    s3_scan: S3ScanSettings = field(default_factory=S3ScanSettings)
+    lifecycle: LifecycleSettings = field(default_factory=LifecycleSettings)
 
 
 def _profile_env_key(profile: str | None, name: str) -> str | None:
@@ -56,20 +84,32 @@ def _get_env(name: str, default: str, profile: str | None = None) -> str:
     return os.getenv(f"ASO_{name}", default)
 
 
+def _optional_int(value: str) -> int | None:
+    return int(value) if value.strip() else None
+
+
 def load_config(profile: str | None = None) -> AppConfig:
     thresholds = Thresholds(
         rds_cpu_underutilized_pct=float(_get_env("RDS_CPU_UNDERUTILIZED_PCT", "15", profile)),
         rds_lookback_days=int(_get_env("RDS_LOOKBACK_DAYS", "7", profile)),
+        rds_cpu_statistic=_get_env("RDS_CPU_STATISTIC", "mean", profile),
         s3_stale_days=int(_get_env("S3_STALE_DAYS", "90", profile)),
+        s3_multipart_stale_days=int(_get_env("S3_MULTIPART_STALE_DAYS", "7", profile)),
+        ebs_lookback_days=int(_get_env("EBS_LOOKBACK_DAYS", "14", profile)),
+        ebs_idle_iops=float(_get_env("EBS_IDLE_IOPS", "1.0", profile)),
     )
     rates = EstimationRates(
         ebs_gp3_per_gib_month_usd=float(_get_env("EBS_GP3_PER_GIB_MONTH_USD", "0.08", profile)),
         s3_standard_per_gib_month_usd=float(
             _get_env("S3_STANDARD_PER_GIB_MONTH_USD", "0.023", profile)
         ),
+        s3_standard_ia_per_gib_month_usd=float(
+            _get_env("S3_STANDARD_IA_PER_GIB_MONTH_USD", "0.0125", profile)
+        ),
         s3_estimated_optimization_ratio=float(
             _get_env("S3_ESTIMATED_OPTIMIZATION_RATIO", "0.3", profile)
         ),
+        s3_transition_amortization_months=int(_get_env("S3_TRANSITION_AMORTIZATION_MONTHS", "12", profile)),
         rds_default_monthly_cost_usd=float(_get_env("RDS_DEFAULT_MONTHLY_COST_USD", "120", profile)),
         rds_estimated_downsize_ratio=float(_get_env("RDS_ESTIMATED_DOWNSIZE_RATIO", "0.25", profile)),
     )
@@ -81,5 +121,28 @@ def load_config(profile: str | None = None) -> AppConfig:
         mode=_get_env("RETRY_MODE", "standard", profile),
         max_attempts=int(_get_env("RETRY_MAX_ATTEMPTS", "5", profile)),
     )
+    s3_scan = S3ScanSettings(
+        concurrency=int(_get_env("S3_CONCURRENCY", "8", profile)),
+        prefix_concurrency=int(_get_env("S3_PREFIX_CONCURRENCY", "4", profile)),
+        size_source=_get_env("S3_SIZE_SOURCE", "list", profile),
+        max_list_requests=_optional_int(_get_env("S3_MAX_LIST_REQUESTS", "", profile)),
+        sample_requests=int(_get_env("S3_SAMPLE_REQUESTS", "48", profile)),
+        largest_objects=int(_get_env("S3_LARGEST_OBJECTS", "0", profile)),
+        reclaimable_requests=int(_get_env("S3_RECLAIMABLE_REQUESTS", "0", profile)),
+    )
+    lifecycle = LifecycleSettings(
+        prefix_depth=int(_get_env("LIFECYCLE_PREFIX_DEPTH", "3", profile)),
+        max_prefix_nodes=int(_get_env("LIFECYCLE_MAX_PREFIX_NODES", "4096", profile)),
+        max_recommendations=int(_get_env("LIFECYCLE_MAX_RECOMMENDATIONS", "5", profile)),
+        min_stale_fraction=float(_get_env("LIFECYCLE_MIN_STALE_FRACTION", "0.8", profile)),
+    )
     region = os.getenv("ASO_REGION") or "us-west-2"
-    return AppConfig(thresholds=thresholds, rates=rates, protection=protection, retry=retry, region=region)
+    return AppConfig(
+        thresholds=thresholds,
+        rates=rates,
+        protection=protection,
+        retry=retry,
+        region=region,
+        s3_scan=s3_scan,
+        lifecycle=lifecycle,
+    )
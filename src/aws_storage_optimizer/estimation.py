@@ -1,26 +1,241 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 from aws_storage_optimizer.config import AppConfig
 
-RDS_CLASS_MONTHLY_BASELINE_USD = {
-    "db.t3.micro": 13.0,
-    "db.t3.small": 26.0,
-    "db.t3.medium": 52.0,
-    "db.t4g.micro": 12.0,
-    "db.t4g.small": 24.0,
-    "db.t4g.medium": 48.0,
-    "db.m5.large": 140.0,
-    "db.m5.xlarge": 280.0,
+HOURS_PER_MONTH = 730
+# us-east-1 single-AZ on-demand RDS prices: family -> (hourly USD of the
+# "large" size, GiB of memory per vCPU, largest size as a multiple of large).
+# Larger sizes scale linearly with vCPUs.
+RDS_INSTANCE_FAMILIES = {
+    "db.t3": (0.136, 4, 4),
+    "db.t4g": (0.129, 4, 4),
+    "db.m5": (0.171, 4, 48),
+    "db.m6g": (0.152, 4, 32),
+    "db.m6i": (0.171, 4, 64),
+    "db.r5": (0.25, 8, 48),
+    "db.r6g": (0.225, 8, 32),
+    "db.r6i": (0.25, 8, 64),
+}
+RDS_SIZE_MULTIPLES = {
+    "large": 1,
+    "xlarge": 2,
+    "2xlarge": 4,
+    "4xlarge": 8,
+    "8xlarge": 16,
+    "12xlarge": 24,
+    "16xlarge": 32,
+    "24xlarge": 48,
+    "32xlarge": 64,
+}
+# Burstable sizes below large: size -> (memory GiB, price as a fraction of large).
+RDS_BURSTABLE_SMALL_SIZES = {"micro": (1.0, 0.125), "small": (2.0, 0.25), "medium": (4.0, 0.5)}
+
+
+def rds_instance_catalog() -> dict[str, tuple[int, float, float]]:
+    # class name -> (vCPUs, memory GiB, single-AZ monthly USD)
+    catalog: dict[str, tuple[int, float, float]] = {}
+    for family, (large_hourly, gib_per_vcpu, largest_multiple) in RDS_INSTANCE_FAMILIES.items():
+        for size, multiple in RDS_SIZE_MULTIPLES.items():
+            if multiple <= largest_multiple:
+                vcpus = 2 * multiple
+                monthly = large_hourly * multiple * HOURS_PER_MONTH
+                catalog[f"{family}.{size}"] = (vcpus, float(vcpus * gib_per_vcpu), monthly)
+        if family.startswith("db.t"):
+            for size, (memory_gib, price_fraction) in RDS_BURSTABLE_SMALL_SIZES.items():
+                catalog[f"{family}.{size}"] = (2, memory_gib, large_hourly * price_fraction * HOURS_PER_MONTH)
+    return catalog
+
+
+# us-east-1 single-AZ RDS storage prices per GiB-month by StorageType.
+RDS_STORAGE_PER_GIB_MONTH_USD = {
+    "gp2": 0.115,
+    "gp3": 0.115,
+    "io1": 0.125,
+    "io2": 0.125,
+    "standard": 0.10,
+}
+AURORA_STORAGE_PER_GIB_MONTH_USD = 0.10
+
+RDS_CLASS_MONTHLY_BASELINE_USD = {name: round(monthly, 2) for name, (_, _, monthly) in rds_instance_catalog().items()}
+
+# us-east-1 EBS list prices. gp3 storage comes from EstimationRates; gp3
+# includes GP3_BASELINE_IOPS and GP3_BASELINE_THROUGHPUT_MIBPS at no charge.
+EBS_VOLUME_PER_GIB_MONTH_USD = {
+    "gp2": 0.10,
+    "io1": 0.125,
+    "io2": 0.125,
+    "st1": 0.045,
+    "sc1": 0.015,
+    "standard": 0.05,
+}
+# io2 uses its first IOPS tier.
+EBS_IO1_PER_IOPS_MONTH_USD = 0.065
+EBS_GP3_PER_IOPS_MONTH_USD = 0.005
+EBS_GP3_PER_MIBPS_MONTH_USD = 0.04
+GP3_BASELINE_IOPS = 3000
+GP3_BASELINE_THROUGHPUT_MIBPS = 125
+
+# us-east-1 EBS snapshot storage list prices by snapshot storage tier.
+EBS_SNAPSHOT_PER_GIB_MONTH_USD = {
+    "standard": 0.05,
+    "archive": 0.0125,
+}
+
+# us-east-1 list prices. STANDARD and STANDARD_IA come from EstimationRates so
+# they can be overridden; INTELLIGENT_TIERING is priced at its infrequent tier,
+# where stale objects already sit.
+S3_STORAGE_CLASS_PER_GIB_MONTH_USD = {
+    "INTELLIGENT_TIERING": 0.0125,
+    "ONEZONE_IA": 0.01,
+    "GLACIER_IR": 0.004,
+    "GLACIER": 0.0036,
+    "DEEP_ARCHIVE": 0.00099,
+    "REDUCED_REDUNDANCY": 0.024,
+}
+
+
+# us-east-1 lifecycle transition request prices, per 1,000 objects moved into the class.
+S3_TRANSITION_PER_1000_REQUESTS_USD = {
+    "STANDARD_IA": 0.01,
+    "INTELLIGENT_TIERING": 0.01,
+    "ONEZONE_IA": 0.01,
+    "GLACIER_IR": 0.02,
+    "GLACIER": 0.03,
+    "DEEP_ARCHIVE": 0.05,
 }
 
+S3_TRANSITION_TARGET_CLASSES = ("STANDARD_IA", "ONEZONE_IA", "GLACIER_IR", "GLACIER", "DEEP_ARCHIVE")
+# Objects smaller than this are billed as if they were this large.
+S3_MIN_BILLABLE_OBJECT_BYTES = {
+    "STANDARD_IA": 128 * 1024,
+    "ONEZONE_IA": 128 * 1024,
+    "GLACIER_IR": 128 * 1024,
+}
+# Archived objects carry 32 KiB of index data billed at the archive rate and
+# 8 KiB of metadata billed at the Standard rate.
+S3_ARCHIVE_OVERHEAD_BYTES = {
+    "GLACIER": (32 * 1024, 8 * 1024),
+    "DEEP_ARCHIVE": (32 * 1024, 8 * 1024),
+}
+
+
+@dataclass(frozen=True)
+class S3StaleObjects:
+    gib: float
+    objects: float
+    # Objects below the 128 KiB minimum billable size and their total size.
+    small_gib: float = 0.0
+    small_objects: float = 0.0
+
+
+@dataclass(frozen=True)
+class S3TransitionEstimate:
+    target_class: str
+    objects: float
+    gross_monthly_savings_usd: float
+    overhead_monthly_usd: float
+    transition_cost_usd: float
+    amortization_months: int
+
+    @property
+    def net_monthly_savings_usd(self) -> float:
+        return (
+            self.gross_monthly_savings_usd
+            - self.overhead_monthly_usd
+            - self.transition_cost_usd / max(self.amortization_months, 1)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "objects": round(self.objects),
+            "gross_monthly_savings_usd": round(self.gross_monthly_savings_usd, 2),
+            "overhead_monthly_usd": round(self.overhead_monthly_usd, 2),
+            "transition_cost_usd": round(self.transition_cost_usd, 2),
+            "net_monthly_savings_usd": round(self.net_monthly_savings_usd, 2),
+        }
+
 
-def estimate_s3_monthly_savings(size_gib: float, config: AppConfig) -> float:
-    estimate = (
-        size_gib
-        * config.rates.s3_standard_per_gib_month_usd
-        * config.rates.s3_estimated_optimization_ratio
+def s3_storage_class_rate(storage_class: str, config: AppConfig) -> float | None:
+    if storage_class == "STANDARD":
+        return config.rates.s3_standard_per_gib_month_usd
+    if storage_class == "STANDARD_IA":
+        return config.rates.s3_standard_ia_per_gib_month_usd
+    return S3_STORAGE_CLASS_PER_GIB_MONTH_USD.get(storage_class)
+
+
+def estimate_s3_transition(
+    stale_objects: dict[str, S3StaleObjects],
+    target_class: str,
+    config: AppConfig,
+) -> S3TransitionEstimate:
+    # Net effect of moving stale objects to target_class: the per-GiB rate
+    # difference, minus minimum billable size and per-object archive overhead
+    # (monthly), minus lifecycle transition requests (one-time, amortized).
+    # Classes that are already as cheap or cheaper (or unpriced) are not moved.
+    target_rate = s3_storage_class_rate(target_class, config) or 0.0
+    minimum_gib = S3_MIN_BILLABLE_OBJECT_BYTES.get(target_class, 0) / (1024**3)
+    index_bytes, metadata_bytes = S3_ARCHIVE_OVERHEAD_BYTES.get(target_class, (0, 0))
+    per_object_overhead = (
+        index_bytes * target_rate + metadata_bytes * config.rates.s3_standard_per_gib_month_usd
+    ) / (1024**3)
+    objects = gross = overhead = 0.0
+    for storage_class, stale in stale_objects.items():
+        rate = s3_storage_class_rate(storage_class, config)
+        if rate is None or rate <= target_rate:
+            continue
+        objects += stale.objects
+        gross += stale.gib * (rate - target_rate)
+        overhead += max(stale.small_objects * minimum_gib - stale.small_gib, 0.0) * target_rate
+        overhead += stale.objects * per_object_overhead
+    return S3TransitionEstimate(
+        target_class=target_class,
+        objects=objects,
+        gross_monthly_savings_usd=gross,
+        overhead_monthly_usd=overhead,
+        transition_cost_usd=objects / 1000 * S3_TRANSITION_PER_1000_REQUESTS_USD.get(target_class, 0.0),
+        amortization_months=config.rates.s3_transition_amortization_months,
     )
-    return round(max(estimate, 0.0), 2)
+
+
+def estimate_s3_monthly_savings(
+    size_gib: float,
+    config: AppConfig,
+    stale_objects: dict[str, S3StaleObjects] | None = None,
+) -> float:
+    if stale_objects is None:
+        estimate = (
+            size_gib
+            * config.rates.s3_standard_per_gib_month_usd
+            * config.rates.s3_estimated_optimization_ratio
+        )
+        return round(max(estimate, 0.0), 2)
+
+    # Net savings from moving stale data to Standard-IA.
+    estimate = estimate_s3_transition(stale_objects, "STANDARD_IA", config)
+    return round(max(estimate.net_monthly_savings_usd, 0.0), 2)
+
+
+def ebs_volume_monthly_cost(
+    volume_type: str,
+    size_gib: int,
+    iops: int,
+    throughput_mibps: int,
+    config: AppConfig,
+) -> float | None:
+    if volume_type == "gp3":
+        return (
+            size_gib * config.rates.ebs_gp3_per_gib_month_usd
+            + max(iops - GP3_BASELINE_IOPS, 0) * EBS_GP3_PER_IOPS_MONTH_USD
+            + max(throughput_mibps - GP3_BASELINE_THROUGHPUT_MIBPS, 0) * EBS_GP3_PER_MIBPS_MONTH_USD
+        )
+    if volume_type not in EBS_VOLUME_PER_GIB_MONTH_USD:
+        return None
+    cost = size_gib * EBS_VOLUME_PER_GIB_MONTH_USD[volume_type]
+    if volume_type in ("io1", "io2"):
+        cost += iops * EBS_IO1_PER_IOPS_MONTH_USD
+    return cost
 
 
 def estimate_rds_monthly_savings(db_instance_class: str | None, config: AppConfig) -> float:
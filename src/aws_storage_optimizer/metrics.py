@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+MAX_METRIC_DATA_QUERIES = 500
+
+
+def metric_stat_query(
+    query_id: str,
+    namespace: str,
+    metric_name: str,
+    dimensions: dict[str, str],
+    period: int,
+    stat: str,
+    return_data: bool = True,
+) -> dict:
+    return {
+        "Id": query_id,
+        "MetricStat": {
+            "Metric": {
+                "Namespace": namespace,
+                "MetricName": metric_name,
+                "Dimensions": [{"Name": name, "Value": value} for name, value in dimensions.items()],
+            },
+            "Period": period,
+            "Stat": stat,
+        },
+        "ReturnData": return_data,
+    }
+
+
+def metric_expression_query(query_id: str, expression: str) -> dict:
+    # Metric math over other queries in the same request; CloudWatch aligns
+    # the input series by timestamp.
+    return {"Id": query_id, "Expression": expression, "ReturnData": True}
+
+
+def percentile(ordered_values: list[float], fraction: float) -> float:
+    # Linear interpolation between closest ranks; values must be sorted.
+    position = (len(ordered_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered_values) - 1)
+    return ordered_values[lower] + (ordered_values[upper] - ordered_values[lower]) * (position - lower)
+
+
+def _fetch_batch(cloudwatch_client, batch: list[dict], start_time: datetime, end_time: datetime) -> dict | None:
+    series: dict[str, list[float]] = {}
+    next_token = None
+    while True:
+        kwargs = {
+            "MetricDataQueries": batch,
+            "StartTime": start_time,
+            "EndTime": end_time,
+            "ScanBy": "TimestampAscending",
+        }
+        if next_token:
+            kwargs["NextToken"] = next_token
+        try:
+            response = cloudwatch_client.get_metric_data(**kwargs)
+        except (BotoCoreError, ClientError):
+            return None
+
+        for result in response.get("MetricDataResults", []):
+            values = series.setdefault(str(result.get("Id")), [])
+            values.extend(float(value) for value in result.get("Values", []))
+
+        next_token = response.get("NextToken")
+        if not next_token:
+            return series
+
+
+def get_metric_data_batched(
+    cloudwatch_client,
+    queries: list[dict],
+    start_time: datetime,
+    end_time: datetime,
+) -> dict[str, list[float]]:
+    # Values are returned per query Id in ascending timestamp order. A batch is
+    # kept only when all of its pages arrive: queries whose batch fails on any
+    # page are absent from the result, so callers never reduce a truncated
+    # series and can treat them as no data.
+    series: dict[str, list[float]] = {}
+    for offset in range(0, len(queries), MAX_METRIC_DATA_QUERIES):
+        batch_series = _fetch_batch(
+            cloudwatch_client, queries[offset : offset + MAX_METRIC_DATA_QUERIES], start_time, end_time
+        )
+        if batch_series is not None:
+            series.update(batch_series)
+
+    return series
@@ -43,10 +43,55 @@ def print_analysis_table(result: AnalysisResult) -> None:
     console.print(table)
 
 
+def print_lifecycle_simulation_table(simulation: dict) -> None:
+    console = Console()
+    table = Table(title="Lifecycle Simulation")
+    table.add_column("Storage class")
+    table.add_column("Objects now", justify="right")
+    table.add_column("GiB now", justify="right")
+    table.add_column("$/mo now", justify="right")
+    table.add_column("Objects after", justify="right")
+    table.add_column("GiB after", justify="right")
+    table.add_column("$/mo after", justify="right")
+
+    empty = {"object_count": 0, "size_gib": 0.0, "monthly_cost_usd": 0.0}
+    for storage_class in sorted(set(simulation["current"]) | set(simulation["projected"])):
+        current = simulation["current"].get(storage_class, empty)
+        projected = simulation["projected"].get(storage_class, empty)
+        table.add_row(
+            storage_class,
+            str(current["object_count"]),
+            f"{current['size_gib']:.2f}",
+            f"{current['monthly_cost_usd']:.2f}",
+            str(projected["object_count"]),
+            f"{projected['size_gib']:.2f}",
+            f"{projected['monthly_cost_usd']:.2f}",
+        )
+
+    console.print(table)
+    expired = simulation["expired"]
+    console.print(f"Expired: {expired['object_count']} objects, {expired['size_gib']:.2f} GiB")
+    console.print(
+        f"Transition requests: {sum(simulation['transition_requests'].values())}"
+        f" (one-time ${simulation['transition_cost_usd']:.2f})"
+    )
+    payback = simulation["payback_months"]
+    console.print(
+        f"Monthly savings: ${simulation['monthly_savings_usd']:.2f}"
+        + (f", transition charges paid back in {payback} months" if payback is not None else "")
+    )
+    for warning in simulation["warnings"]:
+        console.print(f"[yellow]Warning:[/yellow] {warning}")
+
+
 def print_analysis_json(result: AnalysisResult) -> None:
     print(json.dumps(result.to_dict(), indent=2))
 
 
+def print_lifecycle_simulation_json(simulation: dict) -> None:
+    print(json.dumps(simulation, indent=2))
+
+
 def save_analysis(result: AnalysisResult, path: str) -> None:
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
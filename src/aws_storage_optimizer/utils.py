@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any, Callable, Iterator
+
 
 def has_protection_tag(tags: list[dict], tag_key: str, tag_value: str) -> bool:
     expected_value = tag_value.strip().lower()
@@ -7,3 +9,20 @@ def has_protection_tag(tags: list[dict], tag_key: str, tag_value: str) -> bool:
         if str(tag.get("Key", "")) == tag_key and str(tag.get("Value", "")).strip().lower() == expected_value:
             return True
     return False
+
+
+def iter_paginated(
+    operation: Callable[..., dict],
+    result_key: str,
+    token_key: str = "NextToken",
+    **kwargs: Any,
+) -> Iterator[dict]:
+    # Yields items page by page, passing the response token back as the request
+    # token. API errors propagate to the caller.
+    while True:
+        page = operation(**kwargs)
+        yield from page.get(result_key, [])
+        token = page.get(token_key)
+        if not token:
+            return
+        kwargs[token_key] = token
@@ -62,6 +62,22 @@ def test_client_factory_uses_retry_config_from_app_config(monkeypatch):
     assert retry_cfg["max_attempts"] == 9
 
 
+def test_client_factory_sizes_connection_pool_for_s3_scan_workers(monkeypatch):
+    monkeypatch.setattr("aws_storage_optimizer.aws_clients.boto3.Session", SessionSpy)
+    app_config = AppConfig(
+        thresholds=Thresholds(),
+        rates=EstimationRates(),
+        protection=ProtectionSettings(),
+        retry=RetrySettings(),
+    )
+    app_config.s3_scan.concurrency = 16
+    app_config.s3_scan.prefix_concurrency = 6
+
+    factory = AWSClientFactory(profile=None, region=None, config=app_config)
+
+    assert factory.s3()["config"].max_pool_connections == 96
+
+
 def test_client_factory_defaults_retry_config_when_no_app_config(monkeypatch):
     captured = {}
 
@@ -80,6 +96,8 @@ def test_client_factory_defaults_retry_config_when_no_app_config(monkeypatch):
     retry_cfg = cloudwatch_client["config"].retries
     assert retry_cfg["mode"] == "standard"
     assert retry_cfg["max_attempts"] == 5
+    # 8 bucket workers x 4 prefix workers.
+    assert cloudwatch_client["config"].max_pool_connections == 32
 
 
 def test_client_factory_uses_config_region_when_region_arg_missing(monkeypatch):
@@ -124,3 +142,22 @@ def test_client_factory_prefers_explicit_region_over_config_region(monkeypatch):
     AWSClientFactory(profile=None, region="us-east-2", config=app_config)
     session_spy = captured["session"]
     assert session_spy.kwargs["region_name"] == "us-east-2"
+
+
+def test_client_factory_pools_s3_clients_per_region(monkeypatch):
+    created = []
+
+    class RegionalSessionSpy(SessionSpy):
+        def client(self, service_name, config=None, region_name=None):
+            created.append((service_name, region_name))
+            return {"service": service_name, "region": region_name}
+
+    monkeypatch.setattr("aws_storage_optimizer.aws_clients.boto3.Session", RegionalSessionSpy)
+
+    factory = AWSClientFactory(profile=None, region="us-west-2")
+
+    eu_client = factory.s3("eu-west-1")
+    assert factory.s3("eu-west-1") is eu_client
+    assert factory.s3("ap-south-1")["region"] == "ap-south-1"
+    assert factory.s3() is factory.s3()
+    assert created == [("s3", "eu-west-1"), ("s3", "ap-south-1"), ("s3", None)]
@@ -33,7 +33,7 @@ def test_analyze_json_output_for_s3(monkeypatch):
     monkeypatch.setattr(
         cli_module,
         "analyze_s3",
-        lambda s3_client, config, top_n: [
+        lambda s3_client, config, top_n, **_kwargs: [
             Finding(
                 service="s3",
                 resource_id="example-bucket",
@@ -46,6 +46,8 @@ def test_analyze_json_output_for_s3(monkeypatch):
         ],
     )
     monkeypatch.setattr(cli_module, "analyze_ebs", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_ebs_snapshots", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_attached_ebs", lambda ec2_client, **_kwargs: [])
     monkeypatch.setattr(
         cli_module,
         "analyze_rds",
@@ -73,7 +75,7 @@ def test_analyse_is_alias_for_analyze(monkeypatch):
     monkeypatch.setattr(
         cli_module,
         "analyze_s3",
-        lambda s3_client, config, top_n: [
+        lambda s3_client, config, top_n, **_kwargs: [
             Finding(
                 service="s3",
                 resource_id="example-bucket",
@@ -86,6 +88,8 @@ def test_analyse_is_alias_for_analyze(monkeypatch):
         ],
     )
     monkeypatch.setattr(cli_module, "analyze_ebs", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_ebs_snapshots", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_attached_ebs", lambda ec2_client, **_kwargs: [])
     monkeypatch.setattr(
         cli_module,
         "analyze_rds",
@@ -114,8 +118,10 @@ def test_analyze_uses_aso_region_env_var(monkeypatch):
         return DummyFactory()
 
     monkeypatch.setattr(cli_module, "AWSClientFactory", fake_factory)
-    monkeypatch.setattr(cli_module, "analyze_s3", lambda s3_client, config, top_n: [])
+    monkeypatch.setattr(cli_module, "analyze_s3", lambda s3_client, config, top_n, **_kwargs: [])
     monkeypatch.setattr(cli_module, "analyze_ebs", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_ebs_snapshots", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_attached_ebs", lambda ec2_client, **_kwargs: [])
     monkeypatch.setattr(
         cli_module,
         "analyze_rds",
@@ -142,8 +148,10 @@ def test_analyze_cli_region_flag_overrides_aso_region_env_var(monkeypatch):
         return DummyFactory()
 
     monkeypatch.setattr(cli_module, "AWSClientFactory", fake_factory)
-    monkeypatch.setattr(cli_module, "analyze_s3", lambda s3_client, config, top_n: [])
+    monkeypatch.setattr(cli_module, "analyze_s3", lambda s3_client, config, top_n, **_kwargs: [])
     monkeypatch.setattr(cli_module, "analyze_ebs", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_ebs_snapshots", lambda ec2_client, config, region: [])
+    monkeypatch.setattr(cli_module, "analyze_attached_ebs", lambda ec2_client, **_kwargs: [])
     monkeypatch.setattr(
         cli_module,
         "analyze_rds",
@@ -158,3 +166,60 @@ def test_analyze_cli_region_flag_overrides_aso_region_env_var(monkeypatch):
 
     assert result.exit_code == 0
     assert captured["region"] == "us-west-2"
+
+
+def test_analyze_reports_s3_list_request_budget_usage(monkeypatch):
+    def fake_analyze_s3(s3_client, config, top_n, usage=None, **_kwargs):
+        usage.list_requests = 42
+        usage.list_request_budget = config.s3_scan.max_list_requests
+        return []
+
+    monkeypatch.setattr(
+        cli_module,
+        "AWSClientFactory",
+        lambda profile, region, config=None: DummyFactory(),
+    )
+    monkeypatch.setattr(cli_module, "analyze_s3", fake_analyze_s3)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_module.cli,
+        ["analyze", "--services", "s3", "--output-format", "json", "--s3-max-list-requests", "100"],
+    )
+
+    assert result.exit_code == 0
+    assert "S3 list requests used: 42/100" in result.stderr
+
+
+def test_analyze_rejects_duplicate_detection_with_resume(monkeypatch):
+    monkeypatch.setattr(cli_module, "AWSClientFactory", lambda profile, region, config=None: DummyFactory())
+
+    runner = CliRunner()
+    result = runner.invoke(cli_module.cli, ["analyze", "--services", "s3", "--find-s3-duplicates", "--resume"])
+
+    assert result.exit_code == 2
+    assert "cannot be combined with --resume" in result.output
+
+
+def test_analyze_checkpoints_s3_listing_to_default_path_unless_disabled(monkeypatch):
+    checkpoints = []
+
+    def fake_analyze_s3(s3_client, config, top_n, checkpoint=None, **_kwargs):
+        checkpoints.append(checkpoint)
+        return []
+
+    monkeypatch.setattr(cli_module, "AWSClientFactory", lambda profile, region, config=None: DummyFactory())
+    monkeypatch.setattr(cli_module, "analyze_s3", fake_analyze_s3)
+
+    runner = CliRunner()
+    default_result = runner.invoke(cli_module.cli, ["analyze", "--services", "s3", "--output-format", "json"])
+    disabled_result = runner.invoke(
+        cli_module.cli, ["analyze", "--services", "s3", "--output-format", "json", "--no-s3-checkpoint"]
+    )
+    conflict_result = runner.invoke(cli_module.cli, ["analyze", "--services", "s3", "--no-s3-checkpoint", "--resume"])
+
+    assert default_result.exit_code == 0
+    assert disabled_result.exit_code == 0
+    assert str(checkpoints[0].path) == cli_module.DEFAULT_CHECKPOINT_PATH
+    assert checkpoints[1] is None
+    assert conflict_result.exit_code == 2
@@ -197,6 +197,41 @@ def test_execute_delete_s3_object_requires_bucket_and_key(monkeypatch):
     assert "--bucket and --key are required" in result.output
 
 
+def test_execute_delete_s3_object_takes_bucket_and_key_from_finding_resource_id(monkeypatch, tmp_path):
+    deleted = []
+
+    class RecordingS3Client(FailingS3Client):
+        @staticmethod
+        def delete_object(**kwargs):
+            deleted.append(kwargs)
+
+    class RecordingFactory(FailingS3Factory):
+        @staticmethod
+        def s3():
+            return RecordingS3Client()
+
+    monkeypatch.setattr(cli_module, "AWSClientFactory", lambda profile, region, config=None: RecordingFactory())
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_module.cli,
+        [
+            "execute",
+            "--action-type",
+            "delete-s3-object",
+            "--resource-id",
+            "example-bucket/path/to/file.txt",
+            "--no-dry-run",
+            "--yes",
+            "--log-path",
+            str(tmp_path / "action-results.jsonl"),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert deleted == [{"Bucket": "example-bucket", "Key": "path/to/file.txt"}]
+
+
 def test_execute_dry_run_writes_action_log(monkeypatch, tmp_path):
     monkeypatch.setattr(cli_module, "AWSClientFactory", lambda profile, region, config=None: DummyFactory())
 
@@ -0,0 +1,77 @@
+import csv
+import gzip
+import json
+
+from click.testing import CliRunner
+
+import aws_storage_optimizer.cli as cli_module
+
+
+def test_simulate_lifecycle_reports_projected_costs_from_inventory(tmp_path):
+    inventory = tmp_path / "inventory"
+    inventory.mkdir()
+    with gzip.open(inventory / "part-0.csv.gz", "wt", encoding="utf-8", newline="") as data_file:
+        csv.writer(data_file).writerows(
+            [
+                ["bucket", "logs%2Fold.gz", str(1024**3), "2020-01-01T00:00:00.000Z", "STANDARD"],
+                ["bucket", "data%2Fkeep.bin", str(1024**3), "2020-01-01T00:00:00.000Z", "STANDARD"],
+            ]
+        )
+    (inventory / "manifest.json").write_text(
+        json.dumps(
+            {
+                "sourceBucket": "bucket",
+                "fileFormat": "CSV",
+                "fileSchema": "Bucket, Key, Size, LastModifiedDate, StorageClass",
+                "files": [{"key": "part-0.csv.gz"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    lifecycle = tmp_path / "lifecycle.json"
+    lifecycle.write_text(
+        json.dumps(
+            {
+                "Rules": [
+                    {
+                        "ID": "archive-logs",
+                        "Status": "Enabled",
+                        "Filter": {"Prefix": "logs/"},
+                        "Transitions": [{"Days": 30, "StorageClass": "DEEP_ARCHIVE"}],
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_module.cli,
+        [
+            "simulate-lifecycle",
+            "--lifecycle",
+            str(lifecycle),
+            "--s3-inventory",
+            str(inventory),
+            "--output-format",
+            "json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert payload["transition_requests"] == {"DEEP_ARCHIVE": 1}
+    assert payload["projected"]["STANDARD"]["size_gib"] == 1.0
+    assert payload["projected"]["DEEP_ARCHIVE"]["size_gib"] == 1.0
+    assert payload["monthly_savings_usd"] == round(0.023 - 0.00099, 2)
+
+
+def test_simulate_lifecycle_requires_an_object_source(tmp_path):
+    lifecycle = tmp_path / "lifecycle.json"
+    lifecycle.write_text(json.dumps({"Rules": []}), encoding="utf-8")
+
+    result = CliRunner().invoke(cli_module.cli, ["simulate-lifecycle", "--lifecycle", str(lifecycle)])
+
+    assert result.exit_code == 2
+    assert "--s3-inventory or --bucket" in result.output
@@ -32,3 +32,13 @@ def test_load_config_region_defaults_to_us_west_2(monkeypatch):
     config = load_config()
 
     assert config.region == "us-west-2"
+
+
+def test_load_config_reads_s3_concurrency(monkeypatch):
+    monkeypatch.setenv("ASO_S3_CONCURRENCY", "32")
+    monkeypatch.setenv("ASO_S3_PREFIX_CONCURRENCY", "6")
+
+    config = load_config()
+
+    assert config.s3_scan.concurrency == 32
+    assert config.s3_scan.prefix_concurrency == 6
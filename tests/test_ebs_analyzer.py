@@ -0,0 +1,55 @@
+from botocore.exceptions import ClientError
+
+from aws_storage_optimizer.analyzers.ebs import analyze_ebs
+from aws_storage_optimizer.config import load_config
+
+
+class PagedEC2Client:
+    def __init__(self, volume_count: int, page_size: int = 500, fail_after: int | None = None):
+        self.volumes = [
+            {
+                "VolumeId": f"vol-{index:05d}",
+                "Size": 10,
+                "VolumeType": "gp2",
+                "Tags": [{"Key": "DoNotTouch", "Value": "TRUE"}] if index % 10 == 0 else [],
+            }
+            for index in range(volume_count)
+        ]
+        self.page_size = page_size
+        self.fail_after = fail_after
+        self.calls: list[dict] = []
+
+    def describe_volumes(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.fail_after is not None and len(self.calls) > self.fail_after:
+            raise ClientError(
+                error_response={"Error": {"Code": "RequestLimitExceeded", "Message": "Slow down"}},
+                operation_name="DescribeVolumes",
+            )
+        start = int(kwargs.get("NextToken", 0))
+        end = min(start + min(kwargs["MaxResults"], self.page_size), len(self.volumes))
+        page = {"Volumes": self.volumes[start:end]}
+        if end < len(self.volumes):
+            page["NextToken"] = str(end)
+        return page
+
+
+def test_analyze_ebs_follows_next_token_across_pages():
+    client = PagedEC2Client(1234)
+
+    findings = analyze_ebs(client, config=load_config(), region="us-east-1")
+
+    assert len(client.calls) == 3
+    assert all(call["MaxResults"] == 500 for call in client.calls)
+    assert client.calls[0]["Filters"] == [{"Name": "status", "Values": ["available"]}]
+    assert [call.get("NextToken") for call in client.calls] == [None, "500", "1000"]
+    assert len(findings) == 1234 - 124
+    assert findings[-1].resource_id == "vol-01233"
+
+
+def test_analyze_ebs_keeps_volumes_from_pages_before_an_error():
+    client = PagedEC2Client(1200, fail_after=1)
+
+    findings = analyze_ebs(client, config=load_config(), region=None)
+
+    assert len(findings) == 450
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+
+from aws_storage_optimizer.analyzers.ebs_attached import analyze_attached_ebs
+from aws_storage_optimizer.config import load_config
+
+
+class AttachedEC2Client:
+    def __init__(self, volumes: list[dict]):
+        self.volumes = volumes
+        self.calls: list[dict] = []
+
+    def describe_volumes(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"Volumes": self.volumes}
+
+
+class VolumeIOCloudWatchClient:
+    def __init__(self, peaks: dict[str, tuple[float, float] | None]):
+        # volume id -> (peak IOPS, peak MiB/s), or None for a volume without data points
+        self.peaks = peaks
+        self.requests: list[list[dict]] = []
+
+    def get_metric_data(self, **kwargs):
+        queries = kwargs["MetricDataQueries"]
+        self.requests.append(queries)
+        volume_ids = {
+            query["Id"][1:]: query["MetricStat"]["Metric"]["Dimensions"][0]["Value"]
+            for query in queries
+            if query["Id"].startswith("r") and not query["Id"].startswith("rb")
+        }
+        results = []
+        for query in queries:
+            if not query["ReturnData"]:
+                continue
+            is_iops = query["Id"].startswith("iops")
+            index = query["Id"].removeprefix("iops" if is_iops else "mibps")
+            peaks = self.peaks.get(volume_ids[index], (0.2, 0.01))
+            if peaks is None:
+                continue
+            peak_iops, peak_mibps = peaks
+            peak = peak_iops if is_iops else peak_mibps
+            results.append({"Id": query["Id"], "Values": [peak / 2, peak]})
+        return {"MetricDataResults": results}
+
+
+def _volume(volume_id: str, volume_type: str, size: int, iops: int = 0, tags: list | None = None, **extra) -> dict:
+    return {
+        **extra,
+        "VolumeId": volume_id,
+        "VolumeType": volume_type,
+        "Size": size,
+        "Iops": iops,
+        "Tags": tags or [],
+        "Attachments": [{"InstanceId": "i-0123"}],
+    }
+
+
+def test_analyze_attached_ebs_sizes_gp3_from_baseline_and_peaks():
+    ec2_client = AttachedEC2Client(
+        [
+            _volume("vol-quiet", "gp2", 100),
+            _volume("vol-busy", "io1", 200, iops=10000),
+            _volume("vol-too-busy", "gp2", 50),
+            _volume("vol-kept", "gp2", 100, tags=[{"Key": "DoNotTouch", "Value": "true"}]),
+        ]
+    )
+    cloudwatch_client = VolumeIOCloudWatchClient(
+        {"vol-quiet": (200.0, 10.0), "vol-busy": (12000.0, 100.0), "vol-too-busy": (20000.0, 10.0)}
+    )
+
+    findings = analyze_attached_ebs(ec2_client, cloudwatch_client, config=load_config(), region="us-east-1")
+
+    assert ec2_client.calls[0]["Filters"] == [{"Name": "status", "Values": ["in-use"]}]
+    by_id = {finding.resource_id: finding for finding in findings}
+    assert set(by_id) == {"vol-quiet", "vol-busy"}
+    quiet = by_id["vol-quiet"]
+    # gp2 delivers 128 MiB/s at this size, 3 MiB/s above the free gp3 throughput.
+    assert quiet.estimated_monthly_savings_usd == 1.88
+    assert (quiet.details["gp3_iops"], quiet.details["gp3_throughput_mibps"]) == (3000, 128)
+    assert quiet.details["peak_covered_by_baseline"] is True
+    busy = by_id["vol-busy"]
+    assert busy.details["gp3_iops"] == 12000
+    assert busy.details["gp3_throughput_mibps"] == 1000
+    assert busy.details["peak_covered_by_baseline"] is False
+    assert busy.estimated_monthly_savings_usd == 579.0
+
+
+def test_analyze_attached_ebs_fits_each_chunk_in_one_metric_request():
+    ec2_client = AttachedEC2Client([_volume(f"vol-{index:03d}", "gp2", 100) for index in range(200)])
+    cloudwatch_client = VolumeIOCloudWatchClient({})
+
+    findings = analyze_attached_ebs(ec2_client, cloudwatch_client, config=load_config(), region=None)
+
+    assert [len(queries) for queries in cloudwatch_client.requests] == [498, 498, 204]
+    assert len(findings) == 200
+
+
+def test_analyze_attached_ebs_reports_idle_volumes_observed_for_the_whole_window():
+    now = datetime.now(timezone.utc)
+    ec2_client = AttachedEC2Client(
+        [
+            _volume("vol-idle", "st1", 1000, CreateTime=now - timedelta(days=90)),
+            _volume("vol-new", "gp3", 100, CreateTime=now - timedelta(days=2)),
+            _volume("vol-no-data", "gp3", 100),
+            _volume("vol-active", "gp3", 100),
+        ]
+    )
+    cloudwatch_client = VolumeIOCloudWatchClient({"vol-no-data": None, "vol-active": (50.0, 1.0)})
+
+    findings = analyze_attached_ebs(ec2_client, cloudwatch_client, config=load_config(), region=None)
+
+    assert [finding.resource_id for finding in findings] == ["vol-idle"]
+    assert findings[0].details["finding_type"] == "idle-attached-volume"
+    assert findings[0].details["mean_iops"] == 0.15
+    assert findings[0].estimated_monthly_savings_usd == 45.0
+
+
+def test_analyze_attached_ebs_migrates_small_volumes_at_the_gp3_baseline():
+    # 500 IOPS per GiB caps a 4 GiB volume at 2000 IOPS, below the 3000 every gp3 volume gets.
+    ec2_client = AttachedEC2Client([_volume("vol-small", "io1", 4, iops=200)])
+    cloudwatch_client = VolumeIOCloudWatchClient({"vol-small": (50.0, 1.0)})
+
+    findings = analyze_attached_ebs(ec2_client, cloudwatch_client, config=load_config(), region=None)
+
+    assert [finding.resource_id for finding in findings] == ["vol-small"]
+    assert findings[0].details["gp3_iops"] == 3000
+    assert findings[0].details["current_monthly_cost_usd"] == 13.5
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+from aws_storage_optimizer.analyzers.ebs_snapshots import analyze_ebs_snapshots
+from aws_storage_optimizer.config import load_config
+
+
+def _page(items: list[dict], key: str, kwargs: dict) -> dict:
+    start = int(kwargs.get("NextToken", 0))
+    end = min(start + kwargs["MaxResults"], len(items))
+    page = {key: items[start:end]}
+    if end < len(items):
+        page["NextToken"] = str(end)
+    return page
+
+
+class SnapshotEC2Client:
+    def __init__(self, snapshot_count: int, fail_images: bool = False):
+        started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # Every third snapshot's volume still exists, every fifth backs an AMI.
+        self.snapshots = [
+            {
+                "SnapshotId": f"snap-{index:06d}",
+                "VolumeId": f"vol-{index:06d}",
+                "VolumeSize": 8,
+                "State": "completed",
+                "StartTime": started,
+            }
+            for index in range(snapshot_count)
+        ]
+        self.volumes = [{"VolumeId": f"vol-{index:06d}"} for index in range(0, snapshot_count, 3)]
+        self.images = [
+            {
+                "ImageId": f"ami-{index:06d}",
+                "BlockDeviceMappings": [{"DeviceName": "/dev/xvda", "Ebs": {"SnapshotId": f"snap-{index:06d}"}}],
+            }
+            for index in range(0, snapshot_count, 5)
+        ]
+        self.fail_images = fail_images
+        self.calls: list[str] = []
+
+    def describe_volumes(self, **kwargs):
+        self.calls.append("describe_volumes")
+        return _page(self.volumes, "Volumes", kwargs)
+
+    def describe_images(self, **kwargs):
+        self.calls.append("describe_images")
+        assert kwargs["Owners"] == ["self"]
+        if self.fail_images:
+            raise ClientError(
+                error_response={"Error": {"Code": "UnauthorizedOperation", "Message": "Denied"}},
+                operation_name="DescribeImages",
+            )
+        return _page(self.images, "Images", kwargs)
+
+    def describe_snapshots(self, **kwargs):
+        self.calls.append("describe_snapshots")
+        assert kwargs["OwnerIds"] == ["self"]
+        return _page(self.snapshots, "Snapshots", kwargs)
+
+
+def test_analyze_ebs_snapshots_reports_snapshots_without_volume_or_ami():
+    client = SnapshotEC2Client(30_000)
+    client.snapshots[1]["Tags"] = [{"Key": "DoNotTouch", "Value": "true"}]
+    client.snapshots[2]["StorageTier"] = "archive"
+
+    findings = analyze_ebs_snapshots(client, config=load_config(), region="us-east-1")
+
+    orphaned = [index for index in range(30_000) if index % 3 and index % 5 and index != 1]
+    assert [finding.resource_id for finding in findings] == [f"snap-{index:06d}" for index in orphaned]
+    assert findings[0].details["source_volume_id"] == "vol-000002"
+    assert findings[0].estimated_monthly_savings_usd == round(8 * 0.0125, 2)
+    assert findings[1].estimated_monthly_savings_usd == round(8 * 0.05, 2)
+    assert client.calls.count("describe_snapshots") == 30
+
+
+def test_analyze_ebs_snapshots_reports_nothing_without_a_complete_ami_index():
+    client = SnapshotEC2Client(10, fail_images=True)
+
+    assert analyze_ebs_snapshots(client, config=load_config(), region=None) == []
+    assert "describe_snapshots" not in client.calls
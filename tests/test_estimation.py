@@ -0,0 +1,43 @@
+from aws_storage_optimizer.config import load_config
+from aws_storage_optimizer.estimation import S3StaleObjects, estimate_s3_monthly_savings, estimate_s3_transition
+
+
+def test_estimate_s3_monthly_savings_uses_flat_ratio_without_breakdown():
+    config = load_config()
+
+    assert estimate_s3_monthly_savings(size_gib=1000, config=config) == 6.9
+
+
+def test_estimate_s3_monthly_savings_prices_stale_bytes_by_storage_class():
+    config = load_config()
+
+    savings = estimate_s3_monthly_savings(
+        size_gib=5000,
+        config=config,
+        stale_objects={
+            "STANDARD": S3StaleObjects(gib=1000, objects=1000),
+            "REDUCED_REDUNDANCY": S3StaleObjects(gib=100, objects=100),
+            "GLACIER": S3StaleObjects(gib=3000, objects=3000),
+            "UNKNOWN": S3StaleObjects(gib=50, objects=50),
+        },
+    )
+
+    transitions = 1100 / 1000 * 0.01 / 12
+    assert savings == round(1000 * (0.023 - 0.0125) + 100 * (0.024 - 0.0125) - transitions, 2)
+
+
+def test_estimate_s3_transition_charges_small_object_minimums_and_archive_overhead():
+    config = load_config()
+    # Ten million 16 KiB objects: about 153 GiB, billed as 1.2 TiB in Standard-IA.
+    small = {"STANDARD": S3StaleObjects(gib=152.6, objects=10**7, small_gib=152.6, small_objects=10**7)}
+
+    standard_ia = estimate_s3_transition(small, "STANDARD_IA", config)
+    glacier = estimate_s3_transition(small, "GLACIER", config)
+
+    assert standard_ia.gross_monthly_savings_usd > 0
+    assert round(standard_ia.overhead_monthly_usd, 2) == round((10**7 * 128 / 1024**2 - 152.6) * 0.0125, 2)
+    assert standard_ia.transition_cost_usd == 100.0
+    assert standard_ia.net_monthly_savings_usd < 0
+    assert round(glacier.overhead_monthly_usd, 2) == round(10**7 * (32 * 0.0036 + 8 * 0.023) / 1024**2, 2)
+    assert glacier.net_monthly_savings_usd < 0
+    assert estimate_s3_monthly_savings(size_gib=152.6, config=config, stale_objects=small) == 0.0
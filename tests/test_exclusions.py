@@ -38,7 +38,7 @@ class ProtectedEC2Client:
 
 class ProtectedS3Client:
     @staticmethod
-    def list_buckets():
+    def list_buckets(**_kwargs):
         return {"Buckets": [{"Name": "protected-bucket"}]}
 
     @staticmethod
@@ -72,6 +72,18 @@ class ProtectedRDSClient:
             ]
         }
 
+    @staticmethod
+    def describe_db_clusters(**_kwargs):
+        return {
+            "DBClusters": [
+                {
+                    "DBClusterIdentifier": "cluster-protected",
+                    "DBClusterArn": "arn:aws:rds:us-east-1:123456789012:cluster:cluster-protected",
+                    "DBClusterMembers": [{"DBInstanceIdentifier": "db-protected"}],
+                }
+            ]
+        }
+
     @staticmethod
     def list_tags_for_resource(**_kwargs):
         return {"TagList": [{"Key": "DoNotTouch", "Value": "true"}]}
@@ -83,8 +95,8 @@ class ProtectedRDSClient:
 
 class DummyCloudWatchClient:
     @staticmethod
-    def get_metric_statistics(**_kwargs):
-        return {"Datapoints": [{"Average": 5.0}]}
+    def get_metric_data(**kwargs):
+        return {"MetricDataResults": [{"Id": query["Id"], "Values": [5.0]} for query in kwargs["MetricDataQueries"]]}
 
 
 def test_analyze_ebs_skips_protected_resources():
@@ -107,6 +119,54 @@ def test_analyze_rds_skips_protected_instances():
     assert not findings
 
 
+def test_analyze_rds_skips_untagged_clusters_with_a_protected_member():
+    class MixedClusterRDSClient(ProtectedRDSClient):
+        @staticmethod
+        def describe_db_instances(**_kwargs):
+            return {
+                "DBInstances": [
+                    {"DBInstanceIdentifier": "db-writer", "DBInstanceClass": "db.r6g.large", "TagList": []},
+                    {
+                        "DBInstanceIdentifier": "db-reader",
+                        "DBInstanceClass": "db.r6g.large",
+                        "TagList": [{"Key": "DoNotTouch", "Value": "true"}],
+                    },
+                ]
+            }
+
+        @staticmethod
+        def describe_db_clusters(**_kwargs):
+            return {
+                "DBClusters": [
+                    {
+                        "DBClusterIdentifier": "cluster-open",
+                        "TagList": [],
+                        "DBClusterMembers": [
+                            {"DBInstanceIdentifier": "db-writer"},
+                            {"DBInstanceIdentifier": "db-reader"},
+                        ],
+                    }
+                ]
+            }
+
+    class NoConnectionsCloudWatchClient:
+        @staticmethod
+        def get_metric_data(**kwargs):
+            return {
+                "MetricDataResults": [{"Id": query["Id"], "Values": [0.0]} for query in kwargs["MetricDataQueries"]]
+            }
+
+    findings = analyze_rds(
+        rds_client=MixedClusterRDSClient(),
+        cloudwatch_client=NoConnectionsCloudWatchClient(),
+        config=load_config(),
+        region="us-east-1",
+    )
+
+    assert "cluster-open" not in {finding.resource_id for finding in findings}
+    assert "db-reader" not in {finding.resource_id for finding in findings}
+
+
 def test_execute_action_skips_protected_ebs_resource():
     result = execute_action(
         action_type="delete-ebs-volume",
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import ClientError
+
+from aws_storage_optimizer.metrics import get_metric_data_batched, metric_stat_query
+
+
+class PagingCloudWatchClient:
+    def __init__(self, fail_on_call: int | None = None):
+        self.requests: list[dict] = []
+        self.fail_on_call = fail_on_call
+
+    def get_metric_data(self, **kwargs):
+        self.requests.append(kwargs)
+        if self.fail_on_call == len(self.requests):
+            raise ClientError(
+                error_response={"Error": {"Code": "Throttling", "Message": "Rate exceeded"}},
+                operation_name="GetMetricData",
+            )
+        queries = kwargs["MetricDataQueries"]
+        if "NextToken" not in kwargs:
+            return {
+                "MetricDataResults": [{"Id": query["Id"], "Values": [1.0]} for query in queries],
+                "NextToken": "page-2",
+            }
+        return {"MetricDataResults": [{"Id": query["Id"], "Values": [2.0]} for query in queries]}
+
+
+def _queries(count: int) -> list[dict]:
+    return [
+        metric_stat_query(
+            f"q{index}",
+            namespace="AWS/RDS",
+            metric_name="CPUUtilization",
+            dimensions={"DBInstanceIdentifier": f"db-{index}"},
+            period=3600,
+            stat="Average",
+        )
+        for index in range(count)
+    ]
+
+
+def test_get_metric_data_batched_splits_at_500_and_follows_next_token():
+    client = PagingCloudWatchClient()
+    end_time = datetime.now(timezone.utc)
+
+    series = get_metric_data_batched(client, _queries(1201), end_time - timedelta(days=1), end_time)
+
+    assert [len(request["MetricDataQueries"]) for request in client.requests] == [500, 500, 500, 500, 201, 201]
+    assert len(series) == 1201
+    assert series["q0"] == [1.0, 2.0]
+    assert series["q1200"] == [1.0, 2.0]
+
+
+def test_get_metric_data_batched_skips_failed_batches():
+    client = PagingCloudWatchClient(fail_on_call=1)
+    end_time = datetime.now(timezone.utc)
+
+    series = get_metric_data_batched(client, _queries(600), end_time - timedelta(days=1), end_time)
+
+    assert "q0" not in series
+    assert series["q599"] == [1.0, 2.0]
+
+
+def test_get_metric_data_batched_drops_batches_that_fail_after_the_first_page():
+    client = PagingCloudWatchClient(fail_on_call=2)
+    end_time = datetime.now(timezone.utc)
+
+    series = get_metric_data_batched(client, _queries(600), end_time - timedelta(days=1), end_time)
+
+    assert "q0" not in series
+    assert "q499" not in series
+    assert series["q500"] == [1.0, 2.0]
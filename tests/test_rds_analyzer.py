@@ -0,0 +1,220 @@
+from aws_storage_optimizer.analyzers.rds import analyze_rds
+from aws_storage_optimizer.config import load_config
+
+
+class FleetRDSClient:
+    def __init__(self, instance_count: int, instance_class: str = "db.m5.xlarge"):
+        self.instances = [
+            {
+                "DBInstanceIdentifier": f"db-{index:03d}",
+                "DBInstanceArn": f"arn:aws:rds:us-east-1:123456789012:db:db-{index:03d}",
+                "DBInstanceClass": instance_class,
+                "TagList": [{"Key": "DoNotTouch", "Value": "true"}] if index == 3 else [],
+            }
+            for index in range(instance_count)
+        ]
+        self.calls: list[dict] = []
+        self.tag_calls: list[str] = []
+
+    def describe_db_instances(self, **kwargs):
+        self.calls.append(kwargs)
+        start = int(kwargs.get("Marker", 0))
+        end = min(start + kwargs["MaxRecords"], len(self.instances))
+        page = {"DBInstances": self.instances[start:end]}
+        if end < len(self.instances):
+            page["Marker"] = str(end)
+        return page
+
+    @staticmethod
+    def describe_db_clusters(**_kwargs):
+        return {"DBClusters": []}
+
+    def list_tags_for_resource(self, **kwargs):
+        self.tag_calls.append(kwargs["ResourceName"])
+        return {"TagList": [{"Key": "DoNotTouch", "Value": "true"}]}
+
+
+class BatchingCloudWatchClient:
+    def __init__(self):
+        self.requests: list[dict] = []
+
+    def get_metric_data(self, **kwargs):
+        self.requests.append(kwargs)
+        results = []
+        for query in kwargs["MetricDataQueries"]:
+            db_identifier = query["MetricStat"]["Metric"]["Dimensions"][0]["Value"]
+            if db_identifier == "db-000":
+                continue
+            if query["Id"].startswith("cpu"):
+                # Odd instances idle at 4% CPU, even ones busy at 60%.
+                cpu = 4.0 if int(db_identifier[-3:]) % 2 else 60.0
+                values = [cpu - 1.0, cpu + 1.0]
+            elif query["Id"].startswith(("mem", "free")):
+                values = [14 * 1024**3, 12 * 1024**3]
+            else:
+                values = [12.0, 40.0]
+            results.append({"Id": query["Id"], "Values": values})
+        return {"MetricDataResults": results}
+
+
+def test_analyze_rds_fetches_cpu_for_the_fleet_in_batched_requests():
+    cloudwatch_client = BatchingCloudWatchClient()
+
+    findings = analyze_rds(FleetRDSClient(801), cloudwatch_client, config=load_config(), region="us-east-1")
+
+    assert [len(request["MetricDataQueries"]) for request in cloudwatch_client.requests] == [500] * 6 + [200]
+    assert cloudwatch_client.requests[0]["MetricDataQueries"][0]["MetricStat"]["Stat"] == "Average"
+    assert len(findings) == 399
+    assert findings[0].resource_id == "db-001"
+    assert findings[0].details["avg_cpu_pct"] == 4.0
+    assert findings[0].details["min_freeable_memory_mib"] == 12 * 1024
+    assert findings[0].details["target_class"] == "db.m6g.large"
+    assert findings[0].estimated_monthly_savings_usd == 138.7
+    assert findings[0].details["max_connections"] == 40.0
+
+
+def test_analyze_rds_pages_with_marker_and_reads_inline_tags():
+    rds_client = FleetRDSClient(250)
+    del rds_client.instances[5]["TagList"]
+
+    findings = analyze_rds(rds_client, BatchingCloudWatchClient(), config=load_config(), region=None)
+
+    assert [call.get("Marker") for call in rds_client.calls] == [None, "100", "200"]
+    assert rds_client.tag_calls == ["arn:aws:rds:us-east-1:123456789012:db:db-005"]
+    resource_ids = {finding.resource_id for finding in findings}
+    assert "db-249" in resource_ids
+    assert not {"db-003", "db-005"} & resource_ids
+
+
+class BurstyCloudWatchClient:
+    @staticmethod
+    def get_metric_data(**kwargs):
+        # Mostly idle at 2% CPU with 6% of the points at 95%.
+        cpu = [2.0] * 94 + [95.0] * 6
+        return {
+            "MetricDataResults": [
+                {"Id": query["Id"], "Values": cpu if query["Id"].startswith("cpu") else []}
+                for query in kwargs["MetricDataQueries"]
+            ]
+        }
+
+
+def test_analyze_rds_can_key_the_cpu_threshold_off_p95():
+    config = load_config()
+
+    # A class outside the right-sizing catalog falls back to the flat downsize estimate.
+    rds_client = FleetRDSClient(1, instance_class="db.x2g.large")
+
+    mean_findings = analyze_rds(rds_client, BurstyCloudWatchClient(), config=config, region=None)
+    config.thresholds.rds_cpu_statistic = "p95"
+    p95_findings = analyze_rds(rds_client, BurstyCloudWatchClient(), config=config, region=None)
+
+    assert mean_findings[0].details["avg_cpu_pct"] == 7.58
+    assert mean_findings[0].details["p50_cpu_pct"] == 2.0
+    assert mean_findings[0].details["p99_cpu_pct"] == 95.0
+    assert mean_findings[0].details["min_freeable_memory_mib"] is None
+    assert "target_class" not in mean_findings[0].details
+    assert not p95_findings
+
+
+class AuroraRDSClient:
+    instances = [
+        {"DBInstanceIdentifier": "idle-writer", "DBInstanceClass": "db.r6g.large", "Engine": "aurora-postgresql"},
+        {"DBInstanceIdentifier": "idle-reader", "DBInstanceClass": "db.r6g.large", "Engine": "aurora-postgresql"},
+        {"DBInstanceIdentifier": "busy-writer", "DBInstanceClass": "db.r6g.large", "Engine": "aurora-mysql"},
+        {
+            "DBInstanceIdentifier": "oversized",
+            "DBInstanceClass": "db.m5.large",
+            "Engine": "postgres",
+            "AllocatedStorage": 1000,
+            "StorageType": "gp3",
+            "MultiAZ": True,
+        },
+    ]
+    clusters = [
+        {
+            "DBClusterIdentifier": "idle-cluster",
+            "Engine": "aurora-postgresql",
+            "DBClusterMembers": [{"DBInstanceIdentifier": "idle-writer"}, {"DBInstanceIdentifier": "idle-reader"}],
+        },
+        {
+            "DBClusterIdentifier": "busy-cluster",
+            "Engine": "aurora-mysql",
+            "DBClusterMembers": [{"DBInstanceIdentifier": "busy-writer"}],
+        },
+    ]
+
+    def describe_db_instances(self, **_kwargs):
+        return {"DBInstances": self.instances}
+
+    def describe_db_clusters(self, **_kwargs):
+        return {"DBClusters": self.clusters}
+
+
+class AuroraCloudWatchClient:
+    def __init__(self):
+        self.requests: list[dict] = []
+
+    def get_metric_data(self, **kwargs):
+        self.requests.append(kwargs)
+        values = {
+            "cpu": [60.0],
+            "mem": [8.0 * 1024**3],
+            "free": [900.0 * 1024**3],
+            "vol": [50.0 * 1024**3, 100.0 * 1024**3],
+        }
+        results = []
+        for query in kwargs["MetricDataQueries"]:
+            identifier = query["MetricStat"]["Metric"]["Dimensions"][0]["Value"]
+            prefix = query["Id"].rstrip("0123456789")
+            if prefix == "conn":
+                results.append({"Id": query["Id"], "Values": [0.0] if identifier.startswith("idle") else [8.0]})
+            else:
+                results.append({"Id": query["Id"], "Values": values[prefix]})
+        return {"MetricDataResults": results}
+
+
+def test_analyze_rds_reports_idle_aurora_clusters_and_oversized_storage_in_one_request():
+    cloudwatch_client = AuroraCloudWatchClient()
+
+    findings = analyze_rds(AuroraRDSClient(), cloudwatch_client, config=load_config(), region=None)
+
+    assert len(cloudwatch_client.requests) == 1
+    assert len(cloudwatch_client.requests[0]["MetricDataQueries"]) == 4 * 4 + 2
+    by_type = {finding.details.get("finding_type"): finding for finding in findings}
+    assert set(by_type) == {"idle-aurora-cluster", "storage-overprovisioned"}
+    cluster = by_type["idle-aurora-cluster"]
+    assert cluster.resource_id == "idle-cluster"
+    assert cluster.details["member_instances"] == ["idle-writer", "idle-reader"]
+    assert cluster.details["volume_used_gib"] == 100.0
+    assert cluster.estimated_monthly_savings_usd == round(2 * 0.225 * 730 + 100 * 0.10, 2)
+    storage = by_type["storage-overprovisioned"]
+    assert storage.resource_id == "oversized"
+    # 100 GiB used at peak plus 30% headroom, on a Multi-AZ instance.
+    assert storage.details["target_allocated_gib"] == 143
+    assert storage.estimated_monthly_savings_usd == round((1000 - 143) * 0.115 * 2, 2)
+
+
+class MultiAZClusterRDSClient(AuroraRDSClient):
+    instances = AuroraRDSClient.instances + [
+        {"DBInstanceIdentifier": "idle-maz-1", "DBInstanceClass": "db.m6gd.large", "Engine": "postgres"},
+        {"DBInstanceIdentifier": "idle-maz-2", "DBInstanceClass": "db.m6gd.large", "Engine": "postgres"},
+    ]
+    clusters = AuroraRDSClient.clusters + [
+        {
+            "DBClusterIdentifier": "maz-cluster",
+            "Engine": "postgres",
+            "DBClusterMembers": [{"DBInstanceIdentifier": "idle-maz-1"}, {"DBInstanceIdentifier": "idle-maz-2"}],
+        }
+    ]
+
+
+def test_analyze_rds_skips_multi_az_db_clusters():
+    cloudwatch_client = AuroraCloudWatchClient()
+
+    findings = analyze_rds(MultiAZClusterRDSClient(), cloudwatch_client, config=load_config(), region=None)
+
+    # Only the two Aurora clusters get a VolumeBytesUsed query.
+    assert len(cloudwatch_client.requests[0]["MetricDataQueries"]) == 6 * 4 + 2
+    idle_clusters = [f.resource_id for f in findings if f.details.get("finding_type") == "idle-aurora-cluster"]
+    assert idle_clusters == ["idle-cluster"]
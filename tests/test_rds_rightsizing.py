@@ -0,0 +1,57 @@
+import random
+
+from aws_storage_optimizer.analyzers.rds_rightsizing import default_catalog
+
+
+def test_catalog_lookup_matches_a_linear_scan():
+    catalog = default_catalog()
+    classes = list(catalog.by_name.values())
+    generator = random.Random(7)
+
+    for _ in range(500):
+        vcpus = generator.uniform(0, 100)
+        memory_gib = generator.uniform(0, 800)
+        for series in ("t", "m", "r"):
+            for graviton in (False, True):
+                fitting = [
+                    instance_class
+                    for instance_class in classes
+                    if instance_class.series == series
+                    and instance_class.graviton == graviton
+                    and instance_class.vcpus >= vcpus
+                    and instance_class.memory_gib >= memory_gib
+                ]
+                expected = min((instance_class.monthly_usd for instance_class in fitting), default=None)
+                found = catalog.cheapest(vcpus, memory_gib, series, graviton)
+                assert (found.monthly_usd if found else None) == expected
+
+
+def test_right_size_keeps_headroom_and_x86_for_sqlserver():
+    catalog = default_catalog()
+    # 10% of 16 vCPUs at peak and 40 of 128 GiB in use.
+    freeable = 88 * 1024**3
+
+    postgres = catalog.right_size("db.r5.4xlarge", "postgres", peak_cpu_pct=10.0, min_freeable_memory_bytes=freeable)
+    sqlserver = catalog.right_size(
+        "db.r5.4xlarge", "sqlserver-se", peak_cpu_pct=10.0, min_freeable_memory_bytes=freeable
+    )
+
+    assert postgres.target.name == "db.r6g.2xlarge"
+    assert (sqlserver.target.vcpus, sqlserver.target.memory_gib, sqlserver.target.graviton) == (8, 64.0, False)
+    assert round(sqlserver.required_memory_gib, 1) == 57.1
+    assert catalog.right_size("db.t3.micro", "mysql", peak_cpu_pct=1.0, min_freeable_memory_bytes=None).target.name == (
+        "db.t4g.micro"
+    )
+    assert catalog.right_size("db.t4g.micro", "mysql", peak_cpu_pct=1.0, min_freeable_memory_bytes=None) is None
+
+
+def test_right_size_keeps_aurora_on_the_classes_it_offers():
+    catalog = default_catalog()
+    # 4 of 32 GiB in use fits a general purpose class, which Aurora does not offer.
+    freeable = 28 * 1024**3
+
+    aurora = catalog.right_size("db.r6g.xlarge", "aurora-postgresql", 10.0, min_freeable_memory_bytes=freeable)
+    postgres = catalog.right_size("db.r6g.xlarge", "postgres", 10.0, min_freeable_memory_bytes=freeable)
+
+    assert aurora.target.name == "db.r6g.large"
+    assert postgres.target.name == "db.m6g.large"
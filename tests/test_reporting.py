@@ -7,6 +7,7 @@ from aws_storage_optimizer.reporting import (
     load_analysis,
     print_analysis_json,
     print_analysis_table,
+    print_lifecycle_simulation_json,
     save_analysis,
 )
 
@@ -52,6 +53,13 @@ def test_print_analysis_json_outputs_valid_json(capsys):
     assert payload["findings"][0]["service"] == "ebs"
 
 
+def test_print_lifecycle_simulation_json_outputs_valid_json(capsys):
+    print_lifecycle_simulation_json({"rules": [], "warnings": ["no rules"]})
+    captured = capsys.readouterr()
+
+    assert json.loads(captured.out) == {"rules": [], "warnings": ["no rules"]}
+
+
 def test_print_analysis_table_emits_summary(capsys):
     result = _sample_result()
 
@@ -0,0 +1,458 @@
+from datetime import datetime, timedelta, timezone
+import random
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+from aws_storage_optimizer.analyzers.s3 import S3ScanUsage, _plan_list_quotas, analyze_s3
+from aws_storage_optimizer.config import load_config
+
+
+class FleetS3Client:
+    def __init__(self, bucket_sizes: dict[str, int], jitter_seconds: float = 0.0):
+        self.bucket_sizes = bucket_sizes
+        self.jitter_seconds = jitter_seconds
+        self.calls: list[tuple[str, dict]] = []
+        self._lock = threading.Lock()
+        self._random = random.Random(7)
+
+    def _record(self, operation: str, kwargs: dict) -> None:
+        with self._lock:
+            self.calls.append((operation, kwargs))
+            delay = self._random.random() * self.jitter_seconds
+        if delay:
+            time.sleep(delay)
+
+    def list_buckets(self, **kwargs):
+        self._record("list_buckets", kwargs)
+        return {"Buckets": [{"Name": name} for name in self.bucket_sizes]}
+
+    def get_bucket_tagging(self, **kwargs):
+        self._record("get_bucket_tagging", kwargs)
+        raise ClientError(
+            error_response={"Error": {"Code": "NoSuchTagSet", "Message": "No tags"}},
+            operation_name="GetBucketTagging",
+        )
+
+    def get_bucket_location(self, **kwargs):
+        self._record("get_bucket_location", kwargs)
+        return {"LocationConstraint": "us-west-2"}
+
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        return {"Contents": [{"Key": "object", "Size": self.bucket_sizes[kwargs["Bucket"]]}]}
+
+
+def _bucket_fleet() -> dict[str, int]:
+    sizes = {f"bucket-{index:03d}": (index % 7) * 1024**3 for index in range(40)}
+    sizes["bucket-tie-b"] = 9 * 1024**3
+    sizes["bucket-tie-a"] = 9 * 1024**3
+    return sizes
+
+
+def test_analyze_s3_concurrent_results_match_sequential():
+    config = load_config()
+    config.s3_scan.concurrency = 1
+    sequential = analyze_s3(FleetS3Client(_bucket_fleet()), config=config, top_n=10)
+
+    config.s3_scan.concurrency = 16
+    concurrent = analyze_s3(FleetS3Client(_bucket_fleet(), jitter_seconds=0.005), config=config, top_n=10)
+
+    assert [finding.to_dict() for finding in concurrent] == [finding.to_dict() for finding in sequential]
+    assert [finding.resource_id for finding in concurrent[:2]] == ["bucket-tie-a", "bucket-tie-b"]
+
+
+def test_analyze_s3_scans_every_bucket_once():
+    client = FleetS3Client(_bucket_fleet())
+    config = load_config()
+    config.s3_scan.concurrency = 4
+
+    analyze_s3(client, config=config, top_n=3)
+
+    scanned = [kwargs["Bucket"] for operation, kwargs in client.calls if operation == "list_objects_v2"]
+    assert sorted(scanned) == sorted(_bucket_fleet())
+
+
+class BucketMetricsCloudWatchClient:
+    def __init__(self, sizes: dict[str, dict[str, float]], object_counts: dict[str, float]):
+        self.sizes = sizes
+        self.object_counts = object_counts
+        self.requests: list[dict] = []
+
+    def get_metric_data(self, **kwargs):
+        self.requests.append(kwargs)
+        results = []
+        for query in kwargs["MetricDataQueries"]:
+            metric = query["MetricStat"]["Metric"]
+            dimensions = {item["Name"]: item["Value"] for item in metric["Dimensions"]}
+            bucket_name = dimensions["BucketName"]
+            if metric["MetricName"] == "NumberOfObjects":
+                value = self.object_counts.get(bucket_name)
+            else:
+                value = self.sizes.get(bucket_name, {}).get(dimensions["StorageType"])
+            results.append({"Id": query["Id"], "Values": [] if value is None else [value / 2, value]})
+        return {"MetricDataResults": results}
+
+
+def test_analyze_s3_metrics_source_sizes_from_cloudwatch_and_falls_back_to_listing():
+    s3_client = FleetS3Client({"metered": 0, "unmetered": 3 * 1024**3})
+    cloudwatch_client = BucketMetricsCloudWatchClient(
+        sizes={"metered": {"StandardStorage": 4 * 1024**3, "GlacierStorage": 2 * 1024**3}},
+        object_counts={"metered": 120_000},
+    )
+    config = load_config()
+    config.s3_scan.size_source = "metrics"
+
+    findings = analyze_s3(s3_client, config=config, top_n=10, cloudwatch_client=cloudwatch_client)
+
+    assert [finding.resource_id for finding in findings] == ["metered", "unmetered"]
+    assert findings[0].details["approx_size_gib"] == 6.0
+    assert findings[0].details["object_count"] == 120_000
+    assert findings[0].details["size_source"] == "cloudwatch"
+    assert findings[1].details["size_source"] == "list"
+    listed = [kwargs["Bucket"] for operation, kwargs in s3_client.calls if operation == "list_objects_v2"]
+    assert listed == ["unmetered"]
+    assert len(cloudwatch_client.requests) == 1
+
+
+class PagedS3Client(FleetS3Client):
+    def __init__(self, object_counts: dict[str, int], object_size: int = 1024):
+        super().__init__({name: 0 for name in object_counts})
+        self.object_counts = object_counts
+        self.object_size = object_size
+
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        start = int(kwargs.get("ContinuationToken", 0))
+        end = min(start + kwargs["MaxKeys"], self.object_counts[kwargs["Bucket"]])
+        page = {"Contents": [{"Key": f"k{index}", "Size": self.object_size} for index in range(start, end)]}
+        if end < self.object_counts[kwargs["Bucket"]]:
+            page["NextContinuationToken"] = str(end)
+        return page
+
+
+def test_analyze_s3_list_budget_deep_scans_only_top_candidates():
+    object_counts = {"huge": 2500, "large": 1500, "tiny": 10, "unmetered": 3000}
+    s3_client = PagedS3Client(object_counts)
+    cloudwatch_client = BucketMetricsCloudWatchClient(
+        sizes={name: {"StandardStorage": count * 1024} for name, count in object_counts.items() if name != "unmetered"},
+        object_counts={name: count for name, count in object_counts.items() if name != "unmetered"},
+    )
+    config = load_config()
+    config.s3_scan.max_list_requests = 5
+    usage = S3ScanUsage()
+
+    findings = analyze_s3(s3_client, config=config, top_n=2, cloudwatch_client=cloudwatch_client, usage=usage)
+
+    listed = [kwargs["Bucket"] for operation, kwargs in s3_client.calls if operation == "list_objects_v2"]
+    # One page is held back to probe the bucket without metrics; the smaller
+    # candidate is listed in full and the larger one gets what is left.
+    assert listed.count("huge") == 2
+    assert listed.count("large") == 2
+    assert listed.count("unmetered") == 1
+    assert "tiny" not in listed
+    assert usage.list_requests == 5
+    assert usage.list_request_budget == 5
+    assert usage.unscanned_buckets == 0
+    assert [finding.resource_id for finding in findings] == ["huge", "large"]
+    assert findings[0].details["size_source"] == "cloudwatch"
+    assert "partial listing of 2 pages" in findings[0].details["sample_limit_note"]
+    assert findings[1].details["size_source"] == "list"
+
+
+def test_plan_list_quotas_keeps_a_huge_bucket_from_starving_the_rest():
+    metric_sizes = {"huge": (10**15, 50_000_000), "b2": (10**15, 2000), "b3": (10**15, 3000)}
+
+    quotas = _plan_list_quotas(["huge", "b2", "b3", "nometric"], metric_sizes, top_n=3, budget=1000)
+
+    # Each need is one page more than the objects fill, for the root delimiter page.
+    assert quotas == {"huge": 988, "b2": 3, "b3": 4, "nometric": 5}
+
+
+class RegionalPagedBucketsS3Client(FleetS3Client):
+    def list_buckets(self, **kwargs):
+        self._record("list_buckets", kwargs)
+        names = sorted(self.bucket_sizes)
+        start = int(kwargs.get("ContinuationToken", 0))
+        end = start + 2
+        page = {"Buckets": [{"Name": name, "BucketRegion": "eu-west-1"} for name in names[start:end]]}
+        if end < len(names):
+            page["ContinuationToken"] = str(end)
+        return page
+
+
+def test_analyze_s3_paginates_buckets_and_uses_inline_region():
+    client = RegionalPagedBucketsS3Client({"a": 1, "b": 2, "c": 3, "d": 4, "e": 5})
+
+    findings = analyze_s3(client, config=load_config(), top_n=10)
+
+    operations = [operation for operation, _ in client.calls]
+    assert operations.count("list_buckets") == 3
+    assert "get_bucket_location" not in operations
+    assert all(kwargs.get("MaxBuckets") for operation, kwargs in client.calls if operation == "list_buckets")
+    assert [finding.resource_id for finding in findings] == ["e", "d", "c", "b", "a"]
+    assert {finding.region for finding in findings} == {"eu-west-1"}
+
+
+def test_analyze_s3_sends_bucket_calls_to_regional_clients():
+    home_client = RegionalPagedBucketsS3Client({"a": 1, "b": 2})
+    regional_clients = {}
+
+    def regional_s3_client(region):
+        return regional_clients.setdefault(region, FleetS3Client({"a": 1, "b": 2}))
+
+    analyze_s3(home_client, config=load_config(), top_n=10, regional_s3_client=regional_s3_client)
+
+    assert list(regional_clients) == ["eu-west-1"]
+    assert [operation for operation, _ in home_client.calls] == ["list_buckets"]
+    regional_operations = [operation for operation, _ in regional_clients["eu-west-1"].calls]
+    assert regional_operations.count("list_objects_v2") == 2
+    assert regional_operations.count("get_bucket_tagging") == 2
+
+
+class PrefixedS3Client(FleetS3Client):
+    def __init__(self, prefix_counts: dict[str, int]):
+        super().__init__({"logs": 0})
+        self.prefix_counts = prefix_counts
+        self.active = 0
+        self.peak_active = 0
+
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        if kwargs.get("Delimiter") == "/":
+            return {
+                "Contents": [{"Key": "index.html", "Size": 1}],
+                "CommonPrefixes": [{"Prefix": prefix} for prefix in self.prefix_counts],
+            }
+        with self._lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        start = int(kwargs.get("ContinuationToken", 0))
+        end = min(start + kwargs["MaxKeys"], self.prefix_counts[kwargs["Prefix"]])
+        page = {"Contents": [{"Key": f"{kwargs['Prefix']}{index}", "Size": 10} for index in range(start, end)]}
+        if end < self.prefix_counts[kwargs["Prefix"]]:
+            page["NextContinuationToken"] = str(end)
+        return page
+
+
+def test_analyze_s3_lists_top_level_prefixes_in_parallel():
+    client = PrefixedS3Client({"2024/": 1500, "2025/": 900, "2026/": 10})
+    config = load_config()
+    config.s3_scan.prefix_concurrency = 3
+
+    findings = analyze_s3(client, config=config, top_n=1)
+
+    assert client.peak_active > 1
+    assert findings[0].details["object_count"] == 1 + 1500 + 900 + 10
+    assert "sample_limit_note" not in findings[0].details
+    prefixes = sorted(kwargs.get("Prefix", "") for operation, kwargs in client.calls if operation == "list_objects_v2")
+    assert prefixes == ["", "2024/", "2024/", "2025/", "2026/"]
+
+
+def test_analyze_s3_prefix_listing_shares_page_quota():
+    client = PrefixedS3Client({"a/": 5000, "b/": 5000})
+    config = load_config()
+    config.s3_scan.prefix_concurrency = 2
+
+    findings = analyze_s3(client, config=config, top_n=1)
+
+    listed = [operation for operation, _ in client.calls if operation == "list_objects_v2"]
+    assert len(listed) == 5
+    assert "partial listing of 5 pages" in findings[0].details["sample_limit_note"]
+
+
+def test_analyze_s3_prefix_listing_assigns_fixed_pages_per_prefix():
+    config = load_config()
+    config.s3_scan.prefix_concurrency = 3
+
+    for _ in range(5):
+        client = PrefixedS3Client({"a/": 10, "b/": 5000, "c/": 5000})
+        findings = analyze_s3(client, config=config, top_n=1)
+
+        listed = sorted(
+            (kwargs["Prefix"], kwargs.get("ContinuationToken", ""))
+            for operation, kwargs in client.calls
+            if operation == "list_objects_v2" and "Prefix" in kwargs
+        )
+        # Four pages after discovery: a/ gets two, b/ and c/ one each; the page
+        # a/ leaves unused continues b/, the first unfinished prefix.
+        assert listed == [("a/", ""), ("b/", ""), ("b/", "1000"), ("c/", "")]
+        assert findings[0].details["object_count"] == 1 + 10 + 2000 + 1000
+
+
+class WideS3Client(FleetS3Client):
+    def __init__(self, buckets: dict[str, tuple[list[str], int, int]]):
+        # bucket -> (root keys, top-level prefixes, objects per prefix)
+        super().__init__({name: 0 for name in buckets})
+        self.keys = {
+            name: sorted(root_keys + [f"p{prefix:05d}/{index}" for prefix in range(prefixes) for index in range(count)])
+            for name, (root_keys, prefixes, count) in buckets.items()
+        }
+
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        entries = self.keys[kwargs["Bucket"]]
+        if kwargs.get("Delimiter") == "/":
+            entries = sorted({key.split("/")[0] + "/" if "/" in key else key for key in entries})
+        start = int(kwargs.get("ContinuationToken", 0))
+        chunk = entries[start : start + kwargs["MaxKeys"]]
+        page = {
+            "Contents": [{"Key": entry, "Size": 1024**2} for entry in chunk if not entry.endswith("/")],
+            "CommonPrefixes": [{"Prefix": entry} for entry in chunk if entry.endswith("/")],
+        }
+        if start + kwargs["MaxKeys"] < len(entries):
+            page["NextContinuationToken"] = str(start + kwargs["MaxKeys"])
+        return page
+
+
+def test_analyze_s3_lists_buckets_with_more_prefixes_than_pages_flat():
+    client = WideS3Client({"wide": ([], 4500, 2), "few-wide": (["a-root", "zz-root"], 8, 1)})
+
+    findings = analyze_s3(client, config=load_config(), top_n=2)
+
+    by_name = {finding.resource_id: finding for finding in findings}
+    # The prefix-only discovery page is free, so all five pages go to objects.
+    assert by_name["wide"].details["object_count"] == 5000
+    assert "partial listing of 6 pages" in by_name["wide"].details["sample_limit_note"]
+    # Root keys come back with the discovery page and are not counted twice.
+    assert by_name["few-wide"].details["object_count"] == 10
+    assert "sample_limit_note" not in by_name["few-wide"].details
+    flat = [kwargs for operation, kwargs in client.calls if operation == "list_objects_v2" and "Delimiter" not in kwargs]
+    assert all("Prefix" not in kwargs for kwargs in flat)
+
+
+def test_analyze_s3_list_budget_finishes_prefixed_buckets_with_spare_pages():
+    client = PrefixedS3Client({"a/": 1500, "b/": 1500, "c/": 1500, "d/": 1500})
+    cloudwatch_client = BucketMetricsCloudWatchClient(
+        sizes={"logs": {"StandardStorage": 6000 * 10 + 1}}, object_counts={"logs": 6001}
+    )
+    config = load_config()
+    config.s3_scan.max_list_requests = 1000
+    usage = S3ScanUsage()
+
+    findings = analyze_s3(client, config=config, top_n=1, cloudwatch_client=cloudwatch_client, usage=usage)
+
+    # The plan gives 8 pages: the delimiter page plus 7 dealt 2, 2, 2, 1; d/
+    # needs a second page, which comes from the spare budget.
+    assert findings[0].details["size_source"] == "list"
+    assert findings[0].details["object_count"] == 6001
+    assert usage.list_requests == 9
+
+
+class AgedObjectsS3Client(FleetS3Client):
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        now = datetime.now(timezone.utc)
+        return {
+            "Contents": [
+                {"Key": "old", "Size": 3 * 1024**3, "LastModified": now - timedelta(days=400)},
+                {
+                    "Key": "archived",
+                    "Size": 2 * 1024**3,
+                    "LastModified": now - timedelta(days=400),
+                    "StorageClass": "GLACIER",
+                },
+                {"Key": "recent", "Size": 1024**3, "LastModified": now - timedelta(days=5)},
+            ]
+        }
+
+
+def test_analyze_s3_histograms_and_savings_from_stale_bytes():
+    findings = analyze_s3(AgedObjectsS3Client({"aged": 0}), config=load_config(), top_n=1)
+
+    details = findings[0].details
+    assert details["storage_class_age_gib"] == {"STANDARD": {"365d+": 3.0, "0-30d": 1.0}, "GLACIER": {"365d+": 2.0}}
+    assert details["object_size_counts"] == {"1GiB+": 3}
+    assert details["stale_size_gib"] == 5.0
+    assert "estimated_optimization_ratio" not in details
+    assert findings[0].estimated_monthly_savings_usd == round(3 * (0.023 - 0.0125), 2)
+
+
+class ManyObjectsS3Client(FleetS3Client):
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        bucket_name = kwargs["Bucket"]
+        start = int(kwargs.get("ContinuationToken", 0))
+        sizes = self.bucket_sizes[bucket_name]
+        end = min(start + kwargs["MaxKeys"], len(sizes))
+        page = {
+            "Contents": [
+                {"Key": f"{bucket_name}-{index:05d}", "Size": sizes[index], "StorageClass": "STANDARD"}
+                for index in range(start, end)
+            ]
+        }
+        if end < len(sizes):
+            page["NextContinuationToken"] = str(end)
+        return page
+
+
+def test_analyze_s3_reports_largest_objects_globally_and_per_bucket():
+    rng = random.Random(13)
+    buckets = {name: [rng.randrange(1, 10**6) for _ in range(2500)] for name in ("alpha", "beta")}
+    buckets["beta"][1234] = 5 * 1024**3
+    config = load_config()
+    config.s3_scan.largest_objects = 3
+    config.s3_scan.max_list_requests = 10
+
+    findings = analyze_s3(ManyObjectsS3Client(buckets), config=config, top_n=2)
+
+    everything = sorted(
+        ((size, name, f"{name}-{index:05d}") for name, sizes in buckets.items() for index, size in enumerate(sizes)),
+        reverse=True,
+    )
+    object_findings = [finding for finding in findings if "/" in finding.resource_id]
+    assert [finding.resource_id for finding in object_findings] == [f"{name}/{key}" for _, name, key in everything[:3]]
+    assert object_findings[0].details["bucket"] == "beta"
+    assert object_findings[0].details["key"] == "beta-01234"
+    assert object_findings[0].details["action_type"] == "delete-s3-object"
+    assert object_findings[0].estimated_monthly_savings_usd == round(5 * 0.023, 2)
+
+    alpha = next(finding for finding in findings if finding.resource_id == "alpha")
+    expected_alpha = sorted(buckets["alpha"], reverse=True)[:3]
+    assert [item["size_bytes"] for item in alpha.details["largest_objects"]] == expected_alpha
+
+
+class PartitionedLogsS3Client(FleetS3Client):
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        now = datetime.now(timezone.utc)
+        contents = [
+            {"Key": f"logs/{year}/{index}.gz", "Size": 1024**3, "LastModified": now - timedelta(days=age)}
+            for year, age in (("2023", 700), ("2024", 300), ("2026", 3))
+            for index in range(4)
+        ]
+        return {"Contents": contents}
+
+
+def test_analyze_s3_recommends_lifecycle_prefixes_from_trie():
+    config = load_config()
+    config.s3_scan.prefix_concurrency = 1
+
+    findings = analyze_s3(PartitionedLogsS3Client({"logs": 0}), config=config, top_n=1)
+
+    candidates = findings[0].details["lifecycle_candidates"]
+    assert [candidate["prefix"] for candidate in candidates] == ["logs/2023/", "logs/2024/"]
+    assert candidates[0]["stale_gib"] == 4.0
+    assert candidates[0]["stale_fraction"] == 1.0
+    assert candidates[0]["estimated_monthly_savings_usd"] == round(4 * (0.023 - 0.0125), 2)
+
+
+class SmallStaleObjectsS3Client(FleetS3Client):
+    def list_objects_v2(self, **kwargs):
+        self._record("list_objects_v2", kwargs)
+        old = datetime.now(timezone.utc) - timedelta(days=400)
+        return {"Contents": [{"Key": f"events/{index}.json", "Size": 2048, "LastModified": old} for index in range(900)]}
+
+
+def test_analyze_s3_flags_buckets_where_transitions_lose_money():
+    findings = analyze_s3(SmallStaleObjectsS3Client({"events": 0}), config=load_config(), top_n=1)
+
+    details = findings[0].details
+    assert details["transition_loses_money"] == ["STANDARD_IA", "ONEZONE_IA", "GLACIER_IR", "GLACIER", "DEEP_ARCHIVE"]
+    assert details["transition_net_savings"]["STANDARD_IA"]["objects"] == 900
+    assert findings[0].estimated_monthly_savings_usd == 0.0
+    assert "ObjectSizeGreaterThan" in findings[0].recommendation
@@ -0,0 +1,120 @@
+import json
+
+from botocore.exceptions import ClientError
+from click.testing import CliRunner
+
+import aws_storage_optimizer.cli as cli_module
+from aws_storage_optimizer.analyzers.s3 import analyze_s3
+from aws_storage_optimizer.analyzers.s3_checkpoint import ScanCheckpoint, ShardProgress
+from aws_storage_optimizer.config import load_config
+
+
+class ExpiringS3Client:
+    def __init__(self, object_count: int, pages_before_expiry: int | None = None):
+        self.object_count = object_count
+        self.pages_before_expiry = pages_before_expiry
+        self.list_calls: list[dict] = []
+
+    @staticmethod
+    def list_buckets(**_kwargs):
+        return {"Buckets": [{"Name": "logs", "BucketRegion": "us-west-2"}]}
+
+    @staticmethod
+    def get_bucket_tagging(**_kwargs):
+        return {"TagSet": []}
+
+    def list_objects_v2(self, **kwargs):
+        if self.pages_before_expiry is not None and len(self.list_calls) >= self.pages_before_expiry:
+            raise ClientError(
+                error_response={"Error": {"Code": "ExpiredToken", "Message": "expired"}},
+                operation_name="ListObjectsV2",
+            )
+        self.list_calls.append(kwargs)
+        start = int(kwargs.get("ContinuationToken", 0))
+        end = min(start + kwargs["MaxKeys"], self.object_count)
+        page = {"Contents": [{"Key": f"k{index}", "Size": 100} for index in range(start, end)]}
+        if end < self.object_count:
+            page["NextContinuationToken"] = str(end)
+        return page
+
+
+def _full_scan_config():
+    config = load_config()
+    config.s3_scan.max_list_requests = 10
+    return config
+
+
+def test_resumed_scan_continues_from_saved_continuation_token(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    config = _full_scan_config()
+    interrupted = ExpiringS3Client(object_count=4500, pages_before_expiry=2)
+
+    analyze_s3(interrupted, config=config, top_n=1, checkpoint=ScanCheckpoint(path, stale_days=90))
+
+    saved = json.loads(path.read_text(encoding="utf-8"))["buckets"]["logs"][""]
+    assert saved["continuation_token"] == "2000"
+    assert saved["stats"]["object_count"] == 2000
+    assert not saved["complete"]
+
+    resumed = ExpiringS3Client(object_count=4500)
+    findings = analyze_s3(resumed, config=config, top_n=1, checkpoint=ScanCheckpoint.load(path, stale_days=90))
+
+    assert [call.get("ContinuationToken") for call in resumed.list_calls] == ["2000", "3000", "4000"]
+    assert findings[0].details["object_count"] == 4500
+    assert findings[0].details["size_source"] == "list"
+
+
+def test_resumed_scan_charges_saved_pages_to_the_page_quota(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    config = load_config()
+    uninterrupted = analyze_s3(ExpiringS3Client(object_count=9000), config=config, top_n=1)
+    interrupted = ExpiringS3Client(object_count=9000, pages_before_expiry=2)
+    analyze_s3(interrupted, config=config, top_n=1, checkpoint=ScanCheckpoint(path, stale_days=90))
+
+    resumed = ExpiringS3Client(object_count=9000)
+    findings = analyze_s3(resumed, config=config, top_n=1, checkpoint=ScanCheckpoint.load(path, stale_days=90))
+
+    # Two of the five default pages were listed before the interruption.
+    assert [call.get("ContinuationToken") for call in resumed.list_calls] == ["2000", "3000", "4000"]
+    assert findings[0].details["object_count"] == uninterrupted[0].details["object_count"] == 5000
+
+
+def test_checkpoint_writes_are_throttled_until_final_save(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    checkpoint = ScanCheckpoint(path, stale_days=90, interval_seconds=3600)
+
+    analyze_s3(ExpiringS3Client(object_count=2500), config=_full_scan_config(), top_n=1, checkpoint=checkpoint)
+
+    assert json.loads(path.read_text(encoding="utf-8"))["buckets"]["logs"][""]["complete"]
+    assert not (tmp_path / "checkpoint.json.tmp").exists()
+
+
+def test_checkpoint_serializes_shards_once_per_interval(tmp_path, monkeypatch):
+    serialized = []
+    to_dict = ShardProgress.to_dict
+
+    def counting_to_dict(progress):
+        serialized.append(progress.pages)
+        return to_dict(progress)
+
+    monkeypatch.setattr(ShardProgress, "to_dict", counting_to_dict)
+    checkpoint = ScanCheckpoint(tmp_path / "checkpoint.json", stale_days=90, interval_seconds=3600)
+
+    analyze_s3(ExpiringS3Client(object_count=9500), config=_full_scan_config(), top_n=1, checkpoint=checkpoint)
+
+    # The first page, the finished shard and the final save; not every page.
+    assert serialized == [1, 10, 10]
+
+
+def test_analyze_resume_rejects_checkpoint_with_other_stale_days(tmp_path, monkeypatch):
+    path = tmp_path / "checkpoint.json"
+    ScanCheckpoint(path, stale_days=30).save()
+    monkeypatch.setattr(cli_module, "AWSClientFactory", lambda profile, region, config=None: object())
+
+    result = CliRunner().invoke(
+        cli_module.cli,
+        ["analyze", "--services", "s3", "--s3-checkpoint", str(path), "--resume", "--s3-stale-days", "90"],
+    )
+
+    assert result.exit_code != 0
+    assert "s3_stale_days=30" in result.output
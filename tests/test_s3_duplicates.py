@@ -0,0 +1,115 @@
+import csv
+import gzip
+import json
+
+from botocore.exceptions import ClientError
+
+import aws_storage_optimizer.analyzers.s3_duplicates as duplicates_module
+from aws_storage_optimizer.analyzers.s3 import S3ScanUsage, analyze_s3
+from aws_storage_optimizer.analyzers.s3_duplicates import DuplicateIndex, find_duplicates
+from aws_storage_optimizer.analyzers.s3_inventory import load_s3_inventory
+from aws_storage_optimizer.config import load_config
+
+
+class CopiedObjectsS3Client:
+    objects = {
+        "backups": [
+            {"Key": "db/dump.sql", "Size": 3 * 1024**3, "ETag": '"aaa"'},
+            {"Key": "empty/", "Size": 0, "ETag": '"d41d8cd98f00b204e9800998ecf8427e"'},
+        ],
+        "backups-of-backups": [
+            {"Key": "2026/db/dump.sql", "Size": 3 * 1024**3, "ETag": '"aaa"', "StorageClass": "GLACIER"},
+            {"Key": "2026/db/other.sql", "Size": 1024**3, "ETag": '"aaa"'},
+            {"Key": "empty/", "Size": 0, "ETag": '"d41d8cd98f00b204e9800998ecf8427e"'},
+        ],
+    }
+
+    def list_buckets(self, **_kwargs):
+        return {"Buckets": [{"Name": name} for name in self.objects]}
+
+    @staticmethod
+    def get_bucket_tagging(**_kwargs):
+        raise ClientError(
+            error_response={"Error": {"Code": "NoSuchTagSet", "Message": "No tags"}},
+            operation_name="GetBucketTagging",
+        )
+
+    @staticmethod
+    def get_bucket_location(**_kwargs):
+        return {"LocationConstraint": "us-west-2"}
+
+    def list_objects_v2(self, **kwargs):
+        return {"Contents": self.objects[kwargs["Bucket"]]}
+
+
+def test_duplicate_index_spills_and_groups_by_etag_and_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(duplicates_module, "SPILL_BUFFER_ROWS", 2)
+    index = DuplicateIndex(tmp_path, partitions=4)
+
+    with index.writer() as first, index.writer() as second:
+        for copy in range(3):
+            first.add('"big"', 500, "bucket-a", f"big-{copy}", "STANDARD")
+        second.add('"big"', 500, "bucket-b", "big", "STANDARD")
+        second.add('"small"', 10, "bucket-b", "small-1", "STANDARD")
+        second.add('"small"', 10, "bucket-a", "small-2", "STANDARD")
+        second.add('"small"', 11, "bucket-a", "not-a-copy", "STANDARD")
+    report = find_duplicates(index, limit=1)
+
+    # Both writers append to this process's file for each partition.
+    assert len(list(tmp_path.glob("*.csv"))) == len(index.partition_files()) <= 4
+    assert report.group_count == 2
+    assert report.duplicate_objects == 4
+    assert report.reclaimable_bytes == 3 * 500 + 10
+    assert [(group.etag, group.copy_count) for group in report.groups] == [("big", 4)]
+    assert report.groups[0].locations[0] == ("bucket-a", "big-0", "STANDARD")
+
+
+def test_analyze_s3_reports_copies_across_buckets(tmp_path):
+    config = load_config()
+    usage = S3ScanUsage()
+
+    findings = analyze_s3(
+        CopiedObjectsS3Client(),
+        config=config,
+        top_n=5,
+        usage=usage,
+        duplicates=DuplicateIndex(tmp_path, partitions=8),
+    )
+
+    duplicate = [finding for finding in findings if finding.details.get("finding_type") == "duplicate-objects"]
+    assert len(duplicate) == 1
+    assert duplicate[0].resource_id == f"aaa:{3 * 1024**3}"
+    assert duplicate[0].details["kept_copy"] == "backups/db/dump.sql"
+    assert duplicate[0].details["duplicate_copies"] == ["backups-of-backups/2026/db/dump.sql"]
+    assert duplicate[0].details["buckets"] == ["backups", "backups-of-backups"]
+    assert duplicate[0].estimated_monthly_savings_usd == round(3 * 0.0036, 2)
+    assert usage.duplicates.reclaimable_bytes == 3 * 1024**3
+
+
+def test_load_s3_inventory_indexes_etags_across_worker_processes(tmp_path):
+    for bucket_name, rows in (
+        ("source", [["source", "data%2Fpart%201.parquet", "2048", '"abc"']]),
+        ("replica", [["replica", "copy%2Fpart%201.parquet", "2048", '"abc"']]),
+    ):
+        root = tmp_path / bucket_name
+        root.mkdir()
+        with gzip.open(root / "part-0.csv.gz", "wt", encoding="utf-8", newline="") as data_file:
+            csv.writer(data_file).writerows(rows)
+        manifest = {
+            "sourceBucket": bucket_name,
+            "fileFormat": "CSV",
+            "fileSchema": "Bucket, Key, Size, ETag",
+            "files": [{"key": "part-0.csv.gz"}],
+        }
+        (root / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    index = DuplicateIndex(tmp_path / "index", partitions=2)
+
+    load_s3_inventory(
+        [str(tmp_path / "source"), str(tmp_path / "replica")], config=load_config(), max_workers=2, duplicates=index
+    )
+    report = find_duplicates(index, limit=5)
+
+    assert report.groups[0].locations == [
+        ("replica", "copy/part 1.parquet", "STANDARD"),
+        ("source", "data/part 1.parquet", "STANDARD"),
+    ]
@@ -0,0 +1,102 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from aws_storage_optimizer.analyzers.s3 import analyze_s3
+from aws_storage_optimizer.analyzers.s3_inventory import load_s3_inventory, read_inventory_manifest
+from aws_storage_optimizer.config import load_config
+
+
+class UnlistableS3Client:
+    @staticmethod
+    def list_buckets(**_kwargs):
+        return {"Buckets": []}
+
+    @staticmethod
+    def get_bucket_tagging(**_kwargs):
+        return {"TagSet": []}
+
+    @staticmethod
+    def get_bucket_location(**_kwargs):
+        return {"LocationConstraint": "eu-central-1"}
+
+    @staticmethod
+    def list_objects_v2(**_kwargs):
+        raise AssertionError("Inventory buckets should not be listed")
+
+
+def _write_inventory(root, rows_per_file):
+    data_dir = root / "data"
+    data_dir.mkdir(parents=True)
+    files = []
+    for index, rows in enumerate(rows_per_file):
+        key = f"inventory/logs-bucket/daily/data/part-{index}.csv.gz"
+        with gzip.open(data_dir / f"part-{index}.csv.gz", "wt", encoding="utf-8", newline="") as data_file:
+            csv.writer(data_file).writerows(rows)
+        files.append({"key": key, "size": 0, "MD5checksum": ""})
+    manifest = {
+        "sourceBucket": "logs-bucket",
+        "destinationBucket": "arn:aws:s3:::inventory-bucket",
+        "fileFormat": "CSV",
+        "fileSchema": "Bucket, Key, Size, LastModifiedDate, StorageClass, IsDeleteMarker",
+        "files": files,
+    }
+    (root / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def _rows():
+    return [
+        [
+            ["logs-bucket", "a/old.log", "100", "2020-01-01T00:00:00.000Z", "STANDARD", "false"],
+            ["logs-bucket", "a/new.log", "50", "2999-01-01T00:00:00.000Z", "STANDARD", "false"],
+            ["logs-bucket", "a/deleted.log", "", "2020-01-01T00:00:00.000Z", "STANDARD", "true"],
+        ],
+        [
+            ["logs-bucket", "b/archive.log", "1000", "2020-01-01T00:00:00.000Z", "GLACIER", "false"],
+        ],
+    ]
+
+
+def test_load_s3_inventory_aggregates_data_files_in_parallel(tmp_path):
+    _write_inventory(tmp_path, _rows())
+
+    inventory = load_s3_inventory([str(tmp_path)], config=load_config(), max_workers=2)
+
+    stats = inventory["logs-bucket"]
+    assert stats.size_bytes == 1150
+    assert stats.object_count == 3
+    assert stats.stale_bytes == 1100
+    assert stats.stale_count == 2
+    assert stats.storage_class_bytes == {"STANDARD": 150, "GLACIER": 1000}
+    assert stats.stale_storage_class_bytes == {"STANDARD": 100, "GLACIER": 1000}
+    assert stats.age_bytes() == {"STANDARD": {"365d+": 100, "0-30d": 50}, "GLACIER": {"365d+": 1000}}
+    assert stats.size_bucket_counts() == {"<128KiB": 3}
+    assert stats.prefixes.root.children["a"].size_bytes == 150
+    assert stats.prefixes.root.children["a"].stale_bytes == 100
+
+
+def test_read_inventory_manifest_rejects_non_csv(tmp_path):
+    (tmp_path / "manifest.json").write_text(
+        json.dumps({"sourceBucket": "b", "fileFormat": "Parquet", "fileSchema": "message s3.inventory {}"}),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="only CSV"):
+        read_inventory_manifest(tmp_path)
+
+
+def test_analyze_s3_uses_inventory_stats_without_listing(tmp_path):
+    _write_inventory(tmp_path, _rows())
+    config = load_config()
+    inventory = load_s3_inventory([str(tmp_path)], config=config, max_workers=1)
+
+    findings = analyze_s3(UnlistableS3Client(), config=config, top_n=5, inventory_stats=inventory)
+
+    assert len(findings) == 1
+    assert findings[0].resource_id == "logs-bucket"
+    assert findings[0].region == "eu-central-1"
+    assert findings[0].details["size_source"] == "inventory"
+    assert findings[0].details["object_count"] == 3
+    assert findings[0].details["stale_object_count"] == 2
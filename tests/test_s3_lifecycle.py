@@ -0,0 +1,100 @@
+import csv
+from datetime import date, timedelta
+import gzip
+import json
+
+from aws_storage_optimizer.analyzers.s3_lifecycle import (
+    LifecycleSimulator,
+    parse_lifecycle_rules,
+    simulate_inventory,
+)
+from aws_storage_optimizer.config import load_config
+
+TODAY = date(2026, 6, 1)
+LOG_RULES = {
+    "Rules": [
+        {
+            "ID": "logs",
+            "Status": "Enabled",
+            "Filter": {"Prefix": "logs/"},
+            "Transitions": [{"Days": 90, "StorageClass": "GLACIER"}, {"Days": 30, "StorageClass": "STANDARD_IA"}],
+            "Expiration": {"Days": 365},
+        },
+        {"ID": "tagged", "Status": "Enabled", "Filter": {"Tag": {"Key": "tier", "Value": "cold"}}},
+        {"ID": "off", "Status": "Disabled", "Filter": {}, "Expiration": {"Days": 1}},
+    ]
+}
+
+
+def _modified(age_days: int) -> str:
+    return (TODAY - timedelta(days=age_days)).isoformat()
+
+
+def test_parse_lifecycle_rules_reads_filters_and_skips_tag_rules():
+    rules, warnings = parse_lifecycle_rules(
+        {
+            "Rules": [
+                *LOG_RULES["Rules"],
+                {
+                    "Status": "Enabled",
+                    "Filter": {"And": {"Prefix": "big/", "ObjectSizeGreaterThan": 1024}},
+                    "Transitions": [{"Days": 0, "StorageClass": "GLACIER_IR"}],
+                },
+            ]
+        }
+    )
+
+    assert [rule.rule_id for rule in rules] == ["logs", "rule-4"]
+    assert rules[0].transitions == ((30, "STANDARD_IA"), (90, "GLACIER"))
+    assert rules[1].matches("big/file", 2048)
+    assert not rules[1].matches("big/file", 1024)
+    assert warnings == ["tagged: tag filters cannot be evaluated from object listings; rule skipped"]
+
+
+def test_lifecycle_simulator_replays_transitions_and_expiration():
+    rules, _ = parse_lifecycle_rules(LOG_RULES)
+    simulator = LifecycleSimulator(rules)
+    gib = 1024**3
+    simulator.add("logs/expired.gz", gib, "STANDARD", _modified(400))
+    simulator.add("logs/cold.gz", gib, "STANDARD", _modified(100))
+    simulator.add("logs/cold-2.gz", gib, "STANDARD", _modified(100))
+    simulator.add("logs/warm.gz", gib, "STANDARD", _modified(40))
+    simulator.add("logs/tiny.gz", 1024, "STANDARD", _modified(100))
+    simulator.add("logs/archived.gz", gib, "GLACIER", _modified(40))
+    simulator.add("other/file", gib, "STANDARD", _modified(400))
+
+    simulation = simulator.evaluate(TODAY, load_config())
+    result = simulation.to_dict()
+
+    assert len(simulator.cells) == 6
+    assert result["expired"]["object_count"] == 1
+    assert result["transition_requests"] == {"GLACIER": 2, "STANDARD_IA": 1}
+    assert result["projected"]["GLACIER"]["object_count"] == 3
+    assert result["projected"]["STANDARD"]["object_count"] == 2
+    assert result["current"]["STANDARD"]["object_count"] == 6
+    assert simulation.transition_cost_usd == 2 / 1000 * 0.03 + 1 / 1000 * 0.01
+    expected_savings = 4 * 0.023 - (0.0036 * 2 + 0.0125)
+    assert result["monthly_savings_usd"] == round(expected_savings, 2)
+
+
+def test_simulate_inventory_merges_data_files_from_worker_processes(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    files = []
+    for index, key in enumerate(("logs%2Fa.gz", "logs%2Fb.gz")):
+        with gzip.open(data_dir / f"part-{index}.csv.gz", "wt", encoding="utf-8", newline="") as data_file:
+            csv.writer(data_file).writerow(["bucket", key, str(1024**2), "2020-01-01T00:00:00.000Z", "STANDARD"])
+        files.append({"key": f"data/part-{index}.csv.gz"})
+    manifest = {
+        "sourceBucket": "bucket",
+        "fileFormat": "CSV",
+        "fileSchema": "Bucket, Key, Size, LastModifiedDate, StorageClass",
+        "files": files,
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    rules, _ = parse_lifecycle_rules(LOG_RULES)
+    simulator = LifecycleSimulator(rules)
+
+    simulate_inventory([str(tmp_path)], simulator, max_workers=2)
+
+    assert simulator.cells == {(1, "STANDARD", "2020-01-01", False): [2, 2 * 1024**2]}
@@ -0,0 +1,60 @@
+import random
+
+from aws_storage_optimizer.analyzers.s3_prefix_trie import PrefixTrie
+
+
+def test_prefix_trie_picks_non_overlapping_prefixes_with_most_stale_bytes():
+    trie = PrefixTrie(max_depth=3, max_nodes=100)
+    for index in range(10):
+        trie.add(f"logs/2023/{index}.gz", 100, 100)
+        trie.add(f"logs/2024/{index}.gz", 100, 0)
+        trie.add(f"backups/db/{index}.dump", 500, 500)
+    trie.add("readme.txt", 5, 5)
+
+    candidates = trie.lifecycle_candidates(min_stale_fraction=0.8, limit=5)
+
+    assert [candidate["prefix"] for candidate in candidates] == ["backups/", "logs/2023/"]
+    assert candidates[0] == {"prefix": "backups/", "size_bytes": 5000, "object_count": 10, "stale_bytes": 5000}
+
+
+def test_prefix_trie_stays_within_node_limit_and_keeps_totals():
+    rng = random.Random(2)
+    trie = PrefixTrie(max_depth=4, max_nodes=50)
+    total = 0
+    for _ in range(20_000):
+        size = rng.randrange(1, 1000)
+        total += size
+        trie.add(f"{rng.randrange(30)}/{rng.randrange(30)}/{rng.randrange(30)}/object", size, 0)
+        assert trie.node_count <= 50
+
+    assert trie.root.size_bytes == total
+    assert trie.root.object_count == 20_000
+
+
+def test_prefix_trie_prunes_equal_sized_leaves_in_prefix_order():
+    keys = [f"{name}/object" for name in "abcde"]
+    kept = []
+    for seed in range(5):
+        random.Random(seed).shuffle(keys)
+        trie = PrefixTrie(max_depth=2, max_nodes=4)
+        for key in keys:
+            trie.add(key, 1, 0)
+        kept.append(sorted(trie.root.children))
+
+    assert kept == [["c", "d", "e"]] * 5
+
+
+def test_prefix_trie_merge_and_round_trip():
+    left = PrefixTrie(max_depth=2, max_nodes=100)
+    right = PrefixTrie(max_depth=2, max_nodes=100)
+    left.add("a/b/c/d.txt", 10, 10)
+    right.add("a/b/e.txt", 20, 0)
+    right.add("z.txt", 1, 1)
+
+    left.merge(right)
+    restored = PrefixTrie.from_dict(left.to_dict())
+
+    assert restored.node_count == left.node_count == 2
+    assert restored.root.size_bytes == 31
+    assert restored.root.children["a"].children["b"].size_bytes == 30
+    assert restored.root.children["a"].children["b"].stale_bytes == 10
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import ClientError
+
+from aws_storage_optimizer.analyzers.s3 import analyze_s3
+from aws_storage_optimizer.analyzers.s3_reclaimable import scan_reclaimable_storage
+from aws_storage_optimizer.config import load_config
+
+GIB = 1024**3
+
+
+class HiddenStorageS3Client:
+    def __init__(self, versioning: str | None = "Enabled"):
+        self.versioning = versioning
+        self.operations: list[str] = []
+        now = datetime.now(timezone.utc)
+        self.uploads = [
+            {"Key": "backup.tar", "UploadId": "u1", "Initiated": now - timedelta(days=30)},
+            {"Key": "video.mp4", "UploadId": "u2", "Initiated": now - timedelta(days=10), "StorageClass": "GLACIER"},
+            {"Key": "in-progress.bin", "UploadId": "u3", "Initiated": now - timedelta(hours=2)},
+        ]
+        self.parts = {"u1": [2 * GIB] * 3, "u2": [GIB], "u3": [GIB]}
+
+    @staticmethod
+    def list_buckets(**_kwargs):
+        return {"Buckets": [{"Name": "data", "BucketRegion": "us-west-2"}]}
+
+    @staticmethod
+    def get_bucket_tagging(**_kwargs):
+        return {"TagSet": []}
+
+    @staticmethod
+    def list_objects_v2(**_kwargs):
+        return {"Contents": [{"Key": "current", "Size": GIB}]}
+
+    def list_multipart_uploads(self, **kwargs):
+        self.operations.append("list_multipart_uploads")
+        if not kwargs.get("KeyMarker"):
+            return {"Uploads": self.uploads[:2], "IsTruncated": True, "NextKeyMarker": "video.mp4"}
+        return {"Uploads": self.uploads[2:], "IsTruncated": False}
+
+    def list_parts(self, **kwargs):
+        self.operations.append("list_parts")
+        parts = self.parts[kwargs["UploadId"]]
+        start = int(kwargs.get("PartNumberMarker", 0))
+        page = {"Parts": [{"Size": size} for size in parts[start : start + 2]], "IsTruncated": start + 2 < len(parts)}
+        if page["IsTruncated"]:
+            page["NextPartNumberMarker"] = start + 2
+        return page
+
+    def get_bucket_versioning(self, **_kwargs):
+        self.operations.append("get_bucket_versioning")
+        if self.versioning == "Denied":
+            raise ClientError({"Error": {"Code": "AccessDenied", "Message": "denied"}}, "GetBucketVersioning")
+        return {"Status": self.versioning} if self.versioning else {}
+
+    def list_object_versions(self, **kwargs):
+        self.operations.append("list_object_versions")
+        if not kwargs.get("KeyMarker"):
+            return {
+                "Versions": [
+                    {"Key": "a", "Size": GIB, "IsLatest": True},
+                    {"Key": "a", "Size": 4 * GIB, "IsLatest": False},
+                ],
+                "DeleteMarkers": [{"Key": "b", "IsLatest": True}],
+                "IsTruncated": True,
+                "NextKeyMarker": "a",
+                "NextVersionIdMarker": "v1",
+            }
+        return {"Versions": [{"Key": "c", "Size": 2 * GIB, "IsLatest": False, "StorageClass": "STANDARD_IA"}]}
+
+
+def _reclaimable_config(requests: int = 20):
+    config = load_config()
+    config.s3_scan.reclaimable_requests = requests
+    return config
+
+
+def test_scan_reclaimable_storage_streams_uploads_and_versions():
+    config = _reclaimable_config()
+
+    storage = scan_reclaimable_storage(HiddenStorageS3Client(), "data", config)
+
+    assert storage.complete
+    assert storage.uploads.count == 2
+    assert storage.uploads.size_bytes == 7 * GIB
+    assert round(storage.uploads.monthly_cost_usd, 4) == round(6 * 0.023 + 1 * 0.0036, 4)
+    assert storage.noncurrent_versions.count == 2
+    assert storage.noncurrent_versions.size_bytes == 6 * GIB
+    assert round(storage.noncurrent_versions.monthly_cost_usd, 4) == round(4 * 0.023 + 2 * 0.0125, 4)
+    assert storage.delete_markers == 1
+
+
+def test_scan_reclaimable_storage_skips_version_listing_for_unversioned_buckets():
+    client = HiddenStorageS3Client(versioning=None)
+
+    storage = scan_reclaimable_storage(client, "data", _reclaimable_config())
+
+    assert "list_object_versions" not in client.operations
+    assert storage.noncurrent_versions.count == 0
+
+
+def test_scan_reclaimable_storage_keeps_upload_totals_when_versioning_is_denied():
+    client = HiddenStorageS3Client(versioning="Denied")
+
+    storage = scan_reclaimable_storage(client, "data", _reclaimable_config())
+
+    assert storage is not None
+    assert storage.uploads.count == 2
+    assert storage.noncurrent_versions.count == 0
+
+
+def test_analyze_s3_skips_reclaimable_scan_by_default():
+    client = HiddenStorageS3Client()
+
+    findings = analyze_s3(client, config=load_config(), top_n=5)
+
+    assert client.operations == []
+    assert not [finding for finding in findings if finding.details.get("finding_type")]
+
+
+def test_scan_reclaimable_storage_stops_at_request_limit():
+    config = _reclaimable_config(2)
+
+    storage = scan_reclaimable_storage(HiddenStorageS3Client(), "data", config)
+
+    assert not storage.complete
+    assert storage.uploads.count == 0
+
+
+def test_analyze_s3_emits_reclaimable_findings_with_savings():
+    findings = analyze_s3(HiddenStorageS3Client(), config=_reclaimable_config(), top_n=5)
+
+    by_type = {finding.details.get("finding_type"): finding for finding in findings}
+    uploads = by_type["incomplete-multipart-uploads"]
+    assert uploads.resource_id == "data"
+    assert uploads.details["upload_count"] == 2
+    assert uploads.details["reclaimable_gib"] == 7.0
+    assert uploads.estimated_monthly_savings_usd == round(6 * 0.023 + 0.0036, 2)
+    versions = by_type["noncurrent-versions"]
+    assert versions.details["noncurrent_version_count"] == 2
+    assert versions.estimated_monthly_savings_usd == round(4 * 0.023 + 2 * 0.0125, 2)
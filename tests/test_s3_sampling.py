@@ -0,0 +1,105 @@
+import bisect
+import random
+
+from aws_storage_optimizer.analyzers.s3 import analyze_s3
+from aws_storage_optimizer.analyzers.s3_sampling import estimate_bucket_size
+from aws_storage_optimizer.config import load_config
+
+
+class SortedKeysS3Client:
+    def __init__(self, keys: list[str], object_size: int = 1000):
+        self.keys = sorted(keys)
+        self.object_size = object_size
+        self.list_calls = 0
+
+    @staticmethod
+    def list_buckets(**_kwargs):
+        return {"Buckets": [{"Name": "huge-bucket", "BucketRegion": "us-west-2"}]}
+
+    @staticmethod
+    def get_bucket_tagging(**_kwargs):
+        return {"TagSet": []}
+
+    def list_objects_v2(self, **kwargs):
+        self.list_calls += 1
+        prefix = kwargs.get("Prefix", "")
+        delimiter = kwargs.get("Delimiter")
+        after = kwargs.get("ContinuationToken") or kwargs.get("StartAfter")
+        index = bisect.bisect_right(self.keys, after) if after else bisect.bisect_left(self.keys, prefix)
+        contents, prefixes = [], []
+        last = None
+        while index < len(self.keys) and self.keys[index].startswith(prefix):
+            if len(contents) + len(prefixes) >= kwargs["MaxKeys"]:
+                return {"Contents": contents, "CommonPrefixes": prefixes, "NextContinuationToken": last}
+            rest = self.keys[index][len(prefix) :]
+            if delimiter and delimiter in rest:
+                common = prefix + rest[: rest.index(delimiter) + 1]
+                prefixes.append({"Prefix": common})
+                last = common + "\x7f"
+                index = bisect.bisect_right(self.keys, last)
+            else:
+                contents.append({"Key": self.keys[index], "Size": self.object_size})
+                last = self.keys[index]
+                index += 1
+        return {"Contents": contents, "CommonPrefixes": prefixes}
+
+
+def test_estimate_bucket_size_is_exact_for_small_buckets():
+    client = SortedKeysS3Client([f"logs/{index:04d}.gz" for index in range(700)] + ["readme.txt"])
+
+    estimate = estimate_bucket_size(client, "bucket", max_requests=10)
+
+    assert estimate.exact
+    assert estimate.object_count == 701
+    assert estimate.size_bytes == 701_000
+    assert estimate.object_count_interval == (701, 701)
+    assert estimate.requests == 2
+
+
+def test_estimate_bucket_size_brackets_large_flat_key_space():
+    rng = random.Random(3)
+    client = SortedKeysS3Client([f"{rng.getrandbits(128):032x}" for _ in range(200_000)])
+
+    estimate = estimate_bucket_size(client, "bucket", max_requests=30)
+
+    assert not estimate.exact
+    assert estimate.requests <= 30 and client.list_calls == estimate.requests
+    low, high = estimate.object_count_interval
+    assert low <= 200_000 <= high
+    assert 150_000 <= estimate.object_count <= 250_000
+    assert estimate.size_bytes_interval[0] <= 200_000_000 <= estimate.size_bytes_interval[1]
+
+
+def test_estimate_bucket_size_samples_partitioned_prefixes():
+    rng = random.Random(5)
+    keys = [
+        f"events/day={day:03d}/part-{index:05d}.json"
+        for day in range(365)
+        for index in range(rng.randint(200, 600))
+    ]
+    client = SortedKeysS3Client(keys)
+
+    estimate = estimate_bucket_size(client, "bucket", max_requests=40)
+
+    assert estimate.requests <= 40
+    low, high = estimate.object_count_interval
+    assert low <= len(keys) <= high
+    assert abs(estimate.object_count - len(keys)) / len(keys) < 0.25
+
+
+def test_analyze_s3_sample_source_records_confidence_interval():
+    rng = random.Random(11)
+    client = SortedKeysS3Client([f"{rng.getrandbits(64):016x}" for _ in range(50_000)], object_size=1024**2)
+    config = load_config()
+    config.s3_scan.size_source = "sample"
+    config.s3_scan.sample_requests = 24
+
+    findings = analyze_s3(client, config=config, top_n=1)
+
+    details = findings[0].details
+    assert details["size_source"] == "sample"
+    assert details["size_estimate"]["confidence_level"] == 0.95
+    assert details["size_estimate"]["list_requests"] <= 24
+    assert details["size_estimate"]["object_count_low"] <= 50_000 <= details["size_estimate"]["object_count_high"]
+    assert details["size_estimate"]["size_gib_low"] <= details["approx_size_gib"] <= details["size_estimate"]["size_gib_high"]
+    assert "sample_limit_note" not in details